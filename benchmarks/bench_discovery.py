@@ -0,0 +1,102 @@
+"""Compare ``discover_modules`` with the rglob-based walker it replaced.
+
+Builds a synthetic monorepo (packages next to node_modules, a virtualenv, build output and data
+directories) in a temporary directory and times both walkers on it:
+
+    python benchmarks/bench_discovery.py --packages 200 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from coldpy.discovery import (
+    DEFAULT_EXCLUDE_PATTERNS,
+    EXCLUDED_DIRS,
+    ModuleTarget,
+    discover_modules,
+)
+
+
+def legacy_discover_modules(scan_path: Path, exclude_patterns: list[str] | None = None) -> list[ModuleTarget]:
+    """The walker before pruning: rglob everything, sort, then filter file by file."""
+    module_targets: list[ModuleTarget] = []
+    effective_patterns = exclude_patterns or DEFAULT_EXCLUDE_PATTERNS
+    for file_path in sorted(scan_path.rglob("*.py")):
+        relative = file_path.relative_to(scan_path)
+        if any(part.startswith(".") for part in relative.parts):
+            continue
+        if any(part in EXCLUDED_DIRS - {"node_modules"} for part in relative.parts[:-1]):
+            continue
+        if file_path.name.startswith("test_") or file_path.name.endswith("_test.py"):
+            continue
+        path_str = str(relative)
+        if any(relative.match(pattern) or path_str.startswith(pattern.rstrip("/*")) for pattern in effective_patterns):
+            continue
+        parts = list(relative.parts)
+        if parts[-1] == "__init__.py":
+            parts = parts[:-1]
+        else:
+            parts[-1] = Path(parts[-1]).stem
+        if parts:
+            module_targets.append(ModuleTarget(name=".".join(parts), file=file_path))
+    return module_targets
+
+
+def build_tree(root: Path, packages: int) -> None:
+    for index in range(packages):
+        package = root / "src" / f"service_{index % 20}" / f"pkg_{index}"
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("", encoding="utf-8")
+        for module in range(5):
+            (package / f"module_{module}.py").write_text("VALUE = 1\n", encoding="utf-8")
+
+    noise = {
+        "node_modules": (".js", 40),
+        ".venv/lib/python3.12/site-packages": (".py", 40),
+        "build/lib": (".py", 10),
+        "data": (".csv", 40),
+    }
+    for directory, (suffix, per_directory) in noise.items():
+        for index in range(packages):
+            nested = root / directory / f"dep_{index}" / "lib"
+            nested.mkdir(parents=True)
+            for item in range(per_directory):
+                (nested / f"file_{item}{suffix}").write_text("", encoding="utf-8")
+    (root / ".gitignore").write_text("data/\n", encoding="utf-8")
+
+
+def _time(function, repeat: int) -> tuple[float, int]:
+    timings: list[float] = []
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(function())
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--packages", type=int, default=200, help="Project packages (and noise directories) to create.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per walker; the median is reported.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="coldpy-bench-") as directory:
+        root = Path(directory)
+        build_tree(root, args.packages)
+        walkers = {
+            "legacy rglob": lambda: legacy_discover_modules(root),
+            "scandir": lambda: discover_modules(root),
+        }
+        for label, walker in walkers.items():
+            median_ms, found = _time(walker, args.repeat)
+            print(f"{label:<20} {median_ms:10.1f} ms  {found} modules")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import statistics
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from coldpy.models import DistributionCost, ImportNode, ModuleResult
+
+KIND_PROJECT = "project"
+KIND_STDLIB = "stdlib"
+KIND_THIRD_PARTY = "third-party"
+KIND_OTHER = "other"
+KIND_IMPORT_SYSTEM = "import system"
+# The frozen loader unmarshals every module's bytecode, so its allocations belong to no single owner.
+IMPORT_SYSTEM_MODULES = ("importlib._bootstrap", "importlib._bootstrap_external")
+
+
+@dataclass
+class DistributionIndex:
+    """Resolves a module name to the bucket that owns it, from the target interpreter's metadata."""
+
+    owners: dict[str, str] = field(default_factory=dict)
+    stdlib: set[str] = field(default_factory=set)
+    project: set[str] = field(default_factory=set)
+
+    @classmethod
+    def from_probe(cls, payload: dict[str, Any], project_modules: Iterable[str]) -> "DistributionIndex":
+        return cls(
+            owners=dict(payload.get("owners") or {}),
+            stdlib=set(payload.get("stdlib") or ()),
+            project={name.partition(".")[0] for name in project_modules},
+        )
+
+    def owner(self, module: str) -> tuple[str, str]:
+        """``(bucket, kind)`` for ``module``; the project wins over an installed copy of itself."""
+        if module in IMPORT_SYSTEM_MODULES:
+            return KIND_IMPORT_SYSTEM, KIND_IMPORT_SYSTEM
+        top_level = module.partition(".")[0]
+        if top_level in self.project:
+            return KIND_PROJECT, KIND_PROJECT
+        if top_level in self.stdlib:
+            return KIND_STDLIB, KIND_STDLIB
+        candidate = module
+        while candidate:
+            if candidate in self.owners:
+                return self.owners[candidate], KIND_THIRD_PARTY
+            candidate = candidate.rpartition(".")[0]
+        return KIND_OTHER, KIND_OTHER
+
+
+def _walk_with_parents(nodes: list[ImportNode]) -> Iterable[tuple[ImportNode, ImportNode | None]]:
+    stack: list[tuple[ImportNode, ImportNode | None]] = [(node, None) for node in nodes]
+    while stack:
+        node, parent = stack.pop()
+        yield node, parent
+        stack.extend((child, node) for child in node.children)
+
+
+def attribute_costs(modules: Iterable[ModuleResult], index: DistributionIndex) -> list[DistributionCost]:
+    """Roll the import trees (and traced memory) of every scanned module up by owning distribution.
+
+    Each imported module counts once, with its median cost over the trees it appears in. A bucket's
+    self time is the sum of its modules' self time; its cumulative time adds up the modules where
+    it is entered from another bucket (or that are imported directly by the scan), so it includes
+    everything the bucket pulls in.
+    """
+    self_samples: dict[str, list[float]] = {}
+    cumulative_samples: dict[str, list[float]] = {}
+    memory_samples: dict[str, list[float]] = {}
+    entry_points: dict[str, bool] = {}
+    for module in modules:
+        for node, parent in _walk_with_parents(module.import_tree or []):
+            self_samples.setdefault(node.name, []).append(node.self_ms)
+            cumulative_samples.setdefault(node.name, []).append(node.cumulative_ms)
+            entered = parent is None or index.owner(parent.name)[0] != index.owner(node.name)[0]
+            entry_points[node.name] = entry_points.get(node.name, True) and entered
+        for name, memory_mb in (module.memory_by_module or {}).items():
+            memory_samples.setdefault(name, []).append(memory_mb)
+
+    buckets: dict[str, dict[str, Any]] = {}
+
+    def bucket_for(name: str) -> dict[str, Any]:
+        bucket, kind = index.owner(name)
+        return buckets.setdefault(
+            bucket,
+            {"kind": kind, "modules": 0, "self_ms": 0.0, "cumulative_ms": 0.0, "memory_mb": None},
+        )
+
+    for name, samples in self_samples.items():
+        bucket = bucket_for(name)
+        bucket["modules"] += 1
+        bucket["self_ms"] += statistics.median(samples)
+        if entry_points[name]:
+            bucket["cumulative_ms"] += statistics.median(cumulative_samples[name])
+    for name, samples in memory_samples.items():
+        bucket = bucket_for(name)
+        bucket["memory_mb"] = (bucket["memory_mb"] or 0.0) + statistics.median(samples)
+
+    costs = [
+        DistributionCost(
+            name=name,
+            kind=bucket["kind"],
+            modules=bucket["modules"],
+            self_ms=round(bucket["self_ms"], 3),
+            # Medians of self and cumulative time come from different runs; never report less than self.
+            cumulative_ms=round(max(bucket["cumulative_ms"], bucket["self_ms"]), 3),
+            memory_mb=round(bucket["memory_mb"], 3) if bucket["memory_mb"] is not None else None,
+        )
+        for name, bucket in buckets.items()
+    ]
+    costs.sort(key=lambda cost: cost.cumulative_ms, reverse=True)
+    return costs
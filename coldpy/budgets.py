@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from fnmatch import fnmatchcase
+from typing import Any
+
+from coldpy.config import ConfigError
+from coldpy.models import ScanPayload
+
+BUDGET_KEYS = {"max-ms": "max_ms", "max-mb": "max_mb"}
+TOTAL_BUDGET_KEY = "total-budget-ms"
+METRIC_TIME = "time_ms"
+METRIC_MEMORY = "memory_mb"
+TOTAL_NAME = "<total>"
+
+
+@dataclass
+class Budget:
+    """Limits for every module matching ``pattern`` (a dotted name or an fnmatch glob)."""
+
+    pattern: str
+    max_ms: float | None = None
+    max_mb: float | None = None
+
+
+@dataclass
+class BudgetConfig:
+    budgets: list[Budget] = field(default_factory=list)
+    total_ms: float | None = None
+
+    def budget_for(self, module: str) -> Budget | None:
+        """The exact entry for ``module`` if there is one, otherwise the first matching glob."""
+        for budget in self.budgets:
+            if budget.pattern == module:
+                return budget
+        for budget in self.budgets:
+            if fnmatchcase(module, budget.pattern):
+                return budget
+        return None
+
+    @property
+    def empty(self) -> bool:
+        return not self.budgets and self.total_ms is None
+
+
+@dataclass
+class BudgetViolation:
+    module: str
+    metric: str
+    value: float
+    limit: float
+    rule: str
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _limit(value: Any, where: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+        raise ConfigError(f"{where} must be a number >= 0, got {value!r}")
+    return float(value)
+
+
+def parse_budgets(table: dict[str, Any]) -> BudgetConfig:
+    """Read budgets from a ``[tool.coldpy]`` table::
+
+        [tool.coldpy]
+        total-budget-ms = 800
+
+        [tool.coldpy.budgets]
+        "service.api" = { max-ms = 150, max-mb = 40 }
+        "service.plugins.*" = { max-ms = 50 }
+    """
+    config = BudgetConfig()
+    if table.get(TOTAL_BUDGET_KEY) is not None:
+        config.total_ms = _limit(table[TOTAL_BUDGET_KEY], TOTAL_BUDGET_KEY)
+    entries = table.get("budgets", {})
+    if not isinstance(entries, dict):
+        raise ConfigError("[tool.coldpy.budgets] must be a table of module patterns")
+    for pattern, limits in entries.items():
+        if not isinstance(limits, dict):
+            raise ConfigError(f"Budget for {pattern!r} must be a table such as {{ max-ms = 100 }}")
+        unknown = sorted(set(limits) - set(BUDGET_KEYS))
+        if unknown:
+            raise ConfigError(f"Unknown budget keys for {pattern!r}: {', '.join(unknown)}")
+        values = {BUDGET_KEYS[key]: _limit(value, f"{pattern}.{key}") for key, value in limits.items()}
+        config.budgets.append(Budget(pattern=pattern, **values))
+    return config
+
+
+def evaluate_budgets(payload: ScanPayload, config: BudgetConfig) -> list[BudgetViolation]:
+    """Modules (and the total, when the scan measured one) over their budget.
+
+    Failed imports are left to the scan's own failure count. The total is only known in marginal
+    mode, where per-module costs add up to the startup of one interpreter.
+    """
+    violations: list[BudgetViolation] = []
+    for module in payload.modules:
+        budget = config.budget_for(module.name)
+        if budget is None or module.status != "ok":
+            continue
+        for metric, value, limit in (
+            (METRIC_TIME, module.import_time_ms, budget.max_ms),
+            (METRIC_MEMORY, module.memory_mb, budget.max_mb),
+        ):
+            if value is not None and limit is not None and value > limit:
+                violations.append(
+                    BudgetViolation(module=module.name, metric=metric, value=value, limit=limit, rule=budget.pattern)
+                )
+
+    total_ms = payload.stats.total_import_time_ms if payload.stats is not None else None
+    if config.total_ms is not None and total_ms is not None and total_ms > config.total_ms:
+        violations.append(
+            BudgetViolation(module=TOTAL_NAME, metric=METRIC_TIME, value=total_ms, limit=config.total_ms, rule=TOTAL_BUDGET_KEY)
+        )
+    return violations
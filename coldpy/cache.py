@@ -1,41 +1,131 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 from pathlib import Path
 
-from coldpy.models import ScanPayload
+from coldpy import __version__
+from coldpy.discovery import ModuleTarget
+from coldpy.graph import ParsedModule, project_dependencies, reachable
+from coldpy.models import SCHEMA_VERSION, ModuleResult, ScanPayload, schema_is_newer
 
 CACHE_DIR_NAME = ".coldpy"
-CACHE_FILE_NAME = "cache.json"
+AST_CACHE_FILE_NAME = "ast_cache.json"
+VOLATILE_ENV_KEYS = {"_", "OLDPWD", "PWD", "SHLVL", "TERM_SESSION_ID", "WINDOWID", "COLUMNS", "LINES"}
 
 
 class CacheError(Exception):
     pass
 
 
-def cache_path(base_dir: Path | None = None) -> Path:
-    base = base_dir or Path.cwd()
-    return base / CACHE_DIR_NAME / CACHE_FILE_NAME
-
-
-def write_cache(payload: ScanPayload, base_dir: Path | None = None) -> Path:
-    target = cache_path(base_dir)
-    target.parent.mkdir(parents=True, exist_ok=True)
-    target.write_text(json.dumps(payload.to_dict(), indent=2), encoding="utf-8")
-    return target
-
-
-def read_cache(base_dir: Path | None = None) -> ScanPayload:
-    target = cache_path(base_dir)
-    if not target.exists():
-        raise CacheError("Cache not found. Run `coldpy scan <path>` first.")
-
+def load_payload(target: Path) -> ScanPayload:
+    """Read a JSON report written by `scan --json` or `export`."""
     try:
         raw = json.loads(target.read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise CacheError(f"Cannot read report: {target}") from exc
     except json.JSONDecodeError as exc:
         raise CacheError(f"Cache file is not valid JSON: {target}") from exc
 
+    version = str(raw.get("schema_version", SCHEMA_VERSION)) if isinstance(raw, dict) else SCHEMA_VERSION
+    if schema_is_newer(version):
+        raise CacheError(
+            f"Report {target} uses schema {version}, newer than {SCHEMA_VERSION} read by this ColdPy; upgrade ColdPy"
+        )
     try:
         return ScanPayload.from_dict(raw)
     except Exception as exc:  # pragma: no cover - defensive
         raise CacheError(f"Cache format is invalid: {target}") from exc
+
+
+def file_digest(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return "missing"
+
+
+def env_digest(scan_env: dict[str, str] | None) -> str:
+    env = os.environ if scan_env is None else scan_env
+    stable = sorted((key, value) for key, value in env.items() if key not in VOLATILE_ENV_KEYS)
+    return hashlib.sha256(json.dumps(stable).encode("utf-8")).hexdigest()
+
+
+def interpreter_digest(python_executable: Path | None) -> str:
+    if python_executable is None:
+        return "default"
+    try:
+        mtime = os.stat(os.path.realpath(python_executable)).st_mtime_ns
+    except OSError:
+        mtime = 0
+    return f"{python_executable}:{mtime}"
+
+
+def module_fingerprints(
+    module_targets: list[ModuleTarget],
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    measurement_key: str = "",
+) -> dict[str, str]:
+    """Fingerprint every module by its own source and the sources of all project modules it imports."""
+    digests = {target.name: file_digest(Path(target.file)) for target in module_targets}
+    graph = project_dependencies(module_targets)
+    context = "|".join(
+        [__version__, interpreter_digest(python_executable), env_digest(scan_env), measurement_key]
+    )
+
+    fingerprints: dict[str, str] = {}
+    for target in module_targets:
+        hasher = hashlib.sha256(context.encode("utf-8"))
+        for name in sorted(reachable(graph, target.name)):
+            hasher.update(f"{name}:{digests[name]};".encode("utf-8"))
+        fingerprints[target.name] = hasher.hexdigest()
+    return fingerprints
+
+
+def reusable_results(previous: ScanPayload | None, project_root: Path) -> dict[str, ModuleResult]:
+    if previous is None or previous.project_root != str(project_root):
+        return {}
+    return {module.name: module for module in previous.modules if module.fingerprint}
+
+
+def read_jsonl_results(path: Path) -> dict[str, ModuleResult]:
+    """Results streamed by ``scan --jsonl``; a line cut short by an interrupted scan is skipped."""
+    results: dict[str, ModuleResult] = {}
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return results
+
+    for line in lines:
+        try:
+            module = ModuleResult.from_dict(json.loads(line))
+        except (json.JSONDecodeError, TypeError, KeyError):
+            continue
+        if module.fingerprint:
+            results[module.name] = module
+    return results
+
+
+def ast_cache_path(base_dir: Path | None = None) -> Path:
+    base = base_dir or Path.cwd()
+    return base / CACHE_DIR_NAME / AST_CACHE_FILE_NAME
+
+
+def read_ast_cache(base_dir: Path | None = None) -> dict[str, ParsedModule]:
+    """Parsed imports keyed by file path; a missing or unreadable cache is simply empty."""
+    target = ast_cache_path(base_dir)
+    try:
+        raw = json.loads(target.read_text(encoding="utf-8"))
+        return {entry["file"]: ParsedModule.from_dict(entry) for entry in raw["modules"]}
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def write_ast_cache(parsed_modules: list[ParsedModule], base_dir: Path | None = None) -> Path:
+    target = ast_cache_path(base_dir)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"coldpy_version": __version__, "modules": [parsed.to_dict() for parsed in parsed_modules]}
+    target.write_text(json.dumps(payload), encoding="utf-8")
+    return target
@@ -1,24 +1,98 @@
 from __future__ import annotations
 
+import json
 from pathlib import Path
+from typing import Any
 
 import typer
 from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeElapsedColumn
 
-from coldpy.cache import CacheError, read_cache, write_cache
-from coldpy.discovery import DEFAULT_EXCLUDE_PATTERNS, EXCLUSION_LABELS, discover_modules
-from coldpy.models import ModuleResult, ScanPayload
-from coldpy.reporter import print_summary, render_modules_table, write_json_report
+from coldpy.budgets import BudgetConfig, evaluate_budgets, parse_budgets
+from coldpy.cache import CacheError, load_payload, read_ast_cache, read_jsonl_results, reusable_results, write_ast_cache
+from coldpy.diff import (
+    DEFAULT_ALPHA,
+    DEFAULT_MAX_INCREASE_MB,
+    DEFAULT_MAX_INCREASE_MS,
+    DEFAULT_MAX_INCREASE_PCT,
+    DiffLimits,
+    diff_payloads,
+)
+from coldpy.config import ConfigError, load_tool_config
+from coldpy.discovery import DEFAULT_EXCLUDE_PATTERNS, EXCLUSION_LABELS, ModuleTarget, discover_modules
+from coldpy.graph import build_import_graph, parse_modules
+from coldpy.history import HistoryError, HistoryStore, git_commit
+from coldpy.matrix import matrix_concurrency, scan_matrix
+from coldpy.models import MatrixPayload, ModuleResult, ScanPayload
+from coldpy.reporter import (
+    append_jsonl_result,
+    print_matrix_summary,
+    print_summary,
+    render_allocation_sites,
+    render_budget_violations,
+    render_distributions_table,
+    render_diff_table,
+    render_host,
+    render_import_costs_table,
+    render_matrix_table,
+    render_metric_history_table,
+    render_modules_table,
+    render_profiles,
+    render_runs_table,
+    render_startup_report,
+    render_suggestions_table,
+    render_whatif_report,
+    write_json_report,
+)
 from coldpy.runtime import build_scan_environment, load_project_env, resolve_python_executable
-from coldpy.scanner import DEFAULT_THRESHOLD_MB, DEFAULT_THRESHOLD_MS, scan_modules
+from coldpy.scanner import (
+    DEFAULT_ALLOC_SITES,
+    DEFAULT_THRESHOLD_MB,
+    DEFAULT_THRESHOLD_MS,
+    EXECUTOR_SPAWN,
+    EXECUTORS,
+    MEMORY_METHODS,
+    MEMORY_TRACEMALLOC,
+    MODE_ISOLATED,
+    MODE_MARGINAL,
+    MODES,
+    PYC_MODES,
+    available_cpus,
+    iter_scan,
+)
+from coldpy.startup import DEFAULT_STARTUP_REPEAT, DEFAULT_STARTUP_WARMUP, StartupError, measure_startup
+from coldpy.stats import DEFAULT_STATISTIC, STATISTICS
+from coldpy.suggest import suggest_deferrals
+from coldpy.whatif import simulate_lazy
 
 app = typer.Typer(help="ColdPy: Python import time + memory profiler")
 console = Console()
 
+EXIT_REGRESSION = 3
+EXIT_BUDGET = 4
+
+
+class GraphFormat(str):
+    JSON = "json"
+    DOT = "dot"
+
 
 class TopSort(str):
     TIME = "time"
     MEMORY = "memory"
+    SELF = "self"
+
+
+class TopBy(str):
+    MODULE = "module"
+    DIST = "dist"
+
+
+DIST_SORT_KEYS = {
+    TopSort.TIME: lambda cost: cost.cumulative_ms,
+    TopSort.MEMORY: lambda cost: cost.memory_mb or 0.0,
+    TopSort.SELF: lambda cost: cost.self_ms,
+}
 
 
 def _sort_modules(modules: list[ModuleResult], sort_by: str) -> list[ModuleResult]:
@@ -30,20 +104,185 @@ def _sort_modules(modules: list[ModuleResult], sort_by: str) -> list[ModuleResul
     return sorted(modules, key=sort_key, reverse=True)
 
 
-def _filter_successful(
-    modules: list[ModuleResult], threshold_ms: float, threshold_mb: float
-) -> list[ModuleResult]:
-    filtered: list[ModuleResult] = []
-    for module in modules:
-        if module.status != "ok":
-            continue
+def _file_exclude_patterns(exclude: list[str]) -> list[str]:
+    return DEFAULT_EXCLUDE_PATTERNS + [pattern for pattern in exclude if pattern not in DEFAULT_EXCLUDE_PATTERNS]
+
+
+def _resolve_runtime_or_exit(
+    project_root: Path,
+    python_executable: Path | None,
+    env_file: Path | None,
+    no_project_env: bool,
+    stable: bool = False,
+) -> tuple[Path, dict[str, str], Path | None]:
+    try:
+        runtime_python = resolve_python_executable(project_root, requested_python=python_executable)
+    except ValueError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    extra_env: dict[str, str] = {}
+    env_source: Path | None = None
+    if not no_project_env or env_file is not None:
+        try:
+            extra_env, env_source = load_project_env(project_root, env_file=env_file)
+        except ValueError as exc:
+            console.print(f"[red]{exc}[/red]")
+            raise typer.Exit(code=1) from exc
+
+    return runtime_python, build_scan_environment(extra_env, stable=stable), env_source
+
+
+def _load_budgets_or_exit(project_root: Path) -> BudgetConfig:
+    try:
+        table, _ = load_tool_config(project_root)
+        return parse_budgets(table)
+    except ConfigError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+
+def _load_scan_or_exit(ref: str) -> ScanPayload:
+    """A JSON report path, or a run id / git commit / ``latest`` from the scan history."""
+    try:
+        if Path(ref).is_file():
+            return load_payload(Path(ref))
+        with HistoryStore.open(create=False) as store:
+            return store.load_payload(store.resolve_run(ref))
+    except (CacheError, HistoryError) as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+
+def _discover_or_exit(project_root: Path, file_exclude_patterns: list[str]) -> tuple[list[ModuleTarget], int]:
+    try:
+        module_targets, excluded_count = discover_modules(
+            project_root,
+            exclude_patterns=file_exclude_patterns,
+            return_excluded_count=True,
+        )
+    except ValueError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    if not module_targets:
+        console.print("[red]No Python modules found for scanning.[/red]")
+        raise typer.Exit(code=1)
+
+    return module_targets, excluded_count
+
+
+def _previous_results(project_root: Path, runtime_python: Path) -> dict[str, ModuleResult] | None:
+    try:
+        with HistoryStore.open(create=False) as store:
+            previous = store.load_payload(store.latest_run_id(project_root, python=str(runtime_python)))
+        return reusable_results(previous, project_root)
+    except HistoryError:
+        return None
+
+
+def _finish_scan(
+    project_root: Path,
+    scans: list[tuple[str | None, str, ScanPayload]],
+    report: ScanPayload | MatrixPayload,
+    budgets: BudgetConfig,
+    mode: str,
+    no_cache: bool,
+    json_output: Path | None,
+) -> None:
+    """Record every (label, python, payload) scan, write ``report`` and check the budgets."""
+    if not no_cache:
+        try:
+            with HistoryStore.open() as store:
+                commit = git_commit(project_root)
+                for _, python, payload in scans:
+                    store.record_run(payload, git_commit=commit, python=python)
+        except HistoryError as exc:
+            console.print(f"[red]{exc}[/red]")
+            raise typer.Exit(code=1) from exc
+
+    if json_output is not None:
+        try:
+            write_json_report(report, json_output)
+        except OSError as exc:
+            console.print(f"[red]Failed to write JSON report: {exc}[/red]")
+            raise typer.Exit(code=1) from exc
+
+    if any(payload.summary.scanned_modules == 0 for _, _, payload in scans):
+        raise typer.Exit(code=1)
+
+    if budgets.total_ms is not None and mode != MODE_MARGINAL:
+        console.print("[yellow]The total startup budget is only checked with --mode marginal.[/yellow]")
+    violated = 0
+    for label, _, payload in scans:
+        violations = evaluate_budgets(payload, budgets)
+        if violations:
+            title = "ColdPy Budget Violations" if label is None else f"ColdPy Budget Violations ({label})"
+            render_budget_violations(violations, title=title)
+            violated += len(violations)
+    if violated:
+        console.print(f"[red]Budget violations: {violated}[/red]")
+        raise typer.Exit(code=EXIT_BUDGET)
+    if not budgets.empty:
+        console.print("All import budgets met.")
+
+
+def _scan_matrix(
+    project_root: Path,
+    module_targets: list[ModuleTarget],
+    runtimes: list[tuple[Path, dict[str, str]]],
+    scan_options: dict[str, Any],
+    budgets: BudgetConfig,
+    incremental: bool,
+    no_cache: bool,
+    json_output: Path | None,
+) -> None:
+    """``coldpy scan`` with several ``--python`` interpreters: one scan each, all at once."""
+    previous_results = None
+    if incremental:
+        previous_results = {python: _previous_results(project_root, python) for python, _ in runtimes}
+    progress = Progress(
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+    )
+    pinned = scan_options["pin_cpus"] or scan_options["stable"]
+    concurrent, jobs = matrix_concurrency(len(runtimes), scan_options["jobs"], len(available_cpus()), pinned)
+    if not pinned and (jobs < scan_options["jobs"] or concurrent < len(runtimes)):
+        console.print(
+            f"[dim]Scanning {concurrent} interpreter(s) at a time with {jobs} job(s) each "
+            f"to stay within {len(available_cpus())} CPUs.[/dim]"
+        )
+    tasks = {python: progress.add_task(str(python), total=len(module_targets)) for python, _ in runtimes}
+    try:
+        with progress:
+            matrix = scan_matrix(
+                project_root,
+                module_targets,
+                runtimes,
+                previous_results=previous_results,
+                on_module=lambda python, module: progress.update(tasks[python], advance=1),
+                **scan_options,
+            )
+    except ValueError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+    except KeyboardInterrupt as exc:
+        console.print("[yellow]Scan interrupted.[/yellow]")
+        raise typer.Exit(code=130) from exc
 
-        time_val = module.import_time_ms or 0.0
-        mem_val = module.memory_mb or 0.0
-        if time_val >= threshold_ms or mem_val >= threshold_mb:
-            filtered.append(module)
+    for key, entry in matrix.interpreters.items():
+        if entry.scan.host is not None:
+            console.print(f"[dim]{key}:[/dim]")
+            render_host(entry.scan.host, entry.scan.settings.order_seed)
+    render_matrix_table(matrix)
+    print_matrix_summary(matrix)
 
-    return filtered
+    scans = [(key, entry.python, entry.scan) for key, entry in matrix.interpreters.items()]
+    _finish_scan(project_root, scans, matrix, budgets, scan_options["mode"], no_cache, json_output)
 
 
 @app.command()
@@ -56,13 +295,26 @@ def scan(
         help="Project path to scan (defaults to current directory).",
     ),
     json_output: Path | None = typer.Option(None, "--json", help="Write JSON report to file."),
+    jsonl_output: Path | None = typer.Option(
+        None,
+        "--jsonl",
+        help="Append every module result to this JSON Lines file as soon as it is measured.",
+    ),
+    resume: bool = typer.Option(
+        False,
+        "--resume",
+        help="Skip modules already recorded in the --jsonl file by an interrupted scan with the same settings.",
+    ),
     threshold_ms: float = typer.Option(DEFAULT_THRESHOLD_MS, "--threshold-ms"),
     threshold_mb: float = typer.Option(DEFAULT_THRESHOLD_MB, "--threshold-mb"),
-    no_cache: bool = typer.Option(False, "--no-cache", help="Do not write .coldpy/cache.json"),
-    python_executable: Path | None = typer.Option(
+    no_cache: bool = typer.Option(False, "--no-cache", help="Do not record the run in .coldpy/history.sqlite"),
+    python_executables: list[Path] | None = typer.Option(
         None,
         "--python",
-        help="Python executable to use for module imports. Defaults to project venv if found.",
+        help=(
+            "Python executable to use for module imports. Defaults to project venv if found. "
+            "Repeat to scan with several interpreters at once and compare them side by side."
+        ),
     ),
     env_file: Path | None = typer.Option(
         None,
@@ -79,107 +331,723 @@ def scan(
         "--exclude",
         help="Glob pattern to exclude files/modules from scan. Can be repeated.",
     ),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Number of modules to measure concurrently."),
+    pin_cpus: bool = typer.Option(
+        False,
+        "--pin-cpus",
+        help="Pin each concurrent worker to its own CPU (Linux only).",
+    ),
+    executor: str = typer.Option(
+        EXECUTOR_SPAWN,
+        "--executor",
+        help="spawn: fresh interpreter per module; forkserver: fork each module from a warm interpreter (POSIX).",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Reuse cached results for modules whose source and in-project imports are unchanged.",
+    ),
+    repeat: int = typer.Option(1, "--repeat", min=1, help="Measured imports per module, each in a fresh process."),
+    warmup: int = typer.Option(0, "--warmup", min=0, help="Unrecorded imports per module before measuring."),
+    statistic: str = typer.Option(
+        DEFAULT_STATISTIC,
+        "--statistic",
+        help="Statistic used for reported values and thresholds: min, median, mean or p95.",
+    ),
+    import_tree: bool = typer.Option(
+        False,
+        "--import-tree",
+        help="Record the nested import tree (self and cumulative time) of every module via -X importtime.",
+    ),
+    mode: str = typer.Option(
+        MODE_ISOLATED,
+        "--mode",
+        help="isolated: one interpreter per module; marginal: import all modules in dependency order in one interpreter.",
+    ),
+    preload: list[str] = typer.Option(
+        [],
+        "--preload",
+        help="Module to import before measuring in marginal mode. Can be repeated.",
+    ),
+    memory_method: str = typer.Option(
+        MEMORY_TRACEMALLOC,
+        "--memory-method",
+        help="tracemalloc: separate traced import per sample; rss: untraced RSS delta; none: time only.",
+    ),
+    pyc_mode: str | None = typer.Option(
+        None,
+        "--pyc-mode",
+        help="cold: import without any cached bytecode; warm: precompile first; both: measure and compare both.",
+    ),
+    timeout_s: float | None = typer.Option(
+        None,
+        "--timeout-s",
+        min=0.001,
+        help="Kill a module's import (and its whole process group) after this many seconds.",
+    ),
+    max_memory_mb: float | None = typer.Option(
+        None,
+        "--max-memory-mb",
+        min=1,
+        help="Address-space limit (RLIMIT_AS) for every import process, in MB.",
+    ),
+    max_cpu_s: int | None = typer.Option(
+        None,
+        "--max-cpu-s",
+        min=1,
+        help="CPU-time limit (RLIMIT_CPU) for every import process, in seconds.",
+    ),
+    alloc_sites: int = typer.Option(
+        DEFAULT_ALLOC_SITES,
+        "--alloc-sites",
+        min=0,
+        help="Top tracemalloc allocation sites to report for modules over --threshold-mb (0 disables).",
+    ),
+    alloc_frames: int = typer.Option(
+        1,
+        "--alloc-frames",
+        min=1,
+        help="Frames kept per allocation; above 1, sites are grouped by call stack instead of line.",
+    ),
+    profile_over_ms: float | None = typer.Option(
+        None,
+        "--profile-over-ms",
+        min=0,
+        help="Re-import modules slower than this under cProfile and a stack sampler; files go to .coldpy/profiles/.",
+    ),
+    zip_import: bool = typer.Option(
+        False,
+        "--zip",
+        help="Also import every module through zipimport from a zip of the discovered tree.",
+    ),
+    zip_archive: Path | None = typer.Option(
+        None,
+        "--from-zip",
+        exists=True,
+        dir_okay=False,
+        help="Also import every module from this zip, zipapp or Lambda layer instead of a packed tree.",
+    ),
+    stable: bool = typer.Option(
+        False,
+        "--stable",
+        help="Low-noise mode: pin CPUs, scrub the environment, fix PYTHONHASHSEED, interleave modules in random order and report host noise.",
+    ),
+    no_gc: bool = typer.Option(
+        False,
+        "--no-gc",
+        help="Disable the garbage collector during timed imports.",
+    ),
+    order_seed: int | None = typer.Option(
+        None,
+        "--order-seed",
+        help="Seed for the module order of --stable rounds (default: random, recorded in the report).",
+    ),
+    no_budgets: bool = typer.Option(
+        False,
+        "--no-budgets",
+        help="Ignore the import budgets in [tool.coldpy] of the project's pyproject.toml.",
+    ),
 ) -> None:
     """Scan a Python project for import time and memory cost."""
     if threshold_ms < 0 or threshold_mb < 0:
         raise typer.BadParameter("Threshold values must be >= 0")
 
-    project_root = path.resolve()
-    try:
-        runtime_python = resolve_python_executable(project_root, requested_python=python_executable)
-    except ValueError as exc:
-        console.print(f"[red]{exc}[/red]")
-        raise typer.Exit(code=1) from exc
+    if executor not in EXECUTORS:
+        raise typer.BadParameter(f"Executor must be one of: {', '.join(EXECUTORS)}")
 
-    extra_env: dict[str, str] = {}
-    env_source: Path | None = None
-    if not no_project_env or env_file is not None:
-        try:
-            extra_env, env_source = load_project_env(project_root, env_file=env_file)
-        except ValueError as exc:
-            console.print(f"[red]{exc}[/red]")
-            raise typer.Exit(code=1) from exc
+    if statistic not in STATISTICS:
+        raise typer.BadParameter(f"Statistic must be one of: {', '.join(STATISTICS)}")
 
-    scan_env = build_scan_environment(extra_env)
+    if mode not in MODES:
+        raise typer.BadParameter(f"Mode must be one of: {', '.join(MODES)}")
 
-    effective_exclusions = EXCLUSION_LABELS + [pattern for pattern in exclude if pattern not in EXCLUSION_LABELS]
-    file_exclude_patterns = DEFAULT_EXCLUDE_PATTERNS + [
-        pattern for pattern in exclude if pattern not in DEFAULT_EXCLUDE_PATTERNS
+    if memory_method not in MEMORY_METHODS:
+        raise typer.BadParameter(f"Memory method must be one of: {', '.join(MEMORY_METHODS)}")
+
+    if pyc_mode is not None and pyc_mode not in PYC_MODES:
+        raise typer.BadParameter(f"Pyc mode must be one of: {', '.join(PYC_MODES)}")
+
+    if preload and mode != MODE_MARGINAL:
+        raise typer.BadParameter("--preload requires --mode marginal")
+
+    if resume and jsonl_output is None:
+        raise typer.BadParameter("--resume requires --jsonl")
+
+    if (zip_import or zip_archive is not None) and mode != MODE_ISOLATED:
+        raise typer.BadParameter("--zip and --from-zip require --mode isolated")
+
+    if order_seed is not None and not stable:
+        raise typer.BadParameter("--order-seed requires --stable")
+
+    if python_executables and len(python_executables) > 1 and jsonl_output is not None:
+        raise typer.BadParameter("--jsonl scans a single interpreter; pass --python once")
+
+    project_root = path.resolve()
+    budgets = BudgetConfig() if no_budgets else _load_budgets_or_exit(project_root)
+    runtimes = [
+        _resolve_runtime_or_exit(project_root, python_executable, env_file, no_project_env, stable=stable)
+        for python_executable in (python_executables or [None])
     ]
+    runtime_python, scan_env, env_source = runtimes[0]
 
-    try:
-        module_targets, excluded_count = discover_modules(
+    effective_exclusions = EXCLUSION_LABELS + [pattern for pattern in exclude if pattern not in EXCLUSION_LABELS]
+    file_exclude_patterns = _file_exclude_patterns(exclude)
+    module_targets, excluded_count = _discover_or_exit(project_root, file_exclude_patterns)
+
+    scan_options = {
+        "threshold_ms": threshold_ms,
+        "threshold_mb": threshold_mb,
+        "exclusions": effective_exclusions,
+        "jobs": jobs,
+        "pin_cpus": pin_cpus,
+        "executor": executor,
+        "repeat": repeat,
+        "warmup": warmup,
+        "statistic": statistic,
+        "import_tree": import_tree,
+        "mode": mode,
+        "preload": preload,
+        "memory_method": memory_method,
+        "pyc_mode": pyc_mode,
+        "timeout_s": timeout_s,
+        "max_memory_mb": max_memory_mb,
+        "max_cpu_s": max_cpu_s,
+        "alloc_sites": alloc_sites,
+        "alloc_frames": alloc_frames,
+        "profile_over_ms": profile_over_ms,
+        "zip_import": zip_import,
+        "zip_archive": zip_archive.resolve() if zip_archive is not None else None,
+        "stable": stable,
+        "disable_gc": no_gc,
+        "order_seed": order_seed,
+    }
+    if len(runtimes) > 1:
+        if env_source is not None:
+            console.print(f"[dim]Loaded env vars from: {env_source}[/dim]")
+        _scan_matrix(
             project_root,
-            exclude_patterns=file_exclude_patterns,
-            return_excluded_count=True,
+            module_targets,
+            [(python, env) for python, env, _ in runtimes],
+            scan_options,
+            budgets=budgets,
+            incremental=incremental,
+            no_cache=no_cache,
+            json_output=json_output,
+        )
+        return
+
+    previous_results = _previous_results(project_root, runtime_python) if incremental else None
+
+    resumed: dict[str, ModuleResult] = {}
+    if jsonl_output is not None:
+        if resume:
+            resumed = read_jsonl_results(jsonl_output)
+            previous_results = {**(previous_results or {}), **resumed}
+        try:
+            jsonl_output.parent.mkdir(parents=True, exist_ok=True)
+            # Rewriting on resume also drops a trailing line cut short by the interruption.
+            jsonl_output.write_text(
+                "".join(json.dumps(module.to_dict()) + "\n" for module in resumed.values()),
+                encoding="utf-8",
+            )
+        except OSError as exc:
+            console.print(f"[red]Failed to write JSONL report: {exc}[/red]")
+            raise typer.Exit(code=1) from exc
+
+    try:
+        scan = iter_scan(
+            project_root=project_root,
+            module_targets=module_targets,
+            python_executable=runtime_python,
+            scan_env=scan_env,
+            previous_results=previous_results,
+            **scan_options,
         )
     except ValueError as exc:
         console.print(f"[red]{exc}[/red]")
         raise typer.Exit(code=1) from exc
-
-    if not module_targets:
-        console.print("[red]No Python modules found for scanning.[/red]")
-        raise typer.Exit(code=1)
-
-    payload = scan_modules(
-        project_root=project_root,
-        module_targets=module_targets,
-        threshold_ms=threshold_ms,
-        threshold_mb=threshold_mb,
-        exclusions=effective_exclusions,
-        python_executable=runtime_python,
-        scan_env=scan_env,
+    progress = Progress(
+        TextColumn("{task.description}"),
+        BarColumn(),
+        MofNCompleteColumn(),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
     )
+    try:
+        with progress:
+            task = progress.add_task("Scanning", total=len(module_targets))
+            while True:
+                try:
+                    module = next(scan)
+                except StopIteration as finished:
+                    payload = finished.value
+                    break
+                already_recorded = module.name in resumed and resumed[module.name].fingerprint == module.fingerprint
+                if jsonl_output is not None and not already_recorded:
+                    append_jsonl_result(module, jsonl_output)
+                progress.update(task, advance=1, description=module.name)
+    except ValueError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+    except KeyboardInterrupt as exc:
+        scan.close()
+        console.print("[yellow]Scan interrupted.[/yellow]")
+        if jsonl_output is not None:
+            console.print(f"Finished modules are in {jsonl_output}; rerun with --resume to continue.")
+        raise typer.Exit(code=130) from exc
+
+    if jsonl_output is not None:
+        # Resumed lines whose fingerprint no longer matches were measured again and appended, and
+        # profiles are only attached to the final results.
+        try:
+            jsonl_output.write_text(
+                "".join(json.dumps(module.to_dict()) + "\n" for module in payload.modules),
+                encoding="utf-8",
+            )
+        except OSError as exc:
+            console.print(f"[red]Failed to write JSONL report: {exc}[/red]")
+            raise typer.Exit(code=1) from exc
 
     console.print(f"[dim]Runtime Python: {runtime_python}[/dim]")
     if env_source is not None:
         console.print(f"[dim]Loaded env vars from: {env_source}[/dim]")
+    if payload.stats is not None and payload.stats.reused_modules > 0:
+        console.print(f"[dim]Reused unchanged modules from cache: {payload.stats.reused_modules}[/dim]")
     if excluded_count > 0:
-        console.print(f"[dim]Excluded modules/files: {excluded_count} (patterns: {', '.join(file_exclude_patterns)})[/dim]")
+        console.print(f"[dim]Excluded files/directories: {excluded_count} (patterns: {', '.join(file_exclude_patterns)})[/dim]")
+    if payload.host is not None:
+        render_host(payload.host, payload.settings.order_seed)
 
     sorted_modules = _sort_modules(payload.modules, TopSort.TIME)
     render_modules_table(sorted_modules, title="ColdPy Scan Report")
+    render_allocation_sites(sorted_modules)
+    render_profiles(sorted_modules)
     print_summary(payload)
 
-    if not no_cache:
-        write_cache(payload)
+    _finish_scan(project_root, [(None, str(runtime_python), payload)], payload, budgets, mode, no_cache, json_output)
+
+
+@app.command()
+def top(
+    n: int = typer.Argument(10, min=1),
+    sort: str = typer.Option(
+        TopSort.TIME,
+        "--sort",
+        help="Sort by time, memory, or self (self time of every imported module; needs scan --import-tree).",
+    ),
+    threshold_ms: float = typer.Option(DEFAULT_THRESHOLD_MS, "--threshold-ms"),
+    threshold_mb: float = typer.Option(DEFAULT_THRESHOLD_MB, "--threshold-mb"),
+    statistic: str | None = typer.Option(
+        None,
+        "--statistic",
+        help="Rank by this statistic of repeated samples (min, median, mean, p95). Defaults to the scan's.",
+    ),
+    run: str = typer.Option("latest", "--run", help="Run id or git commit to read (see `coldpy history`)."),
+    by: str = typer.Option(
+        TopBy.MODULE,
+        "--by",
+        help="Rank scanned modules, or dist: project, stdlib and each installed distribution (needs scan --import-tree).",
+    ),
+) -> None:
+    """Show top heavy imports from the scan history (latest run by default)."""
+    if sort not in {TopSort.TIME, TopSort.MEMORY, TopSort.SELF}:
+        raise typer.BadParameter("Sort must be one of: time, memory, self")
+
+    if by not in {TopBy.MODULE, TopBy.DIST}:
+        raise typer.BadParameter("--by must be one of: module, dist")
+
+    if by == TopBy.DIST:
+        try:
+            with HistoryStore.open(create=False) as store:
+                payload = store.load_payload(store.resolve_run(run))
+        except HistoryError as exc:
+            console.print(f"[red]{exc}[/red]")
+            raise typer.Exit(code=1) from exc
+        if payload.distributions is None:
+            console.print("[red]Recorded scan has no distribution costs. Run `coldpy scan <path> --import-tree` first.[/red]")
+            raise typer.Exit(code=1)
+        ranked_costs = sorted(payload.distributions, key=DIST_SORT_KEYS[sort], reverse=True)[:n]
+        render_distributions_table(ranked_costs, title="ColdPy Top Distributions")
+        return
+
+    if statistic is not None and statistic not in STATISTICS:
+        raise typer.BadParameter(f"Statistic must be one of: {', '.join(STATISTICS)}")
+
+    if threshold_ms < 0 or threshold_mb < 0:
+        raise typer.BadParameter("Threshold values must be >= 0")
+
+    try:
+        with HistoryStore.open(create=False) as store:
+            run_id = store.resolve_run(run)
+            if sort == TopSort.SELF:
+                if not store.has_import_trees(run_id):
+                    console.print(
+                        "[red]Recorded scan has no import trees. Run `coldpy scan <path> --import-tree` first.[/red]"
+                    )
+                    raise typer.Exit(code=1)
+                costs = store.top_import_costs(run_id, min_self_ms=threshold_ms, limit=n)
+                ranked = []
+            else:
+                costs = []
+                ranked = store.top_modules(
+                    run_id,
+                    sort_by=sort,
+                    statistic=statistic,
+                    threshold_ms=threshold_ms,
+                    threshold_mb=threshold_mb,
+                    limit=n,
+                )
+    except HistoryError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    if not costs and not ranked:
+        console.print("[yellow]No modules match the requested thresholds.[/yellow]")
+        raise typer.Exit(code=0)
+
+    if sort == TopSort.SELF:
+        render_import_costs_table(costs, title="ColdPy Top Imports by Self Time")
+    else:
+        render_modules_table(ranked, title="ColdPy Top Imports")
+
+
+@app.command()
+def suggest(
+    path: Path = typer.Argument(
+        Path("."),
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Project path to analyze (defaults to current directory).",
+    ),
+    n: int = typer.Option(20, "--limit", "-n", min=1, help="Number of suggestions to show."),
+    min_ms: float = typer.Option(1.0, "--min-ms", min=0, help="Skip imports cheaper than this cumulative cost."),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        help="Glob pattern to exclude files/modules from the analysis. Can be repeated.",
+    ),
+    run: str = typer.Option("latest", "--run", help="Run id or git commit to take costs from (see `coldpy history`)."),
+    json_output: Path | None = typer.Option(None, "--json", help="Write all suggestions to file."),
+) -> None:
+    """Rank module-level imports that are only used inside functions by their measured cost."""
+    project_root = path.resolve()
+    module_targets, _ = _discover_or_exit(project_root, _file_exclude_patterns(exclude))
 
+    try:
+        with HistoryStore.open(create=False) as store:
+            run_id = store.resolve_run(run)
+            costs = store.metric_values(run_id, "import_time_ms")
+            costs.update(store.cumulative_import_costs(run_id))
+    except HistoryError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    findings = suggest_deferrals(module_targets, costs, min_cost_ms=min_ms)
     if json_output is not None:
         try:
-            write_json_report(payload, json_output)
+            json_output.parent.mkdir(parents=True, exist_ok=True)
+            json_output.write_text(json.dumps([finding.to_dict() for finding in findings], indent=2), encoding="utf-8")
         except OSError as exc:
             console.print(f"[red]Failed to write JSON report: {exc}[/red]")
             raise typer.Exit(code=1) from exc
 
-    if payload.summary.scanned_modules == 0:
+    if not findings:
+        console.print("[yellow]No measured module-level imports are used only inside functions.[/yellow]")
+        raise typer.Exit(code=0)
+
+    render_suggestions_table(findings[:n])
+    # The same import deferred in several modules is only paid once.
+    upper_bound_ms = sum({finding.imported: finding.cost_ms or 0.0 for finding in findings}.values())
+    console.print(f"Deferrable imports: {len(findings)}, saving at most {upper_bound_ms:.1f} ms")
+
+
+@app.command()
+def graph(
+    path: Path = typer.Argument(
+        Path("."),
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Project path to analyze (defaults to current directory).",
+    ),
+    output_format: str = typer.Option(GraphFormat.DOT, "--format", help="Output format: dot or json."),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the graph to file instead of stdout."),
+    exclude: list[str] = typer.Option(
+        [],
+        "--exclude",
+        help="Glob pattern to exclude files/modules from the graph. Can be repeated.",
+    ),
+    jobs: int = typer.Option(1, "--jobs", "-j", min=1, help="Number of processes used to parse files."),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Do not read or write .coldpy/ast_cache.json"),
+) -> None:
+    """Build the project import graph from source, without importing anything."""
+    if output_format not in {GraphFormat.JSON, GraphFormat.DOT}:
+        raise typer.BadParameter("Format must be one of: dot, json")
+
+    project_root = path.resolve()
+    module_targets, _ = _discover_or_exit(project_root, _file_exclude_patterns(exclude))
+
+    parsed = parse_modules(module_targets, jobs=jobs, cached=None if no_cache else read_ast_cache())
+    if not no_cache:
+        write_ast_cache(parsed)
+    import_graph = build_import_graph(parsed)
+
+    if output_format == GraphFormat.JSON:
+        rendered = json.dumps(import_graph.to_dict(), indent=2) + "\n"
+    else:
+        costs: dict[str, float] = {}
+        try:
+            with HistoryStore.open(create=False) as store:
+                costs = store.metric_values(store.latest_run_id(project_root), "import_time_ms")
+        except HistoryError:
+            costs = {}
+        rendered = import_graph.to_dot(costs)
+
+    if output is None:
+        typer.echo(rendered, nl=False)
+        return
+
+    try:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(rendered, encoding="utf-8")
+    except OSError as exc:
+        console.print(f"[red]Failed to write graph: {exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    cycles = import_graph.cycles()
+    console.print(
+        f"Modules: {len(import_graph.modules)}, Imports: {len(import_graph.edges)}, Circular import groups: {len(cycles)}"
+    )
+    for component in cycles:
+        console.print(f"[yellow]Cycle: {' -> '.join(component)}[/yellow]")
+
+
+@app.command()
+def history(
+    module: str | None = typer.Argument(None, help="Show one module's trend instead of the list of runs."),
+    metric: str = typer.Option(
+        "import_time_ms",
+        "--metric",
+        help="Metric for a module trend, e.g. import_time_ms, memory_mb, time_p95, rss_delta_mb.",
+    ),
+    limit: int = typer.Option(20, "--limit", "-n", min=1, help="Number of runs to show."),
+) -> None:
+    """List recorded scan runs, or one module's metric across runs."""
+    try:
+        with HistoryStore.open(create=False) as store:
+            if module is None:
+                render_runs_table(store.runs(limit=limit))
+                return
+            points = store.module_history(module, metric=metric, limit=limit)
+    except HistoryError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    if not points:
+        console.print(f"[yellow]No recorded {metric} for module: {module}[/yellow]")
         raise typer.Exit(code=1)
+    render_metric_history_table(points, title=f"{module}: {metric}")
 
 
 @app.command()
-def top(
-    n: int = typer.Argument(10, min=1),
-    sort: str = typer.Option(TopSort.TIME, "--sort", help="Sort by time or memory."),
-    threshold_ms: float = typer.Option(DEFAULT_THRESHOLD_MS, "--threshold-ms"),
-    threshold_mb: float = typer.Option(DEFAULT_THRESHOLD_MB, "--threshold-mb"),
+def export(
+    run: str = typer.Option("latest", "--run", help="Run id or git commit to export."),
+    output: Path | None = typer.Option(None, "--output", "-o", help="Write the JSON report to file instead of stdout."),
 ) -> None:
-    """Show top heavy imports from the latest cache."""
-    if sort not in {TopSort.TIME, TopSort.MEMORY}:
-        raise typer.BadParameter("Sort must be one of: time, memory")
+    """Export one recorded run as a JSON report (the `scan --json` schema)."""
+    try:
+        with HistoryStore.open(create=False) as store:
+            payload = store.load_payload(store.resolve_run(run))
+    except HistoryError as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    if output is None:
+        typer.echo(json.dumps(payload.to_dict(), indent=2))
+        return
+
+    try:
+        write_json_report(payload, output)
+    except OSError as exc:
+        console.print(f"[red]Failed to write JSON report: {exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+
+@app.command()
+def diff(
+    base: str = typer.Argument(..., help="Baseline scan: JSON report, run id or git commit."),
+    head: str = typer.Argument("latest", help="Scan to check: JSON report, run id or git commit."),
+    max_increase_ms: float = typer.Option(
+        DEFAULT_MAX_INCREASE_MS, "--max-increase-ms", min=0, help="Absolute import time increase allowed per module."
+    ),
+    max_increase_mb: float = typer.Option(
+        DEFAULT_MAX_INCREASE_MB, "--max-increase-mb", min=0, help="Absolute memory increase allowed per module."
+    ),
+    max_increase_pct: float = typer.Option(
+        DEFAULT_MAX_INCREASE_PCT, "--max-increase-pct", min=0, help="Relative increase allowed per module."
+    ),
+    alpha: float = typer.Option(
+        DEFAULT_ALPHA,
+        "--alpha",
+        min=0,
+        max=1,
+        help="Significance level of the Mann-Whitney U test on repeated samples.",
+    ),
+    json_output: Path | None = typer.Option(None, "--json", help="Write the comparison as JSON to file."),
+) -> None:
+    """Compare two scans and exit with code 3 on significant per-module regressions."""
+    limits = DiffLimits(
+        max_increase_ms=max_increase_ms,
+        max_increase_mb=max_increase_mb,
+        max_increase_pct=max_increase_pct,
+        alpha=alpha,
+    )
+    result = diff_payloads(_load_scan_or_exit(base), _load_scan_or_exit(head), limits)
+    render_diff_table(result, title=f"ColdPy Diff: {base} -> {head}")
+
+    if json_output is not None:
+        try:
+            json_output.parent.mkdir(parents=True, exist_ok=True)
+            json_output.write_text(json.dumps(result.to_dict(), indent=2), encoding="utf-8")
+        except OSError as exc:
+            console.print(f"[red]Failed to write JSON report: {exc}[/red]")
+            raise typer.Exit(code=1) from exc
+
+    if result.failed:
+        console.print(
+            f"[red]Regressions: {len(result.regressions)}, newly failing imports: {len(result.newly_failing)}[/red]"
+        )
+        raise typer.Exit(code=EXIT_REGRESSION)
+    console.print("No significant regressions.")
 
-    if threshold_ms < 0 or threshold_mb < 0:
-        raise typer.BadParameter("Threshold values must be >= 0")
 
+@app.command()
+def startup(
+    path: Path = typer.Argument(
+        Path("."),
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Project path to start the entry point from (defaults to current directory).",
+    ),
+    target: str = typer.Option(..., "--module", "-m", help="Entry point: pkg.mod or pkg.mod:callable."),
+    call: bool = typer.Option(False, "--call", help="Also call the callable (e.g. an app factory) before it counts as ready."),
+    repeat: int = typer.Option(DEFAULT_STARTUP_REPEAT, "--repeat", min=1, help="Measured cold starts."),
+    warmup: int = typer.Option(DEFAULT_STARTUP_WARMUP, "--warmup", min=0, help="Unrecorded cold starts first."),
+    timeout_s: float | None = typer.Option(None, "--timeout-s", min=0.001, help="Give up on a start after this many seconds."),
+    python_executable: Path | None = typer.Option(
+        None,
+        "--python",
+        help="Python executable to launch. Defaults to project venv if found.",
+    ),
+    env_file: Path | None = typer.Option(None, "--env-file", help="Path to .env file to load for the entry point."),
+    no_project_env: bool = typer.Option(
+        False,
+        "--no-project-env",
+        help="Disable auto-loading .env/.env.local from project root.",
+    ),
+    json_output: Path | None = typer.Option(None, "--json", help="Write the startup report to file."),
+) -> None:
+    """Cold-start a real entry point repeatedly and break startup into init, site and imports."""
+    if call and ":" not in target:
+        raise typer.BadParameter("--call requires an entry point of the form pkg.mod:callable")
+
+    project_root = path.resolve()
+    runtime_python, scan_env, env_source = _resolve_runtime_or_exit(
+        project_root, python_executable, env_file, no_project_env
+    )
     try:
-        payload: ScanPayload = read_cache()
-    except CacheError as exc:
+        report = measure_startup(
+            project_root,
+            target,
+            python_executable=runtime_python,
+            scan_env=scan_env,
+            repeat=repeat,
+            warmup=warmup,
+            call=call,
+            timeout_s=timeout_s,
+        )
+    except (StartupError, ValueError) as exc:
         console.print(f"[red]{exc}[/red]")
         raise typer.Exit(code=1) from exc
 
-    filtered = _filter_successful(payload.modules, threshold_ms=threshold_ms, threshold_mb=threshold_mb)
-    ranked = _sort_modules(filtered, sort)[:n]
+    console.print(f"[dim]Runtime Python: {runtime_python}[/dim]")
+    if env_source is not None:
+        console.print(f"[dim]Loaded env vars from: {env_source}[/dim]")
+    render_startup_report(report)
+
+    if json_output is not None:
+        try:
+            json_output.parent.mkdir(parents=True, exist_ok=True)
+            json_output.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+        except OSError as exc:
+            console.print(f"[red]Failed to write JSON report: {exc}[/red]")
+            raise typer.Exit(code=1) from exc
 
-    if not ranked:
-        console.print("[yellow]No modules match the requested thresholds.[/yellow]")
-        raise typer.Exit(code=0)
 
-    render_modules_table(ranked, title="ColdPy Top Imports")
+@app.command()
+def whatif(
+    target: str = typer.Argument(..., help="Entry point: pkg.mod or pkg.mod:callable."),
+    path: Path = typer.Argument(
+        Path("."),
+        exists=True,
+        file_okay=False,
+        dir_okay=True,
+        help="Project path to start the entry point from (defaults to current directory).",
+    ),
+    lazy: list[str] = typer.Option(..., "--lazy", help="Module to load through importlib.util.LazyLoader. Repeatable."),
+    call: bool = typer.Option(False, "--call", help="Also call the callable (e.g. an app factory) before it counts as ready."),
+    repeat: int = typer.Option(DEFAULT_STARTUP_REPEAT, "--repeat", min=1, help="Measured cold starts per variant."),
+    warmup: int = typer.Option(DEFAULT_STARTUP_WARMUP, "--warmup", min=0, help="Unrecorded cold starts per variant first."),
+    timeout_s: float | None = typer.Option(None, "--timeout-s", min=0.001, help="Give up on a start after this many seconds."),
+    python_executable: Path | None = typer.Option(
+        None,
+        "--python",
+        help="Python executable to launch. Defaults to project venv if found.",
+    ),
+    env_file: Path | None = typer.Option(None, "--env-file", help="Path to .env file to load for the entry point."),
+    no_project_env: bool = typer.Option(
+        False,
+        "--no-project-env",
+        help="Disable auto-loading .env/.env.local from project root.",
+    ),
+    json_output: Path | None = typer.Option(None, "--json", help="Write the what-if report to file."),
+) -> None:
+    """Project the startup savings of lazy-loading modules and show what would still force them."""
+    if call and ":" not in target:
+        raise typer.BadParameter("--call requires an entry point of the form pkg.mod:callable")
+
+    project_root = path.resolve()
+    runtime_python, scan_env, env_source = _resolve_runtime_or_exit(
+        project_root, python_executable, env_file, no_project_env
+    )
+    try:
+        report = simulate_lazy(
+            project_root,
+            target,
+            lazy,
+            python_executable=runtime_python,
+            scan_env=scan_env,
+            repeat=repeat,
+            warmup=warmup,
+            call=call,
+            timeout_s=timeout_s,
+        )
+    except (StartupError, ValueError) as exc:
+        console.print(f"[red]{exc}[/red]")
+        raise typer.Exit(code=1) from exc
+
+    console.print(f"[dim]Runtime Python: {runtime_python}[/dim]")
+    if env_source is not None:
+        console.print(f"[dim]Loaded env vars from: {env_source}[/dim]")
+    render_whatif_report(report)
+
+    if json_output is not None:
+        try:
+            json_output.parent.mkdir(parents=True, exist_ok=True)
+            json_output.write_text(json.dumps(report.to_dict(), indent=2), encoding="utf-8")
+        except OSError as exc:
+            console.print(f"[red]Failed to write JSON report: {exc}[/red]")
+            raise typer.Exit(code=1) from exc
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+PYPROJECT_FILE_NAME = "pyproject.toml"
+
+
+class ConfigError(Exception):
+    pass
+
+
+def load_tool_config(project_root: Path) -> tuple[dict[str, Any], Path | None]:
+    """The ``[tool.coldpy]`` table of ``project_root/pyproject.toml`` and the file it came from."""
+    path = project_root / PYPROJECT_FILE_NAME
+    if not path.is_file():
+        return {}, None
+    try:
+        data = tomllib.loads(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, tomllib.TOMLDecodeError) as exc:
+        raise ConfigError(f"Failed to read {path}: {exc}") from exc
+    table = data.get("tool", {}).get("coldpy", {})
+    if not isinstance(table, dict):
+        raise ConfigError(f"[tool.coldpy] in {path} must be a table")
+    return table, path
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from coldpy.models import ModuleResult, SampleStats, ScanPayload
+from coldpy.stats import mann_whitney_u, min_p_value
+
+DEFAULT_MAX_INCREASE_MS = 5.0
+DEFAULT_MAX_INCREASE_MB = 5.0
+DEFAULT_MAX_INCREASE_PCT = 10.0
+DEFAULT_ALPHA = 0.05
+
+
+@dataclass
+class DiffLimits:
+    """A module regresses only when it grows by more than both the absolute and the relative limit."""
+
+    max_increase_ms: float = DEFAULT_MAX_INCREASE_MS
+    max_increase_mb: float = DEFAULT_MAX_INCREASE_MB
+    max_increase_pct: float = DEFAULT_MAX_INCREASE_PCT
+    alpha: float = DEFAULT_ALPHA
+
+
+@dataclass
+class MetricDiff:
+    base: float | None
+    head: float | None
+    delta: float | None
+    delta_pct: float | None
+    p_value: float | None
+    regression: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ModuleDiff:
+    name: str
+    time: MetricDiff
+    memory: MetricDiff
+
+    @property
+    def regression(self) -> bool:
+        return self.time.regression or self.memory.regression
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "time": self.time.to_dict(),
+            "memory": self.memory.to_dict(),
+            "regression": self.regression,
+        }
+
+
+@dataclass
+class ScanDiff:
+    changed: list[ModuleDiff]
+    added: list[str]
+    removed: list[str]
+    newly_failing: list[str]
+    limits: DiffLimits
+
+    @property
+    def regressions(self) -> list[ModuleDiff]:
+        return [module for module in self.changed if module.regression]
+
+    @property
+    def failed(self) -> bool:
+        return bool(self.regressions or self.newly_failing)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "limits": asdict(self.limits),
+            "changed": [module.to_dict() for module in self.changed],
+            "added": self.added,
+            "removed": self.removed,
+            "newly_failing": self.newly_failing,
+            "regressions": [module.name for module in self.regressions],
+        }
+
+
+def _samples(stats: SampleStats | None, value: float | None) -> list[float]:
+    if stats is not None and stats.samples:
+        return list(stats.samples)
+    return [value] if value is not None else []
+
+
+def _compare(
+    base: float | None,
+    head: float | None,
+    base_samples: list[float],
+    head_samples: list[float],
+    max_increase: float,
+    limits: DiffLimits,
+) -> MetricDiff:
+    if base is None or head is None:
+        return MetricDiff(base=base, head=head, delta=None, delta_pct=None, p_value=None)
+
+    delta = head - base
+    delta_pct = delta / base * 100 if base > 0 else None
+    p_value = mann_whitney_u(base_samples, head_samples)
+    exceeds = delta > max_increase and (delta_pct is None or delta_pct > limits.max_increase_pct)
+    # Without repeated samples, or too few for any p-value below alpha (3 per side), the limits alone decide.
+    significant = (
+        p_value is None
+        or p_value < limits.alpha
+        or min_p_value(len(base_samples), len(head_samples)) >= limits.alpha
+    )
+    return MetricDiff(
+        base=base,
+        head=head,
+        delta=round(delta, 3),
+        delta_pct=round(delta_pct, 2) if delta_pct is not None else None,
+        p_value=round(p_value, 4) if p_value is not None else None,
+        regression=exceeds and significant,
+    )
+
+
+def diff_modules(base: ModuleResult, head: ModuleResult, limits: DiffLimits) -> ModuleDiff:
+    return ModuleDiff(
+        name=head.name,
+        time=_compare(
+            base.import_time_ms,
+            head.import_time_ms,
+            _samples(base.time_stats, base.import_time_ms),
+            _samples(head.time_stats, head.import_time_ms),
+            limits.max_increase_ms,
+            limits,
+        ),
+        memory=_compare(
+            base.memory_mb,
+            head.memory_mb,
+            _samples(base.memory_stats, base.memory_mb),
+            _samples(head.memory_stats, head.memory_mb),
+            limits.max_increase_mb,
+            limits,
+        ),
+    )
+
+
+def diff_payloads(base: ScanPayload, head: ScanPayload, limits: DiffLimits | None = None) -> ScanDiff:
+    """Compare two scans module by module, testing repeated samples with Mann-Whitney U."""
+    limits = limits or DiffLimits()
+    base_modules = {module.name: module for module in base.modules}
+    head_modules = {module.name: module for module in head.modules}
+
+    changed: list[ModuleDiff] = []
+    newly_failing: list[str] = []
+    for name, head_module in head_modules.items():
+        base_module = base_modules.get(name)
+        if base_module is None:
+            continue
+        if base_module.status == "ok" and head_module.status != "ok":
+            newly_failing.append(name)
+            continue
+        if base_module.status == "ok" and head_module.status == "ok":
+            changed.append(diff_modules(base_module, head_module, limits))
+
+    changed.sort(key=lambda module: module.time.delta or 0.0, reverse=True)
+    return ScanDiff(
+        changed=changed,
+        added=sorted(name for name in head_modules if name not in base_modules),
+        removed=sorted(name for name in base_modules if name not in head_modules),
+        newly_failing=sorted(newly_failing),
+        limits=limits,
+    )
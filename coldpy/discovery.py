@@ -1,6 +1,9 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import fnmatch
+import os
+import re
+from dataclasses import dataclass, field
 from pathlib import Path
 
 EXCLUDED_DIRS = {
@@ -13,6 +16,7 @@ EXCLUDED_DIRS = {
     "build",
     "dist",
     "tests",
+    "node_modules",
 }
 
 DEFAULT_EXCLUDE_PATTERNS = [
@@ -31,70 +35,223 @@ class ModuleTarget:
     file: Path
 
 
-def _is_hidden(path: Path) -> bool:
-    return any(part.startswith(".") for part in path.parts)
+GITIGNORE_FILE = ".gitignore"
 
 
-def _is_excluded_file(path: Path) -> bool:
-    name = path.name
+def _is_hidden(name: str) -> bool:
+    return name.startswith(".")
+
+
+def _is_excluded_file(name: str) -> bool:
     return name.startswith("test_") or name.endswith("_test.py")
 
 
-def _to_module_name(scan_root: Path, file_path: Path) -> str:
-    relative = file_path.relative_to(scan_root)
-    parts = list(relative.parts)
+def _to_module_name(relative_parts: tuple[str, ...]) -> str:
+    parts = list(relative_parts)
     if parts[-1] == "__init__.py":
         parts = parts[:-1]
     else:
-        parts[-1] = Path(parts[-1]).stem
+        parts[-1] = parts[-1][: -len(".py")]
     return ".".join(parts)
 
 
-def _matches_exclude_patterns(relative_path: Path, exclude_patterns: list[str]) -> bool:
-    path_str = str(relative_path)
-    for pattern in exclude_patterns:
-        if relative_path.match(pattern) or path_str.startswith(pattern.rstrip("/*")):
+def _segment_regex(segment: str) -> str:
+    # fnmatch.translate returns "(?s:...)\Z"; within one path segment "*" must not cross "/".
+    return fnmatch.translate(segment)[4:-3].replace(".*", "[^/]*")
+
+
+class _ExcludeMatcher:
+    """All ``--exclude`` patterns compiled into a single regex.
+
+    A pattern excludes a path when it matches the trailing path segments (``Path.match``) or when
+    the path starts with the pattern minus its trailing ``/`` and ``*`` characters.
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.prefixes = tuple(pattern.rstrip("/*") for pattern in patterns)
+        tails = ["/".join(_segment_regex(segment) for segment in pattern.split("/")) for pattern in patterns]
+        self._tail = re.compile(rf"(?:.*/)?(?:{'|'.join(tails)})") if tails else None
+
+    def excludes_dir(self, relative: str) -> bool:
+        """True when every file below ``relative`` is excluded by prefix, so it need not be walked."""
+        return relative.startswith(self.prefixes)
+
+    def excludes_file(self, relative: str) -> bool:
+        if relative.startswith(self.prefixes):
             return True
-    return False
+        return self._tail is not None and self._tail.fullmatch(relative) is not None
 
 
-def discover_modules(
-    scan_path: Path,
-    exclude_patterns: list[str] | None = None,
-    return_excluded_count: bool = False,
-) -> list[ModuleTarget] | tuple[list[ModuleTarget], int]:
-    if not scan_path.exists() or not scan_path.is_dir():
-        raise ValueError(f"Invalid scan path: {scan_path}")
+@dataclass(frozen=True)
+class _IgnoreRule:
+    regex: re.Pattern[str]
+    negated: bool
+    dir_only: bool
 
-    module_targets: list[ModuleTarget] = []
-    excluded_count = 0
-    effective_patterns = exclude_patterns or DEFAULT_EXCLUDE_PATTERNS
-    for file_path in sorted(scan_path.rglob("*.py")):
-        relative = file_path.relative_to(scan_path)
 
-        if _is_hidden(relative):
-            excluded_count += 1
+def _gitignore_regex(pattern: str) -> re.Pattern[str]:
+    """Translate one gitignore pattern, relative to its .gitignore directory, into a regex."""
+    anchored = "/" in pattern.rstrip("/")
+    pattern = pattern.strip("/")
+    parts: list[str] = []
+    for segment in pattern.split("/"):
+        parts.append("(?:.*/)?" if segment == "**" else _segment_regex(segment) + "/")
+    body = "".join(parts)
+    if body.endswith("/"):
+        body = body[:-1]
+    elif body.endswith("(?:.*/)?"):
+        body = body[: -len("(?:.*/)?")] + ".*"
+    return re.compile(body if anchored else f"(?:.*/)?{body}")
+
+
+def _read_gitignore(directory: str, base: str) -> list[tuple[str, _IgnoreRule]]:
+    try:
+        with open(os.path.join(directory, GITIGNORE_FILE), encoding="utf-8") as handle:
+            lines = handle.read().splitlines()
+    except (OSError, UnicodeDecodeError):
+        return []
+
+    rules: list[tuple[str, _IgnoreRule]] = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated or line.startswith("\\"):
+            line = line[1:]
+        if not line.strip("/"):
             continue
+        rule = _IgnoreRule(regex=_gitignore_regex(line), negated=negated, dir_only=line.endswith("/"))
+        rules.append((base, rule))
+    return rules
 
-        if any(part in EXCLUDED_DIRS for part in relative.parts[:-1]):
-            excluded_count += 1
+
+def _is_ignored(relative: str, is_dir: bool, rules: list[tuple[str, _IgnoreRule]]) -> bool:
+    # Like git, the last matching rule wins; rules apply relative to their own .gitignore.
+    ignored = False
+    for base, rule in rules:
+        if rule.dir_only and not is_dir:
             continue
+        if base:
+            if not relative.startswith(base + "/"):
+                continue
+            candidate = relative[len(base) + 1 :]
+        else:
+            candidate = relative
+        if rule.regex.fullmatch(candidate):
+            ignored = not rule.negated
+    return ignored
+
+
+@dataclass
+class _Walk:
+    """Files found and entries excluded by the walk.
 
-        if _is_excluded_file(file_path):
-            excluded_count += 1
+    ``ignore_parts`` locates the scan root inside its git repository; ignore rules and the paths
+    they are matched against are relative to the repository root.
+    """
+
+    matcher: _ExcludeMatcher
+    gitignore: bool
+    ignore_parts: tuple[str, ...] = ()
+    files: list[tuple[tuple[str, ...], str]] = field(default_factory=list)
+    excluded: int = 0
+
+
+_Directory = tuple[str, tuple[str, ...], list[tuple[str, _IgnoreRule]]]
+
+
+def _scan_directory(walk: _Walk, directory: _Directory) -> list[_Directory]:
+    """Record the ``.py`` files in one directory and return the subdirectories worth descending into."""
+    path, parts, rules = directory
+    if walk.gitignore:
+        rules = rules + _read_gitignore(path, "/".join((*walk.ignore_parts, *parts)))
+    try:
+        with os.scandir(path) as iterator:
+            entries = list(iterator)
+    except OSError:
+        return []
+
+    subdirectories: list[_Directory] = []
+    for entry in entries:
+        name = entry.name
+        entry_parts = (*parts, name)
+        relative = "/".join(entry_parts)
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_dir:
+            if (
+                _is_hidden(name)
+                or name in EXCLUDED_DIRS
+                or walk.matcher.excludes_dir(relative)
+                or (rules and _is_ignored("/".join((*walk.ignore_parts, *entry_parts)), True, rules))
+            ):
+                walk.excluded += 1
+            else:
+                subdirectories.append((entry.path, entry_parts, rules))
             continue
 
-        if _matches_exclude_patterns(relative, effective_patterns):
-            excluded_count += 1
+        if not name.endswith(".py"):
+            continue
+        if (
+            _is_hidden(name)
+            or _is_excluded_file(name)
+            or walk.matcher.excludes_file(relative)
+            or (rules and _is_ignored("/".join((*walk.ignore_parts, *entry_parts)), False, rules))
+        ):
+            walk.excluded += 1
             continue
+        walk.files.append((entry_parts, entry.path))
+    return subdirectories
+
+
+def _repository_rules(scan_path: Path) -> tuple[tuple[str, ...], list[tuple[str, _IgnoreRule]]]:
+    """Where ``scan_path`` sits in its git repository, and the ``.gitignore`` rules above it."""
+    resolved = scan_path.resolve()
+    for repository in (resolved, *resolved.parents):
+        if (repository / ".git").exists():
+            break
+    else:
+        return (), []
+    parts = resolved.relative_to(repository).parts
+    rules: list[tuple[str, _IgnoreRule]] = []
+    for depth in range(len(parts)):
+        rules.extend(_read_gitignore(str(repository.joinpath(*parts[:depth])), "/".join(parts[:depth])))
+    return parts, rules
+
 
-        module_name = _to_module_name(scan_path, file_path)
+def discover_modules(
+    scan_path: Path,
+    exclude_patterns: list[str] | None = None,
+    return_excluded_count: bool = False,
+    respect_gitignore: bool = True,
+) -> list[ModuleTarget] | tuple[list[ModuleTarget], int]:
+    """Find importable modules below ``scan_path`` in path order.
+
+    Excluded, hidden and git-ignored directories are pruned before they are read, so each one
+    counts once towards the excluded count. When ``scan_path`` is inside a git repository, the
+    ``.gitignore`` files between the repository root and ``scan_path`` apply too.
+    """
+    if not scan_path.exists() or not scan_path.is_dir():
+        raise ValueError(f"Invalid scan path: {scan_path}")
+
+    matcher = _ExcludeMatcher(exclude_patterns or DEFAULT_EXCLUDE_PATTERNS)
+    ignore_parts, rules = _repository_rules(scan_path) if respect_gitignore else ((), [])
+    walk = _Walk(matcher=matcher, gitignore=respect_gitignore, ignore_parts=ignore_parts)
+    pending: list[_Directory] = [(str(scan_path), (), rules)]
+    while pending:
+        pending.extend(_scan_directory(walk, pending.pop()))
+
+    module_targets: list[ModuleTarget] = []
+    for relative_parts, file_path in sorted(walk.files):
+        module_name = _to_module_name(relative_parts)
         if not module_name:
             continue
-
-        module_targets.append(ModuleTarget(name=module_name, file=file_path))
+        module_targets.append(ModuleTarget(name=module_name, file=Path(file_path)))
 
     if return_excluded_count:
-        return module_targets, excluded_count
+        return module_targets, walk.excluded
 
     return module_targets
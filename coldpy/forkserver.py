@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from coldpy.runtime import probe_source
+
+
+class ForkServerError(Exception):
+    pass
+
+
+def fork_server_supported() -> bool:
+    return hasattr(os, "fork")
+
+
+class ForkServer:
+    """A warm target interpreter that forks one fresh child per measured module."""
+
+    def __init__(
+        self,
+        project_root: Path,
+        python_executable: Path | None = None,
+        scan_env: dict[str, str] | None = None,
+        interpreter_flags: list[str] | None = None,
+        import_root: Path | None = None,
+    ) -> None:
+        if not fork_server_supported():
+            raise ForkServerError("Fork server mode requires os.fork (POSIX only).")
+
+        self.project_root = project_root
+        self.import_root = import_root or project_root
+        self.python_executable = python_executable or Path(sys.executable)
+        self.scan_env = scan_env
+        self.interpreter_flags = interpreter_flags or []
+        self._process: subprocess.Popen[str] | None = None
+
+    def __enter__(self) -> "ForkServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def start(self) -> None:
+        self._process = subprocess.Popen(
+            [
+                str(self.python_executable),
+                *self.interpreter_flags,
+                "-c",
+                probe_source(),
+                "--serve",
+                str(self.import_root),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            cwd=str(self.project_root),
+            env=self.scan_env,
+        )
+
+    def close(self) -> None:
+        process = self._process
+        self._process = None
+        if process is None:
+            return
+
+        if process.stdin is not None:
+            process.stdin.close()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        if process.stdout is not None:
+            process.stdout.close()
+
+    def _request(self, payload: dict[str, object]) -> dict[str, object]:
+        if self._process is None or self._process.poll() is not None:
+            self.close()
+            self.start()
+
+        process = self._process
+        assert process is not None and process.stdin is not None and process.stdout is not None
+        try:
+            process.stdin.write(json.dumps(payload) + "\n")
+            process.stdin.flush()
+            line = process.stdout.readline()
+        except (BrokenPipeError, OSError):
+            line = ""
+
+        if not line:
+            self.close()
+            return {
+                "status": "error",
+                "error_type": "SubprocessError",
+                "error_message": "Fork server exited unexpectedly.",
+            }
+
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError:
+            return {
+                "status": "error",
+                "error_type": "ParseError",
+                "error_message": f"Invalid fork server output: {line.strip()}",
+            }
+
+    def measure(self, module_name: str, options: dict[str, object] | None = None) -> dict[str, object]:
+        return self._request({"module": module_name, "options": options or {}})
+
+    def fork_overhead_ms(self) -> float:
+        start = time.perf_counter()
+        self._request({"module": None})
+        return (time.perf_counter() - start) * 1000
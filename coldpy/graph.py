@@ -0,0 +1,406 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from coldpy.discovery import ModuleTarget
+
+PARALLEL_PARSE_THRESHOLD = 64
+PARSE_CHUNK_SIZE = 32
+
+
+@dataclass(frozen=True)
+class ImportRef:
+    module: str
+    lineno: int
+    in_function: bool = False
+    type_checking: bool = False
+    names: tuple[str, ...] = ()
+
+    def to_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["names"] = list(self.names)
+        return data
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "ImportRef":
+        data = dict(payload)
+        data["names"] = tuple(data.get("names", ()))
+        return cls(**data)
+
+
+@dataclass
+class ParsedModule:
+    name: str
+    file: str
+    digest: str
+    imports: list[ImportRef] = field(default_factory=list)
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "file": self.file,
+            "digest": self.digest,
+            "imports": [ref.to_dict() for ref in self.imports],
+            "error": self.error,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "ParsedModule":
+        data = dict(payload)
+        data["imports"] = [ImportRef.from_dict(ref) for ref in data.get("imports", [])]
+        return cls(**data)
+
+
+@dataclass(frozen=True)
+class ImportEdge:
+    source: str
+    target: str
+    lineno: int
+    in_function: bool = False
+    type_checking: bool = False
+
+    @property
+    def runtime(self) -> bool:
+        """True when the import executes while the source module itself is being imported."""
+        return not self.in_function and not self.type_checking
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def is_package(target: ModuleTarget) -> bool:
+    return target.file.name == "__init__.py"
+
+
+def resolve_relative(module_name: str, is_package: bool, level: int, imported: str | None) -> str | None:
+    parts = module_name.split(".") if module_name else []
+    if not is_package:
+        parts = parts[:-1]
+    if level - 1 > len(parts):
+        return None
+    base = parts[: len(parts) - (level - 1)]
+    if imported:
+        base.append(imported)
+    return ".".join(base) or None
+
+
+def _parent_modules(name: str) -> list[str]:
+    parts = name.split(".")
+    return [".".join(parts[:index]) for index in range(1, len(parts) + 1)]
+
+
+def is_type_checking_test(test: ast.expr) -> bool:
+    if isinstance(test, ast.Name):
+        return test.id == "TYPE_CHECKING"
+    if isinstance(test, ast.Attribute):
+        return test.attr == "TYPE_CHECKING"
+    return False
+
+
+class _ImportCollector(ast.NodeVisitor):
+    def __init__(self, module_name: str, is_package: bool) -> None:
+        self.module_name = module_name
+        self.is_package = is_package
+        self.imports: list[ImportRef] = []
+        self._function_depth = 0
+        self._type_checking_depth = 0
+
+    def _add(self, module: str, lineno: int, names: tuple[str, ...] = ()) -> None:
+        self.imports.append(
+            ImportRef(
+                module=module,
+                lineno=lineno,
+                in_function=self._function_depth > 0,
+                type_checking=self._type_checking_depth > 0,
+                names=names,
+            )
+        )
+
+    def _visit_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef | ast.Lambda) -> None:
+        if not isinstance(node, ast.Lambda):
+            for decorator in node.decorator_list:
+                self.visit(decorator)
+        self._function_depth += 1
+        for child in node.body if isinstance(node.body, list) else [node.body]:
+            self.visit(child)
+        self._function_depth -= 1
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+    visit_Lambda = _visit_function
+
+    def visit_If(self, node: ast.If) -> None:
+        self.visit(node.test)
+        if is_type_checking_test(node.test):
+            self._type_checking_depth += 1
+            for child in node.body:
+                self.visit(child)
+            self._type_checking_depth -= 1
+        else:
+            for child in node.body:
+                self.visit(child)
+        for child in node.orelse:
+            self.visit(child)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        for alias in node.names:
+            self._add(alias.name, node.lineno)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        if node.level:
+            base = resolve_relative(self.module_name, self.is_package, node.level, node.module)
+        else:
+            base = node.module
+        if base is None:
+            return
+        self._add(base, node.lineno, tuple(alias.name for alias in node.names))
+
+
+def _file_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def parse_module(target: ModuleTarget) -> ParsedModule:
+    """Parse one file's imports without executing it."""
+    try:
+        data = Path(target.file).read_bytes()
+    except OSError as exc:
+        return ParsedModule(name=target.name, file=str(target.file), digest="missing", error=str(exc))
+
+    parsed = ParsedModule(name=target.name, file=str(target.file), digest=_file_digest(data))
+    try:
+        tree = ast.parse(data, filename=str(target.file))
+    except (SyntaxError, ValueError) as exc:
+        parsed.error = f"{type(exc).__name__}: {exc}"
+        return parsed
+
+    collector = _ImportCollector(target.name, is_package(target))
+    collector.visit(tree)
+    parsed.imports = collector.imports
+    return parsed
+
+
+def _parse_chunk(targets: list[ModuleTarget]) -> list[ParsedModule]:
+    return [parse_module(target) for target in targets]
+
+
+def parse_modules(
+    module_targets: list[ModuleTarget],
+    jobs: int = 1,
+    cached: dict[str, ParsedModule] | None = None,
+) -> list[ParsedModule]:
+    """Parse every target, reusing ``cached`` entries (keyed by file path) whose content hash still matches."""
+    cached = cached or {}
+    results: dict[str, ParsedModule] = {}
+    pending: list[ModuleTarget] = []
+    for target in module_targets:
+        entry = cached.get(str(target.file))
+        if entry is not None and entry.name == target.name:
+            try:
+                digest = _file_digest(Path(target.file).read_bytes())
+            except OSError:
+                digest = "missing"
+            if digest == entry.digest:
+                results[target.name] = entry
+                continue
+        pending.append(target)
+
+    if jobs > 1 and len(pending) >= PARALLEL_PARSE_THRESHOLD:
+        chunks = [pending[index : index + PARSE_CHUNK_SIZE] for index in range(0, len(pending), PARSE_CHUNK_SIZE)]
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for chunk in pool.map(_parse_chunk, chunks):
+                for parsed in chunk:
+                    results[parsed.name] = parsed
+    else:
+        for parsed in _parse_chunk(pending):
+            results[parsed.name] = parsed
+
+    return [results[target.name] for target in module_targets]
+
+
+def _edge_targets(ref: ImportRef, known: set[str]) -> list[str]:
+    candidates = _parent_modules(ref.module)
+    candidates.extend(f"{ref.module}.{name}" for name in ref.names if name != "*")
+    return [candidate for candidate in candidates if candidate in known]
+
+
+@dataclass
+class ImportGraph:
+    modules: dict[str, ParsedModule]
+    edges: list[ImportEdge]
+    external: dict[str, list[str]]
+
+    def dependencies(self, runtime_only: bool = False) -> dict[str, set[str]]:
+        graph: dict[str, set[str]] = {name: set() for name in self.modules}
+        for edge in self.edges:
+            if runtime_only and not edge.runtime:
+                continue
+            graph[edge.source].add(edge.target)
+        return graph
+
+    def cycles(self) -> list[list[str]]:
+        """Circular imports: strongly connected groups of modules joined by runtime imports."""
+        return [
+            component
+            for component in strongly_connected_components(self.dependencies(runtime_only=True))
+            if len(component) > 1
+        ]
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "modules": [
+                {"name": module.name, "file": module.file, "error": module.error} for module in self.modules.values()
+            ],
+            "edges": [edge.to_dict() for edge in self.edges],
+            "external": self.external,
+            "cycles": self.cycles(),
+        }
+
+    def to_dot(self, costs: dict[str, float] | None = None) -> str:
+        costs = costs or {}
+        max_cost = max(costs.values(), default=0.0)
+        component_of = {name: index for index, component in enumerate(self.cycles()) for name in component}
+        lines = ["digraph coldpy {", "  rankdir=LR;", '  node [shape=box, style=filled, fontname="Helvetica"];']
+        for name in self.modules:
+            cost = costs.get(name)
+            if cost is None:
+                color = "#dddddd"
+                label = name
+            else:
+                color = _heat_color(cost / max_cost if max_cost > 0 else 0.0)
+                label = f"{name}\\n{cost:.1f} ms"
+            lines.append(f'  "{name}" [label="{label}", fillcolor="{color}"];')
+        for edge in self.edges:
+            attributes = []
+            if not edge.runtime:
+                attributes.append("style=dashed")
+            in_cycle = edge.source in component_of and component_of[edge.source] == component_of.get(edge.target)
+            if in_cycle and edge.runtime:
+                attributes.append("color=red")
+            suffix = f" [{', '.join(attributes)}]" if attributes else ""
+            lines.append(f'  "{edge.source}" -> "{edge.target}"{suffix};')
+        lines.append("}")
+        return "\n".join(lines) + "\n"
+
+
+def _heat_color(ratio: float) -> str:
+    ratio = min(max(ratio, 0.0), 1.0)
+    red = 255
+    green = int(235 - 190 * ratio)
+    blue = int(200 - 170 * ratio)
+    return f"#{red:02x}{green:02x}{blue:02x}"
+
+
+def strongly_connected_components(graph: dict[str, set[str]]) -> list[list[str]]:
+    """Tarjan's algorithm, iterative so deep import chains cannot hit the recursion limit."""
+    index_of: dict[str, int] = {}
+    lowlink: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    components: list[list[str]] = []
+    counter = 0
+
+    for root in sorted(graph):
+        if root in index_of:
+            continue
+        work: list[tuple[str, list[str]]] = [(root, sorted(graph.get(root, ())))]
+        index_of[root] = lowlink[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, successors = work[-1]
+            if successors:
+                successor = successors.pop(0)
+                if successor not in index_of:
+                    index_of[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, sorted(graph.get(successor, ()))))
+                elif successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[successor])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component: list[str] = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(sorted(component))
+
+    return components
+
+
+def build_import_graph(parsed_modules: list[ParsedModule]) -> ImportGraph:
+    modules = {parsed.name: parsed for parsed in parsed_modules}
+    known = set(modules)
+    project_roots = {name.split(".")[0] for name in known}
+    edges: dict[tuple[str, str], ImportEdge] = {}
+    external: dict[str, list[str]] = {}
+
+    for parsed in parsed_modules:
+        for parent in _parent_modules(parsed.name)[:-1]:
+            if parent in known:
+                edges.setdefault((parsed.name, parent), ImportEdge(parsed.name, parent, lineno=0))
+
+        outside: set[str] = set()
+        for ref in parsed.imports:
+            targets = [target for target in _edge_targets(ref, known) if target != parsed.name]
+            top_level = ref.module.split(".")[0]
+            if not targets and top_level not in project_roots:
+                outside.add(top_level)
+            for target in targets:
+                edge = ImportEdge(
+                    parsed.name,
+                    target,
+                    lineno=ref.lineno,
+                    in_function=ref.in_function,
+                    type_checking=ref.type_checking,
+                )
+                existing = edges.get((parsed.name, target))
+                # Keep the strongest form of the dependency: a module-level import beats a deferred one.
+                if existing is None or (edge.runtime and not existing.runtime):
+                    edges[(parsed.name, target)] = edge
+        external[parsed.name] = sorted(outside)
+
+    ordered_edges = sorted(edges.values(), key=lambda edge: (edge.source, edge.target))
+    return ImportGraph(modules=modules, edges=ordered_edges, external=external)
+
+
+def import_order(graph: ImportGraph) -> list[str]:
+    """Modules ordered so each comes after the project modules it imports at module level.
+
+    Tarjan's algorithm emits a strongly connected component only after everything it depends on,
+    so concatenating the components gives a dependency-first order; cycles stay grouped together.
+    """
+    return [name for component in strongly_connected_components(graph.dependencies(runtime_only=True)) for name in component]
+
+
+def project_dependencies(module_targets: list[ModuleTarget]) -> dict[str, set[str]]:
+    """Map each project module to the project modules importing it may execute directly."""
+    return build_import_graph(parse_modules(module_targets)).dependencies()
+
+
+def reachable(graph: dict[str, set[str]], start: str) -> set[str]:
+    seen = {start}
+    stack = [start]
+    while stack:
+        for dependency in graph.get(stack.pop(), ()):
+            if dependency not in seen:
+                seen.add(dependency)
+                stack.append(dependency)
+    return seen
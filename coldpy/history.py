@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+import statistics
+import subprocess
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any
+
+from coldpy.cache import CACHE_DIR_NAME
+from coldpy.importtree import ImportCost, walk
+from coldpy.models import (
+    DistributionCost,
+    HostInfo,
+    ModuleResult,
+    ScanBaseline,
+    ScanPayload,
+    ScanSettings,
+    ScanStats,
+    ScanSummary,
+    schema_is_newer,
+)
+
+HISTORY_FILE_NAME = "history.sqlite"
+STATISTIC_METRICS = ("min", "median", "mean", "p95", "stdev")
+SORT_METRICS = {"time": "import_time_ms", "memory": "memory_mb"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    generated_at TEXT NOT NULL,
+    project_root TEXT NOT NULL,
+    git_commit TEXT,
+    python TEXT,
+    total_modules INTEGER NOT NULL,
+    failed_modules INTEGER NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_project ON runs (project_root, id);
+
+CREATE TABLE IF NOT EXISTS modules (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    module TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL,
+    PRIMARY KEY (run_id, module, metric)
+);
+CREATE INDEX IF NOT EXISTS metrics_by_value ON metrics (run_id, metric, value);
+CREATE INDEX IF NOT EXISTS metrics_by_module ON metrics (module, metric, run_id);
+
+CREATE TABLE IF NOT EXISTS import_nodes (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    module TEXT NOT NULL,
+    name TEXT NOT NULL,
+    self_ms REAL NOT NULL,
+    cumulative_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS import_nodes_by_name ON import_nodes (run_id, name);
+"""
+
+
+class HistoryError(Exception):
+    pass
+
+
+@dataclass
+class RunInfo:
+    id: int
+    generated_at: str
+    project_root: str
+    git_commit: str | None
+    python: str | None
+    total_modules: int
+    failed_modules: int
+
+
+@dataclass
+class MetricPoint:
+    run: RunInfo
+    value: float
+
+
+class _Median:
+    def __init__(self) -> None:
+        self.values: list[float] = []
+
+    def step(self, value: float | None) -> None:
+        if value is not None:
+            self.values.append(value)
+
+    def finalize(self) -> float | None:
+        return statistics.median(self.values) if self.values else None
+
+
+def history_path(base_dir: Path | None = None) -> Path:
+    base = base_dir or Path.cwd()
+    return base / CACHE_DIR_NAME / HISTORY_FILE_NAME
+
+
+def git_commit(project_root: Path) -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            text=True,
+            capture_output=True,
+            check=False,
+            cwd=str(project_root),
+        )
+    except OSError:
+        return None
+    if completed.returncode != 0:
+        return None
+    return completed.stdout.strip() or None
+
+
+def module_metrics(module: ModuleResult) -> dict[str, float]:
+    """Every queryable number of one result, keyed by metric name."""
+    metrics: dict[str, float | None] = {
+        "import_time_ms": module.import_time_ms,
+        "memory_mb": module.memory_mb,
+        "rss_delta_mb": module.rss_delta_mb,
+        "memory_retained_mb": module.memory_retained_mb,
+        "import_time_cold_ms": module.import_time_cold_ms,
+        "import_time_warm_ms": module.import_time_warm_ms,
+        "import_time_zip_ms": module.import_time_zip_ms,
+    }
+    for prefix, stats in (("time", module.time_stats), ("memory", module.memory_stats)):
+        for statistic in STATISTIC_METRICS if stats is not None else ():
+            metrics[f"{prefix}_{statistic}"] = getattr(stats, statistic)
+    return {metric: float(value) for metric, value in metrics.items() if value is not None}
+
+
+def _metric_for(sort_by: str, statistic: str | None) -> str:
+    if statistic is None:
+        return SORT_METRICS[sort_by]
+    return f"{'time' if sort_by == 'time' else 'memory'}_{statistic}"
+
+
+class HistoryStore:
+    """Scan runs kept in ``.coldpy/history.sqlite``, with per-metric indexes for ranking and trends."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._connection: sqlite3.Connection | None = None
+
+    @classmethod
+    def open(cls, base_dir: Path | None = None, create: bool = True) -> "HistoryStore":
+        path = history_path(base_dir)
+        if not create and not path.exists():
+            raise HistoryError("No scan history found. Run `coldpy scan <path>` first.")
+        store = cls(path)
+        store.connect()
+        return store
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def connect(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA foreign_keys = ON")
+            connection.executescript(SCHEMA)
+        except sqlite3.DatabaseError as exc:
+            raise HistoryError(f"History database is unreadable: {self.path}") from exc
+        connection.create_aggregate("median", 1, _Median)
+        self._connection = connection
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        if self._connection is None:
+            raise HistoryError("History store is closed.")
+        return self._connection
+
+    def record_run(self, payload: ScanPayload, git_commit: str | None = None, python: str | None = None) -> int:
+        header = {key: value for key, value in payload.to_dict().items() if key != "modules"}
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO runs (generated_at, project_root, git_commit, python, total_modules, failed_modules, payload)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    payload.generated_at,
+                    payload.project_root,
+                    git_commit,
+                    python,
+                    payload.summary.total_modules,
+                    payload.summary.failed_modules,
+                    json.dumps(header),
+                ),
+            )
+            run_id = int(cursor.lastrowid)
+            self.connection.executemany(
+                "INSERT INTO modules (run_id, name, status, result) VALUES (?, ?, ?, ?)",
+                ((run_id, module.name, module.status, json.dumps(module.to_dict())) for module in payload.modules),
+            )
+            self.connection.executemany(
+                "INSERT INTO metrics (run_id, module, metric, value) VALUES (?, ?, ?, ?)",
+                (
+                    (run_id, module.name, metric, value)
+                    for module in payload.modules
+                    for metric, value in module_metrics(module).items()
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO import_nodes (run_id, module, name, self_ms, cumulative_ms) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (run_id, module.name, node.name, node.self_ms, node.cumulative_ms)
+                    for module in payload.modules
+                    for node in walk(module.import_tree or [])
+                ),
+            )
+        return run_id
+
+    def runs(
+        self, project_root: Path | None = None, limit: int | None = None, python: str | None = None
+    ) -> list[RunInfo]:
+        query = (
+            "SELECT id, generated_at, project_root, git_commit, python, total_modules, failed_modules FROM runs"
+        )
+        conditions: list[str] = []
+        params: list[Any] = []
+        if project_root is not None:
+            conditions.append("project_root = ?")
+            params.append(str(project_root))
+        if python is not None:
+            conditions.append("python = ?")
+            params.append(python)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id DESC"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(limit)
+        return [RunInfo(*row) for row in self.connection.execute(query, params)]
+
+    def latest_run_id(self, project_root: Path | None = None, python: str | None = None) -> int:
+        runs = self.runs(project_root=project_root, limit=1, python=python)
+        if not runs:
+            raise HistoryError("No scan history found. Run `coldpy scan <path>` first.")
+        return runs[0].id
+
+    def resolve_run(self, ref: str) -> int:
+        """A run id, a git commit (or unique prefix of one), or ``latest``."""
+        if ref == "latest":
+            return self.latest_run_id()
+        if ref.isdigit():
+            row = self.connection.execute("SELECT id FROM runs WHERE id = ?", (int(ref),)).fetchone()
+            if row is not None:
+                return int(row[0])
+        rows = self.connection.execute(
+            "SELECT id FROM runs WHERE git_commit LIKE ? ORDER BY id DESC LIMIT 1", (f"{ref}%",)
+        ).fetchall()
+        if not rows:
+            raise HistoryError(f"No scan run matches: {ref}")
+        return int(rows[0][0])
+
+    def load_payload(self, run_id: int) -> ScanPayload:
+        row = self.connection.execute("SELECT payload FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise HistoryError(f"No scan run with id {run_id}")
+        header = json.loads(row[0])
+        if schema_is_newer(header["schema_version"]):
+            raise HistoryError(f"Scan run {run_id} was recorded by a newer ColdPy (schema {header['schema_version']})")
+        modules = [
+            ModuleResult.from_dict(json.loads(result))
+            for (result,) in self.connection.execute(
+                "SELECT result FROM modules WHERE run_id = ? ORDER BY rowid", (run_id,)
+            )
+        ]
+        return ScanPayload(
+            schema_version=header["schema_version"],
+            generated_at=header["generated_at"],
+            project_root=header["project_root"],
+            settings=ScanSettings(**header["settings"]),
+            summary=ScanSummary(**header["summary"]),
+            modules=modules,
+            stats=ScanStats(**header["stats"]) if header.get("stats") else None,
+            baseline=ScanBaseline(**header["baseline"]) if header.get("baseline") else None,
+            distributions=(
+                [DistributionCost(**cost) for cost in header["distributions"]]
+                if header.get("distributions") is not None
+                else None
+            ),
+            host=HostInfo(**header["host"]) if header.get("host") else None,
+        )
+
+    def top_modules(
+        self,
+        run_id: int,
+        sort_by: str = "time",
+        statistic: str | None = None,
+        threshold_ms: float = 0.0,
+        threshold_mb: float = 0.0,
+        limit: int = 10,
+    ) -> list[ModuleResult]:
+        """Heaviest successful modules of one run; ``statistic`` re-ranks by another sample statistic."""
+        time_metric = _metric_for("time", statistic)
+        memory_metric = _metric_for("memory", statistic)
+        sort_column = "time_metric.value" if sort_by == "time" else "memory_metric.value"
+        rows = self.connection.execute(
+            f"""
+            SELECT modules.result, time_metric.value, memory_metric.value
+            FROM modules
+            LEFT JOIN metrics AS time_metric
+                ON time_metric.run_id = modules.run_id AND time_metric.module = modules.name
+                AND time_metric.metric = :time_metric
+            LEFT JOIN metrics AS memory_metric
+                ON memory_metric.run_id = modules.run_id AND memory_metric.module = modules.name
+                AND memory_metric.metric = :memory_metric
+            WHERE modules.run_id = :run_id AND modules.status = 'ok'
+                AND (COALESCE(time_metric.value, 0) >= :threshold_ms OR COALESCE(memory_metric.value, 0) >= :threshold_mb)
+            ORDER BY COALESCE({sort_column}, -1) DESC
+            LIMIT :limit
+            """,
+            {
+                "run_id": run_id,
+                "time_metric": time_metric,
+                "memory_metric": memory_metric,
+                "threshold_ms": threshold_ms,
+                "threshold_mb": threshold_mb,
+                "limit": limit,
+            },
+        ).fetchall()
+        return [
+            replace(ModuleResult.from_dict(json.loads(result)), import_time_ms=time_value, memory_mb=memory_value)
+            for result, time_value, memory_value in rows
+        ]
+
+    def has_import_trees(self, run_id: int) -> bool:
+        row = self.connection.execute("SELECT 1 FROM import_nodes WHERE run_id = ? LIMIT 1", (run_id,)).fetchone()
+        return row is not None
+
+    def top_import_costs(self, run_id: int, min_self_ms: float = 0.0, limit: int = 10) -> list[ImportCost]:
+        """Same ranking as ``aggregate_import_costs``: median self/cumulative time per imported module."""
+        rows = self.connection.execute(
+            """
+            SELECT name, median(self_ms) AS self_ms, median(cumulative_ms), COUNT(*)
+            FROM import_nodes
+            WHERE run_id = ?
+            GROUP BY name
+            HAVING self_ms >= ?
+            ORDER BY self_ms DESC
+            LIMIT ?
+            """,
+            (run_id, min_self_ms, limit),
+        ).fetchall()
+        return [
+            ImportCost(name=name, self_ms=round(self_ms, 3), cumulative_ms=round(cumulative_ms, 3), imported_by=count)
+            for name, self_ms, cumulative_ms, count in rows
+        ]
+
+    def cumulative_import_costs(self, run_id: int) -> dict[str, float]:
+        """Median cumulative import time of every module that shows up in the run's import trees."""
+        rows = self.connection.execute(
+            "SELECT name, median(cumulative_ms) FROM import_nodes WHERE run_id = ? GROUP BY name", (run_id,)
+        )
+        return {name: round(value, 3) for name, value in rows}
+
+    def metric_values(self, run_id: int, metric: str) -> dict[str, float]:
+        rows = self.connection.execute(
+            "SELECT module, value FROM metrics WHERE run_id = ? AND metric = ?", (run_id, metric)
+        )
+        return {module: value for module, value in rows}
+
+    def module_history(
+        self, module: str, metric: str = "import_time_ms", project_root: Path | None = None, limit: int = 20
+    ) -> list[MetricPoint]:
+        """One metric of one module across runs, newest first."""
+        query = """
+            SELECT runs.id, runs.generated_at, runs.project_root, runs.git_commit, runs.python,
+                runs.total_modules, runs.failed_modules, metrics.value
+            FROM metrics JOIN runs ON runs.id = metrics.run_id
+            WHERE metrics.module = ? AND metrics.metric = ?
+        """
+        params: list[Any] = [module, metric]
+        if project_root is not None:
+            query += " AND runs.project_root = ?"
+            params.append(str(project_root))
+        query += " ORDER BY metrics.run_id DESC LIMIT ?"
+        params.append(limit)
+        return [
+            MetricPoint(run=RunInfo(*row[:7]), value=row[7]) for row in self.connection.execute(query, params)
+        ]
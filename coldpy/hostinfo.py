@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import os
+import platform
+import statistics
+from pathlib import Path
+from typing import Iterable
+
+from coldpy.models import HostInfo, ModuleResult
+
+CPUFREQ_DIR = Path("/sys/devices/system/cpu/cpu{cpu}/cpufreq")
+CPUINFO_FILE = Path("/proc/cpuinfo")
+BOOST_FILES = (
+    (Path("/sys/devices/system/cpu/intel_pstate/no_turbo"), "0"),
+    (Path("/sys/devices/system/cpu/cpufreq/boost"), "1"),
+)
+NOISY_LOAD_PER_CPU = 0.5
+NOISY_STDEV_PCT = 10.0
+STABLE_GOVERNOR = "performance"
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+
+
+def _khz_to_mhz(value: str | None) -> float | None:
+    return round(int(value) / 1000, 1) if value is not None and value.isdigit() else None
+
+
+def load_average() -> list[float] | None:
+    try:
+        return [round(value, 2) for value in os.getloadavg()]
+    except (AttributeError, OSError):
+        return None
+
+
+def _cpuinfo_mhz(cpu: int) -> float | None:
+    text = _read(CPUINFO_FILE)
+    if text is None:
+        return None
+    speeds = [line.partition(":")[2].strip() for line in text.splitlines() if line.startswith("cpu MHz")]
+    try:
+        return round(float(speeds[cpu if cpu < len(speeds) else 0]), 1)
+    except (IndexError, ValueError):
+        return None
+
+
+def collect_host_info(cpu: int | None = None) -> HostInfo:
+    """Load and CPU frequency scaling state, from ``/proc`` and ``/sys`` where they exist."""
+    probed = cpu if cpu is not None else 0
+    cpufreq = Path(str(CPUFREQ_DIR).format(cpu=probed))
+    boost = None
+    for path, enabled in BOOST_FILES:
+        value = _read(path)
+        if value is not None:
+            boost = value == enabled
+            break
+    return HostInfo(
+        platform=platform.platform(),
+        cpu_count=os.cpu_count() or 1,
+        cpu=cpu,
+        load_before=load_average(),
+        cpu_freq_mhz=_khz_to_mhz(_read(cpufreq / "scaling_cur_freq")) or _cpuinfo_mhz(probed),
+        cpu_max_freq_mhz=_khz_to_mhz(_read(cpufreq / "cpuinfo_max_freq")),
+        governor=_read(cpufreq / "scaling_governor"),
+        boost=boost,
+    )
+
+
+def noise_warnings(host: HostInfo, modules: Iterable[ModuleResult]) -> list[str]:
+    """Reasons not to trust the timings of this scan, or to compare them with other machines."""
+    warnings: list[str] = []
+    # The load after the scan includes the scan's own imports, so only the load before it counts.
+    load = host.load_before
+    if load is not None and load[0] / host.cpu_count > NOISY_LOAD_PER_CPU:
+        warnings.append(
+            f"Load average before the scan was {load[0]:.2f} on {host.cpu_count} CPUs; "
+            "other processes compete with the imports."
+        )
+    if host.governor is not None and host.governor != STABLE_GOVERNOR:
+        warnings.append(f"CPU frequency governor is {host.governor!r}, not {STABLE_GOVERNOR!r}; clock speed varies.")
+    if host.boost:
+        warnings.append("CPU turbo boost is on; clock speed depends on temperature and load.")
+
+    spreads = [
+        module.time_stats.stdev / module.time_stats.median * 100
+        for module in modules
+        if module.time_stats is not None and len(module.time_stats.samples) >= 3 and module.time_stats.median > 0
+    ]
+    if spreads and statistics.median(spreads) > NOISY_STDEV_PCT:
+        warnings.append(
+            f"Repeated imports vary by {statistics.median(spreads):.0f}% (median stdev/median); "
+            "results are noisy, consider more --repeat or a quieter machine."
+        )
+    return warnings
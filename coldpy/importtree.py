@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import statistics
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator
+
+from coldpy.models import ImportNode, ModuleResult
+
+
+@dataclass
+class ImportCost:
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    imported_by: int
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "self_ms": self.self_ms,
+            "cumulative_ms": self.cumulative_ms,
+            "imported_by": self.imported_by,
+        }
+
+
+def build_tree(raw_nodes: list[dict[str, Any]]) -> list[ImportNode]:
+    return [ImportNode.from_dict(node) for node in raw_nodes]
+
+
+def walk(nodes: Iterable[ImportNode]) -> Iterator[ImportNode]:
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(node.children)
+
+
+def find_node(nodes: Iterable[ImportNode], name: str) -> ImportNode | None:
+    return next((node for node in walk(nodes) if node.name == name), None)
+
+
+def aggregate_import_costs(modules: Iterable[ModuleResult]) -> list[ImportCost]:
+    """Merge the import trees of all scanned modules into one cost per imported module.
+
+    Every scanned module is imported in a fresh interpreter, so the same dependency shows up
+    once per scanned module that pulls it in; its costs are the median over those occurrences.
+    """
+    self_samples: dict[str, list[float]] = {}
+    cumulative_samples: dict[str, list[float]] = {}
+    for module in modules:
+        if module.import_tree is None:
+            continue
+        for node in walk(module.import_tree):
+            self_samples.setdefault(node.name, []).append(node.self_ms)
+            cumulative_samples.setdefault(node.name, []).append(node.cumulative_ms)
+
+    return [
+        ImportCost(
+            name=name,
+            self_ms=round(statistics.median(samples), 3),
+            cumulative_ms=round(statistics.median(cumulative_samples[name]), 3),
+            imported_by=len(samples),
+        )
+        for name, samples in self_samples.items()
+    ]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from coldpy.discovery import ModuleTarget
+from coldpy.models import InterpreterScan, MatrixPayload, ModuleResult, ScanPayload
+from coldpy.scanner import available_cpus, iter_scan
+
+
+@dataclass
+class MatrixRow:
+    """One module across the matrix, values in the order of ``MatrixPayload.interpreters``."""
+
+    name: str
+    times_ms: list[float | None]
+    memory_mb: list[float | None]
+
+
+def interpreter_key(python: Path, payload: ScanPayload, taken: dict[str, InterpreterScan]) -> str:
+    """``3.12.1`` (or ``pypy 3.10.14``) from the scan's baseline; the path disambiguates repeats."""
+    baseline = payload.baseline
+    if baseline is None or baseline.python_version is None:
+        return str(python)
+    key = baseline.python_version
+    if baseline.implementation not in (None, "cpython"):
+        key = f"{baseline.implementation} {key}"
+    return key if key not in taken else f"{key} ({python})"
+
+
+def matrix_concurrency(interpreters: int, jobs: int, cpus: int, pinned: bool = False) -> tuple[int, int]:
+    """(scans at a time, jobs per scan) that keep the matrix within ``cpus`` worker processes.
+
+    ``pinned`` scans (``pin_cpus`` or ``stable``) all pin their workers to the first CPUs, so they
+    run one interpreter at a time.
+    """
+    if pinned:
+        return 1, jobs
+    scans = max(1, min(interpreters, cpus))
+    return scans, max(1, min(jobs, cpus // scans))
+
+
+def scan_matrix(
+    project_root: Path,
+    module_targets: list[ModuleTarget],
+    interpreters: list[tuple[Path, dict[str, str]]],
+    previous_results: dict[Path, dict[str, ModuleResult]] | None = None,
+    on_module: Callable[[Path, ModuleResult], None] | None = None,
+    **options: Any,
+) -> MatrixPayload:
+    """Run ``iter_scan`` once per (interpreter, environment), as many at the same time as the CPUs allow.
+
+    ``jobs`` is split between the concurrent scans (see ``matrix_concurrency``), so interpreters
+    are not compared under contention; pinned scans run one at a time. ``on_module`` is called from the scanning threads
+    as modules finish. An exception in one scan, or in the calling thread, stops the others
+    after their current module.
+    """
+    stop = threading.Event()
+    workers, options["jobs"] = matrix_concurrency(
+        len(interpreters),
+        options.get("jobs", 1),
+        len(available_cpus()),
+        pinned=options.get("pin_cpus", False) or options.get("stable", False),
+    )
+
+    def run(python: Path, scan_env: dict[str, str]) -> ScanPayload | None:
+        scan = iter_scan(
+            project_root,
+            module_targets,
+            python_executable=python,
+            scan_env=scan_env,
+            previous_results=(previous_results or {}).get(python),
+            **options,
+        )
+        while True:
+            if stop.is_set():
+                scan.close()
+                return None
+            try:
+                module = next(scan)
+            except StopIteration as finished:
+                return finished.value
+            if on_module is not None:
+                on_module(python, module)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="coldpy-matrix") as pool:
+        futures = [pool.submit(run, python, scan_env) for python, scan_env in interpreters]
+        try:
+            payloads = [future.result() for future in futures]
+        except BaseException:
+            stop.set()
+            raise
+
+    merged: dict[str, InterpreterScan] = {}
+    for (python, _), payload in zip(interpreters, payloads):
+        merged[interpreter_key(python, payload, merged)] = InterpreterScan(python=str(python), scan=payload)
+    return MatrixPayload(project_root=str(project_root), interpreters=merged)
+
+
+def matrix_rows(matrix: MatrixPayload) -> list[MatrixRow]:
+    """Every module of any scan, slowest first by its worst time across interpreters."""
+    scans = [entry.scan for entry in matrix.interpreters.values()]
+    by_scan = [{module.name: module for module in scan.modules} for scan in scans]
+    names = list(dict.fromkeys(module.name for scan in scans for module in scan.modules))
+    rows = [
+        MatrixRow(
+            name=name,
+            times_ms=[modules[name].import_time_ms if name in modules else None for modules in by_scan],
+            memory_mb=[modules[name].memory_mb if name in modules else None for modules in by_scan],
+        )
+        for name in names
+    ]
+    return sorted(
+        rows, key=lambda row: max((value for value in row.times_ms if value is not None), default=-1.0), reverse=True
+    )
+
+
+def comparable_totals(matrix: MatrixPayload) -> dict[str, float]:
+    """Total import time per interpreter over the modules that imported under all of them.
+
+    Marginal scans already add up to a startup cost, so their total is used as is.
+    """
+    scans = {key: entry.scan for key, entry in matrix.interpreters.items()}
+    marginal = {
+        key: scan.stats.total_import_time_ms
+        for key, scan in scans.items()
+        if scan.stats is not None and scan.stats.total_import_time_ms is not None
+    }
+    if scans and len(marginal) == len(scans):
+        return marginal
+    ok = [
+        {
+            module.name: module.import_time_ms
+            for module in scan.modules
+            if module.status == "ok" and module.import_time_ms is not None
+        }
+        for scan in scans.values()
+    ]
+    common = set.intersection(*(set(times) for times in ok)) if ok else set()
+    return {key: round(sum(times[name] for name in common), 3) for key, times in zip(scans, ok)}
@@ -4,10 +4,94 @@ from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from typing import Any
 
-SCHEMA_VERSION = "1.0"
+SCHEMA_VERSION = "2.0"
 HEAVY_IMPORT_NOTE = "Heavy import; consider lazy loading or reducing transitive dependencies."
 
 
+def schema_is_newer(version: str) -> bool:
+    """Whether a report written with schema ``version`` has fields this ColdPy cannot read."""
+    try:
+        return tuple(int(part) for part in version.split(".")) > tuple(
+            int(part) for part in SCHEMA_VERSION.split(".")
+        )
+    except ValueError:
+        return True
+
+
+@dataclass
+class SampleStats:
+    samples: list[float]
+    min: float
+    median: float
+    mean: float
+    p95: float
+    stdev: float
+    outliers: int = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ImportNode:
+    name: str
+    self_ms: float
+    cumulative_ms: float
+    children: list["ImportNode"] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "ImportNode":
+        data = dict(payload)
+        data["children"] = [cls.from_dict(child) for child in data.get("children", [])]
+        return cls(**data)
+
+
+@dataclass
+class AllocationSite:
+    """Memory still allocated after an import from one line, or one call stack (innermost first)."""
+
+    size_mb: float
+    count: int
+    frames: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ProfileHotspot:
+    function: str
+    calls: int
+    self_ms: float
+    cumulative_ms: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ModuleProfile:
+    """Files written by re-importing a slow module under cProfile and under the stack sampler."""
+
+    pstats: str | None = None
+    collapsed: str | None = None
+    speedscope: str | None = None
+    samples: int = 0
+    hotspots: list[ProfileHotspot] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "ModuleProfile":
+        data = dict(payload)
+        data["hotspots"] = [ProfileHotspot(**hotspot) for hotspot in data.get("hotspots") or []]
+        return cls(**data)
+
+
 @dataclass
 class ModuleResult:
     name: str
@@ -17,16 +101,67 @@ class ModuleResult:
     status: str
     error: str | None = None
     notes: list[str] = field(default_factory=list)
+    fingerprint: str | None = None
+    reused: bool = False
+    time_stats: SampleStats | None = None
+    memory_stats: SampleStats | None = None
+    import_tree: list[ImportNode] | None = None
+    rss_delta_mb: float | None = None
+    time_method: str | None = None
+    memory_method: str | None = None
+    import_time_cold_ms: float | None = None
+    import_time_warm_ms: float | None = None
+    import_time_zip_ms: float | None = None
+    memory_by_module: dict[str, float] | None = None
+    memory_retained_mb: float | None = None
+    allocation_sites: list[AllocationSite] | None = None
+    profile: ModuleProfile | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
 
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "ModuleResult":
+        data = dict(payload)
+        for key in ("time_stats", "memory_stats"):
+            if data.get(key) is not None:
+                data[key] = SampleStats(**data[key])
+        if data.get("import_tree") is not None:
+            data["import_tree"] = [ImportNode.from_dict(node) for node in data["import_tree"]]
+        if data.get("allocation_sites") is not None:
+            data["allocation_sites"] = [AllocationSite(**site) for site in data["allocation_sites"]]
+        if data.get("profile") is not None:
+            data["profile"] = ModuleProfile.from_dict(data["profile"])
+        return cls(**data)
+
 
 @dataclass
 class ScanSettings:
     threshold_ms: float
     threshold_mb: float
     exclusions: list[str]
+    jobs: int = 1
+    pin_cpus: bool = False
+    executor: str = "spawn"
+    repeat: int = 1
+    warmup: int = 0
+    statistic: str = "median"
+    import_tree: bool = False
+    mode: str = "isolated"
+    preload: list[str] = field(default_factory=list)
+    memory_method: str = "tracemalloc"
+    pyc_mode: str | None = None
+    timeout_s: float | None = None
+    max_memory_mb: float | None = None
+    max_cpu_s: int | None = None
+    alloc_sites: int = 0
+    alloc_frames: int = 1
+    profile_over_ms: float | None = None
+    zip_import: bool = False
+    zip_archive: str | None = None
+    stable: bool = False
+    disable_gc: bool = False
+    order_seed: int | None = None
 
     def to_dict(self) -> dict[str, Any]:
         return asdict(self)
@@ -42,12 +177,84 @@ class ScanSummary:
         return asdict(self)
 
 
+@dataclass
+class ScanStats:
+    wall_time_ms: float
+    reused_modules: int = 0
+    spawn_overhead_ms: float | None = None
+    fork_overhead_ms: float | None = None
+    estimated_savings_ms: float | None = None
+    preload_time_ms: float | None = None
+    preload_memory_mb: float | None = None
+    preload_errors: list[str] = field(default_factory=list)
+    total_import_time_ms: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class ScanBaseline:
+    """Cost of an interpreter that imports nothing, to put per-module numbers in context."""
+
+    startup_ms: float
+    rss_mb: float | None = None
+    maxrss_mb: float | None = None
+    python_version: str | None = None
+    implementation: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class DistributionCost:
+    """Import cost rolled up by owner: ``project``, ``stdlib``, an installed distribution or ``other``."""
+
+    name: str
+    kind: str
+    modules: int
+    self_ms: float
+    cumulative_ms: float
+    memory_mb: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class HostInfo:
+    """Host state that moves import timings, recorded with ``--stable`` scans.
+
+    ``load_before``/``load_after`` are the 1, 5 and 15 minute load averages around the scan;
+    frequencies are in MHz for the CPU the scan is pinned to (``cpu``).
+    """
+
+    platform: str
+    cpu_count: int
+    cpu: int | None = None
+    load_before: list[float] | None = None
+    load_after: list[float] | None = None
+    cpu_freq_mhz: float | None = None
+    cpu_max_freq_mhz: float | None = None
+    governor: str | None = None
+    boost: bool | None = None
+    warnings: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
 @dataclass
 class ScanPayload:
     project_root: str
     settings: ScanSettings
     summary: ScanSummary
     modules: list[ModuleResult]
+    stats: ScanStats | None = None
+    baseline: ScanBaseline | None = None
+    distributions: list[DistributionCost] | None = None
+    host: HostInfo | None = None
     generated_at: str = field(
         default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds")
     )
@@ -61,13 +268,23 @@ class ScanPayload:
             "settings": self.settings.to_dict(),
             "summary": self.summary.to_dict(),
             "modules": [module.to_dict() for module in self.modules],
+            "stats": self.stats.to_dict() if self.stats is not None else None,
+            "baseline": self.baseline.to_dict() if self.baseline is not None else None,
+            "distributions": (
+                [cost.to_dict() for cost in self.distributions] if self.distributions is not None else None
+            ),
+            "host": self.host.to_dict() if self.host is not None else None,
         }
 
     @classmethod
     def from_dict(cls, payload: dict[str, Any]) -> "ScanPayload":
         settings = ScanSettings(**payload["settings"])
         summary = ScanSummary(**payload["summary"])
-        modules = [ModuleResult(**module) for module in payload["modules"]]
+        modules = [ModuleResult.from_dict(module) for module in payload["modules"]]
+        stats = ScanStats(**payload["stats"]) if payload.get("stats") else None
+        baseline = ScanBaseline(**payload["baseline"]) if payload.get("baseline") else None
+        distributions = payload.get("distributions")
+        host = HostInfo(**payload["host"]) if payload.get("host") else None
         return cls(
             schema_version=payload.get("schema_version", SCHEMA_VERSION),
             generated_at=payload.get("generated_at", datetime.now(timezone.utc).isoformat()),
@@ -75,4 +292,51 @@ class ScanPayload:
             settings=settings,
             summary=summary,
             modules=modules,
+            stats=stats,
+            baseline=baseline,
+            distributions=(
+                [DistributionCost(**cost) for cost in distributions] if distributions is not None else None
+            ),
+            host=host,
+        )
+
+
+@dataclass
+class InterpreterScan:
+    python: str
+    scan: ScanPayload
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"python": self.python, "scan": self.scan.to_dict()}
+
+
+@dataclass
+class MatrixPayload:
+    """The same project scanned with several interpreters, keyed by interpreter version."""
+
+    project_root: str
+    interpreters: dict[str, InterpreterScan]
+    generated_at: str = field(
+        default_factory=lambda: datetime.now(timezone.utc).isoformat(timespec="seconds")
+    )
+    schema_version: str = SCHEMA_VERSION
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "schema_version": self.schema_version,
+            "generated_at": self.generated_at,
+            "project_root": self.project_root,
+            "interpreters": {key: entry.to_dict() for key, entry in self.interpreters.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> "MatrixPayload":
+        return cls(
+            schema_version=payload.get("schema_version", SCHEMA_VERSION),
+            generated_at=payload.get("generated_at", datetime.now(timezone.utc).isoformat()),
+            project_root=payload["project_root"],
+            interpreters={
+                key: InterpreterScan(python=entry["python"], scan=ScanPayload.from_dict(entry["scan"]))
+                for key, entry in payload["interpreters"].items()
+            },
         )
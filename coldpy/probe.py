@@ -0,0 +1,535 @@
+"""Import probe executed inside the target interpreter.
+
+The scanner sends this file's source to the target Python with ``-c``, so it must only
+depend on the standard library and must not import anything from ``coldpy``.
+"""
+
+from __future__ import annotations
+
+import _signal
+import gc
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+IMPORTTIME_PREFIX = "import time:"
+PROFILE_HOTSPOTS = 10
+# _signal is already loaded at startup; the signal module would pre-import enum for every target.
+LIMIT_SIGNALS = {getattr(_signal, name) for name in ("SIGXCPU", "SIGKILL") if hasattr(_signal, name)}
+
+
+def pin_cpu(cpu: int | None) -> None:
+    if cpu is not None and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {cpu})
+
+
+def apply_limits(options: dict[str, object]) -> None:
+    """Cap this process's address space and CPU time before anything is imported."""
+    if options.get("max_memory_mb") is None and options.get("max_cpu_s") is None:
+        return
+    try:
+        import resource
+    except ImportError:
+        return
+
+    max_memory_mb = options.get("max_memory_mb")
+    if max_memory_mb is not None and hasattr(resource, "RLIMIT_AS"):
+        limit = int(float(max_memory_mb) * 1024 * 1024)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    max_cpu_s = options.get("max_cpu_s")
+    if max_cpu_s is not None:
+        # SIGXCPU at the soft limit, SIGKILL one second later if the import ignores it.
+        seconds = int(max_cpu_s)
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+
+
+def parse_importtime(lines: list[str]) -> list[dict[str, object]]:
+    """Rebuild the nested import tree from ``-X importtime`` output.
+
+    CPython prints each import after its children, indented two spaces per nesting level,
+    so children are collected per depth until their parent line shows up.
+    """
+    pending: dict[int, list[dict[str, object]]] = {}
+    for line in lines:
+        if not line.startswith(IMPORTTIME_PREFIX):
+            continue
+        fields = line[len(IMPORTTIME_PREFIX) :].split("|", 2)
+        if len(fields) != 3:
+            continue
+        try:
+            self_us = int(fields[0])
+            cumulative_us = int(fields[1])
+        except ValueError:
+            continue
+
+        label = fields[2].rstrip("\n")[1:]
+        name = label.lstrip(" ")
+        depth = (len(label) - len(name)) // 2
+        node: dict[str, object] = {
+            "name": name,
+            "self_ms": self_us / 1000,
+            "cumulative_ms": cumulative_us / 1000,
+            "children": pending.pop(depth + 1, []),
+        }
+        pending.setdefault(depth, []).append(node)
+
+    return pending.get(0, [])
+
+
+def _import(module_name: str, options: dict[str, object]) -> list[dict[str, object]] | None:
+    if not options.get("import_tree"):
+        importlib.import_module(module_name)
+        return None
+
+    # Imported lazily so the probe itself does not pre-import tempfile's dependencies for every target.
+    import tempfile
+
+    sys.stderr.flush()
+    saved_stderr = os.dup(2)
+    with tempfile.TemporaryFile(mode="w+", encoding="utf-8") as capture:
+        os.dup2(capture.fileno(), 2)
+        try:
+            # -X importtime only reports imports that go through __import__, not importlib.import_module.
+            __import__(module_name)
+        finally:
+            sys.stderr.flush()
+            os.dup2(saved_stderr, 2)
+            os.close(saved_stderr)
+        capture.seek(0)
+        return parse_importtime(capture.readlines())
+
+
+def _rss_bytes() -> int | None:
+    """Current resident set size; only available where /proc exists."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _maxrss_bytes() -> int | None:
+    try:
+        import resource
+    except ImportError:
+        return None
+    value = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return value if sys.platform == "darwin" else value * 1024
+
+
+def _memory_snapshot(traced: bool) -> dict[str, int | None]:
+    return {
+        "traced": tracemalloc.get_traced_memory()[0] if traced else None,
+        "rss": _rss_bytes(),
+        "maxrss": _maxrss_bytes(),
+    }
+
+
+def _memory_deltas(before: dict[str, int | None], traced: bool) -> dict[str, object]:
+    after = _memory_snapshot(traced)
+    deltas: dict[str, object] = {}
+    if traced:
+        current, peak = tracemalloc.get_traced_memory()
+        deltas["traced_peak_mb"] = max(peak - (before["traced"] or 0), 0) / (1024 * 1024)
+        deltas["traced_retained_mb"] = (current - (before["traced"] or 0)) / (1024 * 1024)
+    for key in ("rss", "maxrss"):
+        if before[key] is not None and after[key] is not None:
+            deltas[f"{key}_delta_mb"] = (after[key] - before[key]) / (1024 * 1024)
+    return deltas
+
+
+def _module_files() -> dict[str, str]:
+    files: dict[str, str] = {}
+    for name, module in list(sys.modules.items()):
+        filename = getattr(module, "__file__", None)
+        if isinstance(filename, str):
+            files[filename] = name
+    return files
+
+
+def _memory_by_module(snapshot: tracemalloc.Snapshot) -> dict[str, float]:
+    """Traced memory still held after the import, grouped by the module whose code allocated it."""
+    files = _module_files()
+    by_module: dict[str, float] = {}
+    for stat in snapshot.statistics("filename"):
+        filename = stat.traceback[0].filename
+        if filename.startswith("<frozen ") and filename.endswith(">"):
+            name = filename[len("<frozen ") : -1]
+        else:
+            name = files.get(filename, "<unknown>")
+        by_module[name] = by_module.get(name, 0.0) + stat.size / (1024 * 1024)
+    return by_module
+
+
+def distributions() -> dict[str, object]:
+    """Map packages and top-level modules to the installed distribution whose RECORD lists them."""
+    import importlib.machinery
+    from importlib import metadata
+
+    suffixes = sorted(importlib.machinery.all_suffixes(), key=len, reverse=True)
+    owners: dict[str, str] = {}
+    for dist in metadata.distributions():
+        dist_name = dist.metadata["Name"]
+        if not dist_name:
+            continue
+        for record in dist.files or []:
+            parts = record.parts
+            if not parts or parts[0] == ".." or parts[0].endswith((".dist-info", ".egg-info", ".data")):
+                continue
+            suffix = next((suffix for suffix in suffixes if parts[-1].endswith(suffix)), None)
+            if suffix is None:
+                continue
+            stem = parts[-1][: -len(suffix)]
+            if stem == "__init__":
+                module_parts = parts[:-1]
+            elif len(parts) == 1:
+                module_parts = (stem,)
+            else:
+                continue
+            if module_parts:
+                owners.setdefault(".".join(module_parts), dist_name)
+    return {"status": "ok", "owners": owners, "stdlib": sorted(getattr(sys, "stdlib_module_names", ()))}
+
+
+def _allocation_sites(snapshot: tracemalloc.Snapshot, limit: int, frames: int) -> list[dict[str, object]]:
+    """The largest allocations still alive, grouped by line (or by call stack with ``frames`` > 1)."""
+    sites: list[dict[str, object]] = []
+    for stat in snapshot.statistics("traceback" if frames > 1 else "lineno")[:limit]:
+        sites.append(
+            {
+                "size_mb": stat.size / (1024 * 1024),
+                "count": stat.count,
+                # Innermost frame first.
+                "frames": [f"{frame.filename}:{frame.lineno}" for frame in reversed(list(stat.traceback))],
+            }
+        )
+    return sites
+
+
+def _start_tracing(traced: bool, frames: int = 1) -> None:
+    if not traced:
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(frames)
+    tracemalloc.reset_peak()
+
+
+def _error(exc: BaseException, options: dict[str, object] | None = None) -> dict[str, object]:
+    limited = isinstance(exc, MemoryError) and (options or {}).get("max_memory_mb") is not None
+    return {
+        "status": "limit" if limited else "error",
+        "error_type": type(exc).__name__,
+        "error_message": str(exc),
+    }
+
+
+def _add_snapshot_details(output: dict[str, object], options: dict[str, object], frames: int) -> None:
+    # Allocation sites are only worth a snapshot for imports over the memory threshold.
+    alloc_sites = int(options.get("alloc_sites") or 0)
+    heavy = alloc_sites > 0 and float(output.get("traced_peak_mb") or 0.0) > float(options.get("threshold_mb") or 0.0)
+    if not heavy and not options.get("memory_by_module"):
+        return
+    snapshot = tracemalloc.take_snapshot()
+    if options.get("memory_by_module"):
+        output["memory_by_module"] = _memory_by_module(snapshot)
+    if heavy:
+        output["allocation_sites"] = _allocation_sites(snapshot, alloc_sites, frames)
+
+
+def _drop_working_directory() -> None:
+    # ``-c`` puts the working directory (the loose project) first; zip imports must not fall back to it.
+    cwd = os.getcwd()
+    sys.path[:] = [entry for entry in sys.path if entry not in ("", ".", cwd)]
+
+
+def _pause_gc(options: dict[str, object]) -> None:
+    # Collect first, so every sample starts from the same heap and no collection lands in the timing.
+    if options.get("disable_gc"):
+        gc.collect()
+        gc.disable()
+
+
+def measure(module_name: str, options: dict[str, object] | None = None) -> dict[str, object]:
+    """Import one module. tracemalloc is only switched on when ``options["memory"]`` asks for it,
+    because it slows allocation-heavy imports several times over."""
+    options = options or {}
+    if options.get("zip_import"):
+        _drop_working_directory()
+    traced = options.get("memory") == "tracemalloc"
+    frames = int(options.get("alloc_frames") or 1)
+    _start_tracing(traced, frames)
+    _pause_gc(options)
+    before = _memory_snapshot(traced)
+    start = time.perf_counter()
+
+    try:
+        import_tree = _import(module_name, options)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        output: dict[str, object] = {"status": "ok", "import_time_ms": elapsed_ms}
+        output.update(_memory_deltas(before, traced))
+        if import_tree is not None:
+            output["import_tree"] = import_tree
+        if traced:
+            _add_snapshot_details(output, options, frames)
+    except Exception as exc:
+        output = _error(exc, options)
+    finally:
+        if traced:
+            tracemalloc.stop()
+
+    return output
+
+
+def measure_marginal(module_names: list[str], preload: list[str], options: dict[str, object]) -> dict[str, object]:
+    """Import every module in order inside this one interpreter, charging each only for what it adds."""
+    traced = options.get("memory") == "tracemalloc"
+    _start_tracing(traced)
+    _pause_gc(options)
+    before = _memory_snapshot(traced)
+    start = time.perf_counter()
+    preload_errors: list[str] = []
+    for name in preload:
+        try:
+            importlib.import_module(name)
+        except Exception as exc:
+            preload_errors.append(f"{name}: {type(exc).__name__}: {exc}")
+    preload_ms = (time.perf_counter() - start) * 1000
+    preload_memory = _memory_deltas(before, traced)
+
+    results: list[dict[str, object]] = []
+    for name in module_names:
+        already_loaded = name in sys.modules
+        before = _memory_snapshot(traced)
+        start = time.perf_counter()
+        try:
+            import_tree = _import(name, options)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            result: dict[str, object] = {
+                "status": "ok",
+                "import_time_ms": elapsed_ms,
+                "already_loaded": already_loaded,
+            }
+            result.update(_memory_deltas(before, traced))
+            if import_tree is not None:
+                result["import_tree"] = import_tree
+        except (Exception, SystemExit) as exc:
+            result = _error(exc, options)
+        results.append(result)
+
+    if traced:
+        tracemalloc.stop()
+    return {
+        "status": "ok",
+        "preload_ms": preload_ms,
+        "preload_memory": preload_memory,
+        "preload_errors": preload_errors,
+        "modules": results,
+    }
+
+
+def baseline() -> dict[str, object]:
+    """Version and memory of an interpreter that has loaded nothing but this probe."""
+    output: dict[str, object] = {
+        "status": "ok",
+        "python_version": "{}.{}.{}".format(*sys.version_info[:3]),
+        "implementation": sys.implementation.name,
+    }
+    rss = _rss_bytes()
+    maxrss = _maxrss_bytes()
+    if rss is not None:
+        output["rss_mb"] = rss / (1024 * 1024)
+    if maxrss is not None:
+        output["maxrss_mb"] = maxrss / (1024 * 1024)
+    return output
+
+
+def _run_forked(module_name: str | None, options: dict[str, object]) -> dict[str, object]:
+    import select
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        # A process group of its own, so a timeout also kills anything the import spawned.
+        os.setpgid(0, 0)
+        devnull = os.open(os.devnull, os.O_RDWR)
+        os.dup2(devnull, 0)
+        os.dup2(devnull, 1)
+        try:
+            pin_cpu(options.get("cpu"))
+            apply_limits(options)
+            result = measure(module_name, options) if module_name else {"status": "ok"}
+        except BaseException as exc:
+            result = _error(exc, options)
+        with os.fdopen(write_fd, "w", encoding="utf-8") as writer:
+            writer.write(json.dumps(result))
+        os._exit(0)
+
+    os.close(write_fd)
+    try:
+        os.setpgid(pid, pid)
+    except OSError:
+        pass
+    ready, _, _ = select.select([read_fd], [], [], options.get("timeout_s"))
+    if not ready:
+        os.close(read_fd)
+        os.killpg(pid, _signal.SIGKILL)
+        os.waitpid(pid, 0)
+        return {
+            "status": "timeout",
+            "error_type": "TimeoutError",
+            "error_message": f"Import did not finish within {options['timeout_s']}s.",
+        }
+
+    with os.fdopen(read_fd, "r", encoding="utf-8") as reader:
+        data = reader.read()
+    _, status = os.waitpid(pid, 0)
+
+    if not data:
+        exit_code = os.waitstatus_to_exitcode(status)
+        return {
+            "status": "limit" if -exit_code in LIMIT_SIGNALS and options.get("max_cpu_s") is not None else "error",
+            "error_type": "SubprocessError",
+            "error_message": f"Child process exited with status {exit_code}.",
+        }
+    return json.loads(data)
+
+
+def _profiled_import(module_name: str) -> None:
+    # The sampler cuts every stack at this frame, dropping the probe's own callers.
+    importlib.import_module(module_name)
+
+
+def _function_label(key: tuple[str, int, str]) -> str:
+    filename, lineno, name = key
+    return name if filename == "~" else f"{name} ({filename}:{lineno})"
+
+
+def _profile_deterministic(module_name: str, output: str, options: dict[str, object]) -> dict[str, object]:
+    import cProfile
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    try:
+        profiler.runcall(_profiled_import, module_name)
+    except Exception as exc:
+        return _error(exc, options)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    profiler.dump_stats(output)
+    own = [(key, stat) for key, stat in profiler.stats.items() if key[0] != "<string>"]
+    own.sort(key=lambda item: item[1][2], reverse=True)
+    return {
+        "status": "ok",
+        "import_time_ms": elapsed_ms,
+        "hotspots": [
+            {
+                "function": _function_label(key),
+                "calls": stat[1],
+                "self_ms": stat[2] * 1000,
+                "cumulative_ms": stat[3] * 1000,
+            }
+            for key, stat in own[:PROFILE_HOTSPOTS]
+        ],
+    }
+
+
+def _sample_stacks(thread_id: int, interval_s: float, stop, done, stacks: dict[tuple, list[float]]) -> None:
+    """Record the main thread's stack every ``interval_s``, weighted by the time since the last sample."""
+    last = time.perf_counter()
+    while not stop.acquire(timeout=interval_s):
+        frame = sys._current_frames().get(thread_id)
+        now = time.perf_counter()
+        frames: list[tuple[str, str, int]] = []
+        while frame is not None and frame.f_code is not _profiled_import.__code__:
+            frames.append((frame.f_code.co_name, frame.f_code.co_filename, frame.f_code.co_firstlineno))
+            frame = frame.f_back
+        if frame is not None and frames:
+            entry = stacks.setdefault(tuple(reversed(frames)), [0, 0.0])
+            entry[0] += 1
+            entry[1] += (now - last) * 1000
+        last = now
+    done.release()
+
+
+def _profile_sampled(module_name: str, interval_s: float, options: dict[str, object]) -> dict[str, object]:
+    # _thread rather than threading, which would pre-import modules the target may need itself.
+    import _thread
+
+    stacks: dict[tuple, list[float]] = {}
+    stop = _thread.allocate_lock()
+    done = _thread.allocate_lock()
+    stop.acquire()
+    done.acquire()
+    sys.setswitchinterval(min(interval_s, sys.getswitchinterval()))
+    _thread.start_new_thread(_sample_stacks, (_thread.get_ident(), interval_s, stop, done, stacks))
+    start = time.perf_counter()
+    try:
+        _profiled_import(module_name)
+        output: dict[str, object] = {"status": "ok", "import_time_ms": (time.perf_counter() - start) * 1000}
+    except Exception as exc:
+        output = _error(exc, options)
+    finally:
+        stop.release()
+        done.acquire()
+    output["stacks"] = [[list(map(list, stack)), count, weight_ms] for stack, (count, weight_ms) in stacks.items()]
+    return output
+
+
+def profile(module_name: str, options: dict[str, object]) -> dict[str, object]:
+    """Import one module under cProfile, dumping pstats to ``options["output"]``, or under a stack
+    sampler that reports every distinct stack with its sample count and weight in ms."""
+    if options.get("profiler") == "cprofile":
+        return _profile_deterministic(module_name, str(options["output"]), options)
+    return _profile_sampled(module_name, float(options.get("interval_ms") or 1.0) / 1000, options)
+
+
+def serve(project_root: str) -> None:
+    sys.path.insert(0, project_root)
+    while True:
+        line = sys.stdin.readline()
+        if not line:
+            return
+        request = json.loads(line)
+        result = _run_forked(request.get("module"), request.get("options") or {})
+        sys.stdout.write(json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+def main(argv: list[str]) -> None:
+    if argv[0] == "--serve":
+        serve(argv[1])
+        return
+    if argv[0] == "--noop":
+        print(json.dumps(baseline()))
+        return
+    if argv[0] == "--distributions":
+        print(json.dumps(distributions()))
+        return
+    if argv[0] == "--profile":
+        options = json.loads(argv[3])
+        pin_cpu(options.get("cpu"))
+        apply_limits(options)
+        sys.path.insert(0, argv[2])
+        print(json.dumps(profile(argv[1], options)))
+        return
+    if argv[0] == "--marginal":
+        options = json.loads(argv[2])
+        pin_cpu(options.get("cpu"))
+        apply_limits(options)
+        sys.path.insert(0, argv[1])
+        print(json.dumps(measure_marginal(options["modules"], options.get("preload", []), options)))
+        return
+
+    module_name, project_root = argv[0], argv[1]
+    options = json.loads(argv[2]) if len(argv) > 2 else {}
+    pin_cpu(options.get("cpu"))
+    apply_limits(options)
+    sys.path.insert(0, project_root)
+    print(json.dumps(measure(module_name, options)))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+from coldpy import __version__
+from coldpy.cache import CACHE_DIR_NAME
+
+PROFILES_DIR_NAME = "profiles"
+DEFAULT_SAMPLE_INTERVAL_MS = 1.0
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+# One sampled stack as the probe reports it: frames (name, file, line) from the outermost in,
+# the number of samples that saw it, and the wall time those samples stand for.
+Stack = tuple[list[tuple[str, str, int]], int, float]
+
+
+def profiles_path(base_dir: Path | None = None) -> Path:
+    base = base_dir or Path.cwd()
+    return base / CACHE_DIR_NAME / PROFILES_DIR_NAME
+
+
+def parse_stacks(raw: list[Any]) -> list[Stack]:
+    return [
+        ([(str(name), str(file), int(line)) for name, file, line in frames], int(count), float(weight_ms))
+        for frames, count, weight_ms in raw
+    ]
+
+
+def _frame_label(name: str, file: str, line: int) -> str:
+    # ``;`` separates frames in the collapsed format.
+    return f"{name} ({file}:{line})".replace(";", ",")
+
+
+def collapsed_stacks(stacks: list[Stack]) -> str:
+    """Brendan Gregg's folded format (``outer;inner count``), read by flamegraph.pl and speedscope."""
+    lines = [
+        f"{';'.join(_frame_label(*frame) for frame in frames)} {count}"
+        for frames, count, _ in sorted(stacks, key=lambda stack: stack[0])
+    ]
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+def speedscope_document(name: str, stacks: list[Stack]) -> dict[str, Any]:
+    """A speedscope ``sampled`` profile, each distinct stack weighted by its wall time in ms."""
+    frames: list[dict[str, Any]] = []
+    index: dict[tuple[str, str, int], int] = {}
+    samples: list[list[int]] = []
+    weights: list[float] = []
+    for stack_frames, _, weight_ms in stacks:
+        sample: list[int] = []
+        for frame in stack_frames:
+            if frame not in index:
+                index[frame] = len(frames)
+                frames.append({"name": frame[0], "file": frame[1], "line": frame[2]})
+            sample.append(index[frame])
+        samples.append(sample)
+        weights.append(round(weight_ms, 3))
+    return {
+        "$schema": SPEEDSCOPE_SCHEMA,
+        "name": name,
+        "exporter": f"coldpy {__version__}",
+        "shared": {"frames": frames},
+        "profiles": [
+            {
+                "type": "sampled",
+                "name": name,
+                "unit": "milliseconds",
+                "startValue": 0,
+                "endValue": round(sum(weights), 3),
+                "samples": samples,
+                "weights": weights,
+            }
+        ],
+    }
+
+
+def write_sampled_profile(output_dir: Path, module_name: str, stacks: list[Stack]) -> tuple[Path, Path]:
+    """Write ``<module>.collapsed`` and ``<module>.speedscope.json`` into ``output_dir``."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    collapsed = output_dir / f"{module_name}.collapsed"
+    speedscope = output_dir / f"{module_name}.speedscope.json"
+    collapsed.write_text(collapsed_stacks(stacks), encoding="utf-8")
+    speedscope.write_text(json.dumps(speedscope_document(module_name, stacks)), encoding="utf-8")
+    return collapsed, speedscope
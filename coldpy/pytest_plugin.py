@@ -0,0 +1,211 @@
+"""pytest plugin: the ``import_cost`` fixture and the ``import_budget`` marker.
+
+Registered through the ``pytest11`` entry point, so it is active wherever ColdPy is installed::
+
+    @pytest.mark.import_budget("service.api", ms=150, mb=40)
+    def test_api_starts_fast():
+        pass
+
+    def test_models_are_cheap(import_cost):
+        assert import_cost("service.models").time_ms < 50
+
+Every module is imported in fresh interpreters by the same probe ``coldpy scan`` uses, once per
+session, with the same interpreter detection and project ``.env`` loading. Modules named by
+markers are measured in the background, in parallel, as soon as the tests are collected.
+"""
+
+from __future__ import annotations
+
+import statistics
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+import pytest
+
+from coldpy.runtime import build_scan_environment, load_project_env, resolve_python_executable
+from coldpy.scanner import MEMORY_NONE, MEMORY_TRACEMALLOC, available_cpus, measure_import
+
+DEFAULT_REPEAT = 3
+MARKER = "import_budget"
+
+
+@dataclass
+class ImportCost:
+    """Median import time over the session's samples and the traced memory peak of one import."""
+
+    name: str
+    time_ms: float | None
+    memory_mb: float | None
+    status: str = "ok"
+    error: str | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+class ImportCostMeter:
+    """Measures modules on a thread pool, each at most once; safe to call from any thread."""
+
+    def __init__(
+        self,
+        project_root: Path,
+        python_executable: Path | None = None,
+        scan_env: dict[str, str] | None = None,
+        repeat: int = DEFAULT_REPEAT,
+        jobs: int = 1,
+    ) -> None:
+        self.project_root = project_root
+        self.python_executable = python_executable
+        self.scan_env = scan_env if scan_env is not None else build_scan_environment()
+        self.repeat = repeat
+        self._executor = ThreadPoolExecutor(max_workers=jobs, thread_name_prefix="coldpy")
+        self._futures: dict[str, Future[ImportCost]] = {}
+        self._lock = threading.Lock()
+
+    def _measure(self, name: str) -> ImportCost:
+        times: list[float] = []
+        memory_mb: float | None = None
+        for run in range(self.repeat):
+            # tracemalloc runs in an import of its own, so only the first sample pays for it.
+            sample = measure_import(
+                name,
+                self.project_root,
+                python_executable=self.python_executable,
+                scan_env=self.scan_env,
+                memory_method=MEMORY_TRACEMALLOC if run == 0 else MEMORY_NONE,
+            )
+            if sample.get("status") != "ok":
+                return ImportCost(
+                    name=name,
+                    time_ms=None,
+                    memory_mb=None,
+                    status=str(sample.get("status", "error")),
+                    error=f"{sample.get('error_type', 'ImportError')}: {sample.get('error_message', '')}",
+                )
+            times.append(float(sample["import_time_ms"]))
+            if sample.get("memory_mb") is not None:
+                memory_mb = float(sample["memory_mb"])
+        return ImportCost(
+            name=name,
+            time_ms=round(statistics.median(times), 3),
+            memory_mb=round(memory_mb, 3) if memory_mb is not None else None,
+        )
+
+    def submit(self, names: Iterable[str]) -> None:
+        with self._lock:
+            for name in names:
+                if name not in self._futures:
+                    self._futures[name] = self._executor.submit(self._measure, name)
+
+    def measure(self, name: str) -> ImportCost:
+        self.submit([name])
+        return self._futures[name].result()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+METER_KEY = pytest.StashKey[ImportCostMeter]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("coldpy", "import cost budgets")
+    group.addoption(
+        "--coldpy-root",
+        type=Path,
+        default=None,
+        help="Directory put on sys.path for measured imports (default: the pytest rootdir).",
+    )
+    group.addoption("--coldpy-python", type=Path, default=None, help="Interpreter to measure imports with.")
+    group.addoption(
+        "--coldpy-repeat",
+        type=int,
+        default=DEFAULT_REPEAT,
+        help="Timed imports per module; the median is compared with budgets.",
+    )
+    group.addoption(
+        "--coldpy-jobs",
+        type=int,
+        default=None,
+        help="Modules measured at the same time (default: half the available CPUs, 1 in xdist workers).",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers",
+        f"{MARKER}(*modules, ms=None, mb=None): fail unless importing each module in a fresh "
+        "interpreter stays within ms milliseconds and mb MB of traced memory.",
+    )
+    repeat = config.getoption("coldpy_repeat")
+    jobs = config.getoption("coldpy_jobs")
+    if jobs is None:
+        # Measurements share the machine with the tests, and every xdist worker has its own pool.
+        jobs = 1 if hasattr(config, "workerinput") else max(1, len(available_cpus()) // 2)
+    if repeat < 1 or jobs < 1:
+        raise pytest.UsageError("--coldpy-repeat and --coldpy-jobs must be >= 1")
+    project_root = (config.getoption("coldpy_root") or config.rootpath).resolve()
+    try:
+        python_executable = resolve_python_executable(project_root, config.getoption("coldpy_python"))
+        extra_env, _ = load_project_env(project_root)
+    except ValueError as exc:
+        raise pytest.UsageError(str(exc)) from exc
+    config.stash[METER_KEY] = ImportCostMeter(
+        project_root,
+        python_executable=python_executable,
+        scan_env=build_scan_environment(extra_env),
+        repeat=repeat,
+        jobs=jobs,
+    )
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    meter = config.stash.get(METER_KEY, None)
+    if meter is not None:
+        meter.close()
+
+
+def _budget_modules(marker: pytest.Mark) -> list[str]:
+    if not marker.args:
+        raise pytest.UsageError(f"@pytest.mark.{MARKER} needs at least one module name")
+    return [str(name) for name in marker.args]
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    # pytest-xdist workers each collect the whole suite, so they only measure what they run.
+    if hasattr(config, "workerinput"):
+        return
+    names = [name for item in items for marker in item.iter_markers(name=MARKER) for name in _budget_modules(marker)]
+    config.stash[METER_KEY].submit(dict.fromkeys(names))
+
+
+def _violations(cost: ImportCost, ms: float | None, mb: float | None) -> list[str]:
+    if cost.status != "ok":
+        return [f"import {cost.name} failed ({cost.status}): {cost.error}"]
+    violations: list[str] = []
+    if ms is not None and cost.time_ms is not None and cost.time_ms > ms:
+        violations.append(f"import {cost.name} took {cost.time_ms:.3f} ms, budget {ms} ms")
+    if mb is not None and cost.memory_mb is not None and cost.memory_mb > mb:
+        violations.append(f"import {cost.name} allocated {cost.memory_mb:.3f} MB, budget {mb} MB")
+    return violations
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_runtest_call(item: pytest.Item) -> None:
+    meter = item.config.stash[METER_KEY]
+    violations: list[str] = []
+    for marker in item.iter_markers(name=MARKER):
+        ms, mb = marker.kwargs.get("ms"), marker.kwargs.get("mb")
+        for name in _budget_modules(marker):
+            violations.extend(_violations(meter.measure(name), ms, mb))
+    if violations:
+        pytest.fail("\n".join(violations), pytrace=False)
+
+
+@pytest.fixture
+def import_cost(request: pytest.FixtureRequest) -> Callable[[str], ImportCost]:
+    """``import_cost("pkg.mod")`` measures (or recalls) the cost of importing ``pkg.mod`` cold."""
+    return request.config.stash[METER_KEY].measure
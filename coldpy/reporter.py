@@ -7,7 +7,15 @@ from typing import Iterable
 from rich.console import Console
 from rich.table import Table
 
-from coldpy.models import ModuleResult, ScanPayload
+from coldpy.budgets import BudgetViolation
+from coldpy.diff import MetricDiff, ScanDiff
+from coldpy.history import MetricPoint, RunInfo
+from coldpy.importtree import ImportCost
+from coldpy.matrix import comparable_totals, matrix_rows
+from coldpy.models import DistributionCost, HostInfo, ImportNode, MatrixPayload, ModuleResult, ScanPayload
+from coldpy.startup import PHASES, StartupReport
+from coldpy.suggest import DeferrableImport
+from coldpy.whatif import WhatIfReport
 
 console = Console()
 
@@ -16,19 +24,50 @@ def _format_value(value: float | None) -> str:
     return "-" if value is None else f"{value:.3f}"
 
 
+def _has_repeats(module: ModuleResult) -> bool:
+    return module.time_stats is not None and len(module.time_stats.samples) > 1
+
+
+def _has_pyc_comparison(module: ModuleResult) -> bool:
+    return module.import_time_cold_ms is not None and module.import_time_warm_ms is not None
+
+
+def _has_zip_comparison(module: ModuleResult) -> bool:
+    return module.import_time_ms is not None and module.import_time_zip_ms is not None
+
+
 def render_modules_table(modules: Iterable[ModuleResult], title: str = "ColdPy Report") -> None:
+    modules = list(modules)
+    show_stdev = any(_has_repeats(module) for module in modules)
+    show_pyc = any(_has_pyc_comparison(module) for module in modules)
+    show_zip = any(_has_zip_comparison(module) for module in modules)
     table = Table(title=title)
     table.add_column("Module", justify="left")
     table.add_column("Import Time (ms)", justify="right")
     table.add_column("Memory (MB)", justify="right")
+    if show_stdev:
+        table.add_column("Stdev (ms)", justify="right")
+    if show_pyc:
+        table.add_column("Cold .pyc (ms)", justify="right")
+        table.add_column("Warm .pyc (ms)", justify="right")
+    if show_zip:
+        table.add_column("Zip (ms)", justify="right")
+        table.add_column("Zip Δ (ms)", justify="right")
     table.add_column("Status", justify="left")
     table.add_column("Notes", justify="left")
 
     for module in modules:
+        values = [_format_value(module.import_time_ms), _format_value(module.memory_mb)]
+        if show_stdev:
+            values.append(_format_value(module.time_stats.stdev if module.time_stats is not None else None))
+        if show_pyc:
+            values.extend([_format_value(module.import_time_cold_ms), _format_value(module.import_time_warm_ms)])
+        if show_zip:
+            delta = module.import_time_zip_ms - module.import_time_ms if _has_zip_comparison(module) else None
+            values.extend([_format_value(module.import_time_zip_ms), "-" if delta is None else f"{delta:+.3f}"])
         table.add_row(
             module.name,
-            _format_value(module.import_time_ms),
-            _format_value(module.memory_mb),
+            *values,
             module.status,
             "; ".join(module.notes) if module.notes else (module.error or ""),
         )
@@ -36,6 +75,325 @@ def render_modules_table(modules: Iterable[ModuleResult], title: str = "ColdPy R
     console.print(table)
 
 
+def _format_relative(value: float | None, reference: float | None) -> str:
+    if value is None or not reference:
+        return "-"
+    return f"{(value - reference) / reference * 100:+.1f}%"
+
+
+def render_matrix_table(matrix: MatrixPayload, title: str = "ColdPy Interpreter Matrix") -> None:
+    """Import time under every interpreter, with the change from the first one."""
+    keys = list(matrix.interpreters)
+    table = Table(title=title)
+    table.add_column("Module", justify="left")
+    for index, key in enumerate(keys):
+        table.add_column(f"{key} (ms)", justify="right")
+        if index:
+            table.add_column(f"Δ vs {keys[0]}", justify="right")
+
+    for row in matrix_rows(matrix):
+        values: list[str] = []
+        for index, time_ms in enumerate(row.times_ms):
+            values.append(_format_value(time_ms))
+            if index:
+                values.append(_format_relative(time_ms, row.times_ms[0]))
+        table.add_row(row.name, *values)
+
+    console.print(table)
+
+
+def print_matrix_summary(matrix: MatrixPayload) -> None:
+    keys = list(matrix.interpreters)
+    totals = comparable_totals(matrix)
+    for key, entry in matrix.interpreters.items():
+        summary = entry.scan.summary
+        baseline = entry.scan.baseline
+        startup = f", {baseline.startup_ms:.1f} ms empty startup" if baseline is not None else ""
+        change = f" ({_format_relative(totals[key], totals[keys[0]])})" if key != keys[0] else ""
+        console.print(
+            f"{key}: {totals[key]:.1f} ms imports{change}{startup}; "
+            f"scanned {summary.scanned_modules}/{summary.total_modules}, failed {summary.failed_modules} "
+            f"[dim]({entry.python})[/dim]"
+        )
+
+
+def render_import_costs_table(costs: Iterable[ImportCost], title: str = "ColdPy Report") -> None:
+    table = Table(title=title)
+    table.add_column("Module", justify="left")
+    table.add_column("Self (ms)", justify="right")
+    table.add_column("Cumulative (ms)", justify="right")
+    table.add_column("Imported By", justify="right")
+
+    for cost in costs:
+        table.add_row(
+            cost.name,
+            _format_value(cost.self_ms),
+            _format_value(cost.cumulative_ms),
+            str(cost.imported_by),
+        )
+
+    console.print(table)
+
+
+def render_distributions_table(costs: Iterable[DistributionCost], title: str = "ColdPy Report") -> None:
+    table = Table(title=title)
+    table.add_column("Distribution", justify="left")
+    table.add_column("Kind", justify="left")
+    table.add_column("Modules", justify="right")
+    table.add_column("Self (ms)", justify="right")
+    table.add_column("Cumulative (ms)", justify="right")
+    table.add_column("Memory (MB)", justify="right")
+
+    for cost in costs:
+        table.add_row(
+            cost.name,
+            cost.kind,
+            str(cost.modules),
+            _format_value(cost.self_ms),
+            _format_value(cost.cumulative_ms),
+            _format_value(cost.memory_mb),
+        )
+
+    console.print(table)
+
+
+def render_allocation_sites(modules: Iterable[ModuleResult]) -> None:
+    for module in modules:
+        if not module.allocation_sites:
+            continue
+        table = Table(
+            title=(
+                f"{module.name}: peak {_format_value(module.memory_mb)} MB, "
+                f"retained {_format_value(module.memory_retained_mb)} MB, "
+                f"RSS delta {_format_value(module.rss_delta_mb)} MB"
+            )
+        )
+        table.add_column("Size (MB)", justify="right")
+        table.add_column("Blocks", justify="right")
+        table.add_column("Allocated at", justify="left")
+        for site in module.allocation_sites:
+            table.add_row(_format_value(site.size_mb), str(site.count), "\n".join(site.frames))
+        console.print(table)
+
+
+def render_profiles(modules: Iterable[ModuleResult], hotspots: int = 3, title: str = "ColdPy Import Profiles") -> None:
+    profiles = [(module.name, module.profile) for module in modules if module.profile is not None]
+    if not profiles:
+        return
+    table = Table(title=title)
+    table.add_column("Module", justify="left")
+    table.add_column("Function", justify="left")
+    table.add_column("Calls", justify="right")
+    table.add_column("Self (ms)", justify="right")
+    table.add_column("Cumulative (ms)", justify="right")
+
+    for name, profile in profiles:
+        if not profile.hotspots:
+            table.add_row(name, "-", "-", "-", "-")
+        for position, hotspot in enumerate(profile.hotspots[:hotspots]):
+            table.add_row(
+                name if position == 0 else "",
+                hotspot.function,
+                str(hotspot.calls),
+                _format_value(hotspot.self_ms),
+                _format_value(hotspot.cumulative_ms),
+            )
+
+    console.print(table)
+    for name, profile in profiles:
+        files = [path for path in (profile.pstats, profile.collapsed, profile.speedscope) if path]
+        console.print(f"[dim]{name}: {', '.join(files)}[/dim]")
+
+
+def render_budget_violations(violations: Iterable[BudgetViolation], title: str = "ColdPy Budget Violations") -> None:
+    table = Table(title=title)
+    table.add_column("Module", justify="left")
+    table.add_column("Metric", justify="left")
+    table.add_column("Value", justify="right")
+    table.add_column("Budget", justify="right")
+    table.add_column("Rule", justify="left")
+
+    for violation in violations:
+        table.add_row(
+            violation.module,
+            violation.metric,
+            f"[red]{_format_value(violation.value)}[/red]",
+            _format_value(violation.limit),
+            violation.rule,
+        )
+
+    console.print(table)
+
+
+def render_host(host: HostInfo, order_seed: int | None = None) -> None:
+    details = [host.platform, f"{host.cpu_count} CPUs"]
+    if host.load_before is not None:
+        details.append(f"load {host.load_before[0]:.2f}")
+    if host.cpu_freq_mhz is not None:
+        details.append(f"{host.cpu_freq_mhz:.0f} MHz")
+    if host.governor is not None:
+        details.append(f"governor {host.governor}")
+    if order_seed is not None:
+        details.append(f"order seed {order_seed}")
+    console.print(f"[dim]Host: {', '.join(details)}[/dim]")
+    for warning in host.warnings:
+        console.print(f"[yellow]{warning}[/yellow]")
+
+
+def _short_commit(commit: str | None) -> str:
+    return commit[:10] if commit else "-"
+
+
+def render_runs_table(runs: Iterable[RunInfo], title: str = "ColdPy Scan History") -> None:
+    table = Table(title=title)
+    table.add_column("Run", justify="right")
+    table.add_column("Generated At", justify="left")
+    table.add_column("Commit", justify="left")
+    table.add_column("Python", justify="left")
+    table.add_column("Modules", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Project", justify="left")
+
+    for run in runs:
+        table.add_row(
+            str(run.id),
+            run.generated_at,
+            _short_commit(run.git_commit),
+            run.python or "-",
+            str(run.total_modules),
+            str(run.failed_modules),
+            run.project_root,
+        )
+
+    console.print(table)
+
+
+def render_metric_history_table(points: Iterable[MetricPoint], title: str = "ColdPy Module History") -> None:
+    table = Table(title=title)
+    table.add_column("Run", justify="right")
+    table.add_column("Generated At", justify="left")
+    table.add_column("Commit", justify="left")
+    table.add_column("Value", justify="right")
+
+    for point in points:
+        table.add_row(str(point.run.id), point.run.generated_at, _short_commit(point.run.git_commit), _format_value(point.value))
+
+    console.print(table)
+
+
+def _format_change(metric: MetricDiff) -> str:
+    if metric.delta is None:
+        return "-"
+    pct = f" ({metric.delta_pct:+.1f}%)" if metric.delta_pct is not None else ""
+    text = f"{metric.delta:+.3f}{pct}"
+    return f"[red]{text}[/red]" if metric.regression else text
+
+
+def render_diff_table(diff: ScanDiff, title: str = "ColdPy Diff") -> None:
+    table = Table(title=title)
+    table.add_column("Module", justify="left")
+    table.add_column("Base (ms)", justify="right")
+    table.add_column("Head (ms)", justify="right")
+    table.add_column("Time Change", justify="right")
+    table.add_column("p (time)", justify="right")
+    table.add_column("Memory Change (MB)", justify="right")
+    table.add_column("p (memory)", justify="right")
+
+    for module in diff.changed:
+        table.add_row(
+            f"[red]{module.name}[/red]" if module.regression else module.name,
+            _format_value(module.time.base),
+            _format_value(module.time.head),
+            _format_change(module.time),
+            _format_value(module.time.p_value),
+            _format_change(module.memory),
+            _format_value(module.memory.p_value),
+        )
+
+    console.print(table)
+    for name in diff.added:
+        console.print(f"[green]New module: {name}[/green]")
+    for name in diff.removed:
+        console.print(f"[dim]Removed module: {name}[/dim]")
+    for name in diff.newly_failing:
+        console.print(f"[red]Now failing to import: {name}[/red]")
+
+
+PHASE_LABELS = {"total": "Total", "init": "Interpreter init", "site": "site/.pth", "app": "Entry point"}
+
+
+def render_startup_report(report: StartupReport, top: int = 10) -> None:
+    table = Table(title=f"ColdPy Startup: {report.target} ({report.samples} runs)")
+    table.add_column("Phase", justify="left")
+    for column in ("min", "p50", "p90", "p95", "p99", "max"):
+        table.add_column(f"{column} (ms)", justify="right")
+
+    for phase in PHASES:
+        latency = getattr(report, phase)
+        table.add_row(
+            PHASE_LABELS[phase],
+            *(_format_value(getattr(latency, column)) for column in ("min", "p50", "p90", "p95", "p99", "max")),
+        )
+    console.print(table)
+
+    for title, nodes in (("Startup imports (site, .pth)", report.startup_imports), ("Entry point imports", report.app_imports)):
+        heaviest: list[ImportNode] = sorted(nodes, key=lambda node: node.cumulative_ms, reverse=True)[:top]
+        if not heaviest:
+            continue
+        imports = Table(title=f"{title}, median run")
+        imports.add_column("Module", justify="left")
+        imports.add_column("Self (ms)", justify="right")
+        imports.add_column("Cumulative (ms)", justify="right")
+        for node in heaviest:
+            imports.add_row(node.name, _format_value(node.self_ms), _format_value(node.cumulative_ms))
+        console.print(imports)
+
+
+def render_suggestions_table(findings: Iterable[DeferrableImport], title: str = "ColdPy Deferrable Imports") -> None:
+    table = Table(title=title)
+    table.add_column("Module", justify="left")
+    table.add_column("Line", justify="right")
+    table.add_column("Import", justify="left")
+    table.add_column("Cumulative (ms)", justify="right")
+    table.add_column("Move Into", justify="left")
+    for finding in findings:
+        functions = ", ".join(finding.functions[:3])
+        if len(finding.functions) > 3:
+            functions += f" (+{len(finding.functions) - 3} more)"
+        table.add_row(finding.module, str(finding.lineno), finding.imported, _format_value(finding.cost_ms), functions)
+    console.print(table)
+
+
+LAZY_STATUS_STYLES = {"deferred": "green", "forced": "yellow", "unsupported": "red", "not imported": "dim"}
+
+
+def render_whatif_report(report: WhatIfReport) -> None:
+    table = Table(title=f"ColdPy What-If: {report.target} ({report.samples} runs each)")
+    table.add_column("Variant", justify="left")
+    for column in ("min", "p50", "p90", "max"):
+        table.add_column(f"{column} (ms)", justify="right")
+    for label, latency in (("As is", report.baseline), ("Lazy", report.projected)):
+        table.add_row(label, *(_format_value(getattr(latency, column)) for column in ("min", "p50", "p90", "max")))
+    console.print(table)
+
+    modules = Table(title="Lazy modules")
+    modules.add_column("Module", justify="left")
+    modules.add_column("Status", justify="left")
+    modules.add_column("Import Cost (ms)", justify="right")
+    modules.add_column("Forced By", justify="left")
+    for module in report.modules:
+        style = LAZY_STATUS_STYLES.get(module.status, "white")
+        forced_by = ""
+        if module.status == "forced":
+            forced_by = f".{module.attribute} at {module.stack[0]}" if module.stack else f".{module.attribute}"
+        modules.add_row(module.name, f"[{style}]{module.status}[/{style}]", _format_value(module.baseline_ms), forced_by)
+    console.print(modules)
+
+    percent = f" ({report.savings_pct:.1f}%)" if report.savings_pct is not None else ""
+    p_value = f", p={report.p_value:.4f}" if report.p_value is not None else ""
+    console.print(f"Projected startup savings: {report.savings_ms:.1f} ms{percent} at p50{p_value}")
+
+
 def print_summary(payload: ScanPayload) -> None:
     summary = payload.summary
     console.print(
@@ -43,7 +401,46 @@ def print_summary(payload: ScanPayload) -> None:
         f"Failed: {summary.failed_modules}"
     )
 
+    compared = [module for module in payload.modules if _has_pyc_comparison(module)]
+    if compared:
+        saved_ms = sum(module.import_time_cold_ms - module.import_time_warm_ms for module in compared)
+        console.print(f"Precompiled bytecode saves {saved_ms:.1f} ms across {len(compared)} modules")
+
+    zipped = [module for module in payload.modules if _has_zip_comparison(module)]
+    if zipped:
+        loose_ms = sum(module.import_time_ms for module in zipped)
+        zip_ms = sum(module.import_time_zip_ms for module in zipped)
+        console.print(
+            f"Importing from the zip archive: {zip_ms:.1f} ms vs {loose_ms:.1f} ms from loose files "
+            f"({zip_ms - loose_ms:+.1f} ms across {len(zipped)} modules)"
+        )
+
+    baseline = payload.baseline
+    if baseline is not None:
+        rss = f", {baseline.rss_mb:.1f} MB RSS" if baseline.rss_mb is not None else ""
+        console.print(f"[dim]Empty interpreter baseline: {baseline.startup_ms:.1f} ms startup{rss}[/dim]")
+
+    stats = payload.stats
+    if stats is not None and stats.total_import_time_ms is not None:
+        preload = f" including {stats.preload_time_ms:.1f} ms preload" if stats.preload_time_ms else ""
+        console.print(f"Total marginal import time: {stats.total_import_time_ms:.1f} ms{preload}")
+        for error in stats.preload_errors:
+            console.print(f"[yellow]Preload failed: {error}[/yellow]")
+    if stats is not None and stats.estimated_savings_ms is not None:
+        console.print(
+            f"[dim]Fork server: {stats.fork_overhead_ms:.1f} ms/module startup vs "
+            f"{stats.spawn_overhead_ms:.1f} ms with spawn; "
+            f"saved ~{stats.estimated_savings_ms:.0f} ms of {stats.wall_time_ms:.0f} ms wall-clock[/dim]"
+        )
 
-def write_json_report(payload: ScanPayload, output_file: Path) -> None:
+
+def write_json_report(payload: ScanPayload | MatrixPayload, output_file: Path) -> None:
     output_file.parent.mkdir(parents=True, exist_ok=True)
     output_file.write_text(json.dumps(payload.to_dict(), indent=2), encoding="utf-8")
+
+
+def append_jsonl_result(module: ModuleResult, output_file: Path) -> None:
+    """Append one result and flush it, so an interrupted scan keeps everything finished so far."""
+    with output_file.open("a", encoding="utf-8") as handle:
+        handle.write(json.dumps(module.to_dict()) + "\n")
+        handle.flush()
@@ -2,9 +2,37 @@ from __future__ import annotations
 
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 DEFAULT_ENV_FILES = (".env", ".env.local")
+STABLE_ENV_KEYS = {
+    "PATH",
+    "HOME",
+    "USER",
+    "LOGNAME",
+    "LANG",
+    "TMPDIR",
+    "TEMP",
+    "TMP",
+    "SYSTEMROOT",
+    "VIRTUAL_ENV",
+    "CONDA_PREFIX",
+    "PYTHONPATH",
+}
+STABLE_HASH_SEED = "0"
+PROBE_FILE = Path(__file__).with_name("probe.py")
+STARTUP_PROBE_FILE = Path(__file__).with_name("startup_probe.py")
+
+
+@lru_cache(maxsize=1)
+def probe_source() -> str:
+    return PROBE_FILE.read_text(encoding="utf-8")
+
+
+@lru_cache(maxsize=1)
+def startup_probe_source() -> str:
+    return STARTUP_PROBE_FILE.read_text(encoding="utf-8")
 
 
 def _absolute_no_symlink(path: Path) -> Path:
@@ -82,8 +110,14 @@ def load_project_env(project_root: Path, env_file: Path | None = None) -> tuple[
     return {}, None
 
 
-def build_scan_environment(extra_env: dict[str, str] | None = None) -> dict[str, str]:
-    merged = os.environ.copy()
+def build_scan_environment(extra_env: dict[str, str] | None = None, stable: bool = False) -> dict[str, str]:
+    """The inherited environment plus ``extra_env``. ``stable`` keeps only what an interpreter needs
+    to start (``STABLE_ENV_KEYS``) and fixes ``PYTHONHASHSEED`` unless ``extra_env`` sets it."""
+    if stable:
+        merged = {key: value for key, value in os.environ.items() if key in STABLE_ENV_KEYS or key.startswith("LC_")}
+        merged["PYTHONHASHSEED"] = STABLE_HASH_SEED
+    else:
+        merged = os.environ.copy()
     if extra_env:
         merged.update(extra_env)
     return merged
@@ -1,15 +1,68 @@
 from __future__ import annotations
 
 import json
+import os
+import queue
+import random
+import signal
+import statistics
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
 from pathlib import Path
+from typing import Any, Callable, Generator, Iterator
 
+from coldpy.attribution import DistributionIndex, attribute_costs
+from coldpy.cache import module_fingerprints
 from coldpy.discovery import ModuleTarget
-from coldpy.models import HEAVY_IMPORT_NOTE, ModuleResult, ScanPayload, ScanSettings, ScanSummary
+from coldpy.forkserver import ForkServer, fork_server_supported
+from coldpy.graph import build_import_graph, import_order, parse_modules
+from coldpy.hostinfo import collect_host_info, load_average, noise_warnings
+from coldpy.importtree import build_tree
+from coldpy.models import (
+    HEAVY_IMPORT_NOTE,
+    AllocationSite,
+    ModuleProfile,
+    ModuleResult,
+    ProfileHotspot,
+    ScanBaseline,
+    ScanPayload,
+    ScanSettings,
+    ScanStats,
+    ScanSummary,
+)
+from coldpy.profiling import DEFAULT_SAMPLE_INTERVAL_MS, parse_stacks, profiles_path, write_sampled_profile
+from coldpy.runtime import STABLE_HASH_SEED, build_scan_environment, probe_source
+from coldpy.stats import DEFAULT_STATISTIC, STATISTICS, pick, summarize
+from coldpy.ziplayout import archive_key, pack_project, zip_import_root
 
 DEFAULT_THRESHOLD_MS = 100.0
 DEFAULT_THRESHOLD_MB = 50.0
+DEFAULT_ALLOC_SITES = 10
+EXECUTOR_SPAWN = "spawn"
+EXECUTOR_FORKSERVER = "forkserver"
+EXECUTORS = (EXECUTOR_SPAWN, EXECUTOR_FORKSERVER)
+MODE_ISOLATED = "isolated"
+MODE_MARGINAL = "marginal"
+MODES = (MODE_ISOLATED, MODE_MARGINAL)
+MEMORY_TRACEMALLOC = "tracemalloc"
+MEMORY_RSS = "rss"
+MEMORY_NONE = "none"
+MEMORY_METHODS = (MEMORY_TRACEMALLOC, MEMORY_RSS, MEMORY_NONE)
+PYC_COLD = "cold"
+PYC_WARM = "warm"
+PYC_BOTH = "both"
+PYC_MODES = (PYC_COLD, PYC_WARM, PYC_BOTH)
+ZIP_PASS = "zip"
+PASS_RESULT_FIELDS = {PYC_COLD: "import_time_cold_ms", PYC_WARM: "import_time_warm_ms", ZIP_PASS: "import_time_zip_ms"}
+ZIP_FAILED_NOTE = "Fails to import from the zip archive"
+FAILURE_STATUSES = ("error", "timeout", "limit")
+ALREADY_LOADED_NOTE = "Already imported by an earlier module; marginal cost is near zero."
+OVERHEAD_SAMPLES = 3
+LIMIT_SIGNALS = {getattr(signal, name) for name in ("SIGXCPU", "SIGKILL") if hasattr(signal, name)}
 
 
 def _measure_module(
@@ -17,60 +70,80 @@ def _measure_module(
     project_root: Path,
     python_executable: Path | None = None,
     scan_env: dict[str, str] | None = None,
+    options: dict[str, object] | None = None,
+    import_root: Path | None = None,
 ) -> dict[str, object]:
-    probe_code = r'''
-import importlib
-import json
-import sys
-import time
-import tracemalloc
-
-module_name = sys.argv[1]
-project_root = sys.argv[2]
-
-sys.path.insert(0, project_root)
-tracemalloc.start()
-start = time.perf_counter()
-
-try:
-    importlib.import_module(module_name)
-    elapsed_ms = (time.perf_counter() - start) * 1000
-    current, peak = tracemalloc.get_traced_memory()
-    output = {
-        "status": "ok",
-        "import_time_ms": elapsed_ms,
-        "memory_mb": peak / (1024 * 1024),
-    }
-except Exception as exc:
-    output = {
-        "status": "error",
-        "error_type": type(exc).__name__,
-        "error_message": str(exc),
-    }
-finally:
-    tracemalloc.stop()
+    options = options or {}
+    return _run_probe(
+        [module_name, str(import_root or project_root), json.dumps(options)],
+        project_root,
+        python_executable=python_executable,
+        scan_env=scan_env,
+        options=options,
+    )
+
+
+def _measure_marginal(
+    module_names: list[str],
+    project_root: Path,
+    preload: list[str],
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    options: dict[str, object] | None = None,
+) -> dict[str, object]:
+    options = {**(options or {}), "modules": module_names, "preload": preload}
+    if options.get("timeout_s") is not None:
+        # One interpreter imports everything, so the per-module budget is pooled over the run.
+        options["timeout_s"] = float(options["timeout_s"]) * max(len(module_names) + len(preload), 1)
+    return _run_probe(
+        ["--marginal", str(project_root), json.dumps(options)],
+        project_root,
+        python_executable=python_executable,
+        scan_env=scan_env,
+        options=options,
+    )
 
-print(json.dumps(output))
-'''
 
+def _run_probe(
+    probe_args: list[str],
+    project_root: Path,
+    python_executable: Path | None,
+    scan_env: dict[str, str] | None,
+    options: dict[str, object],
+) -> dict[str, object]:
     executable = str(python_executable or Path(sys.executable))
-    completed = subprocess.run(
-        [executable, "-c", probe_code, module_name, str(project_root)],
+    command = [executable, *interpreter_flags(options), "-c", probe_source(), *probe_args]
+
+    timeout_s = options.get("timeout_s")
+    process = subprocess.Popen(
+        command,
         text=True,
-        capture_output=True,
-        check=False,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
         cwd=str(project_root),
         env=scan_env,
+        start_new_session=True,
     )
+    try:
+        stdout_text, stderr_text = process.communicate(timeout=timeout_s)
+    except subprocess.TimeoutExpired:
+        _kill_process_group(process)
+        process.communicate()
+        return {
+            "status": "timeout",
+            "error_type": "TimeoutError",
+            "error_message": f"Import did not finish within {timeout_s}s.",
+        }
 
-    if completed.returncode != 0 and not completed.stdout.strip():
+    if process.returncode != 0 and not stdout_text.strip():
+        limited = options.get("max_cpu_s") is not None and -process.returncode in LIMIT_SIGNALS
         return {
-            "status": "error",
+            "status": "limit" if limited else "error",
             "error_type": "SubprocessError",
-            "error_message": completed.stderr.strip() or "Child process exited unexpectedly.",
+            "error_message": stderr_text.strip() or f"Child process exited with status {process.returncode}.",
         }
 
-    stdout = completed.stdout.strip().splitlines()
+    stdout = stdout_text.strip().splitlines()
     if not stdout:
         return {
             "status": "error",
@@ -88,58 +161,801 @@ print(json.dumps(output))
         }
 
 
-def scan_modules(
+def _kill_process_group(process: subprocess.Popen[str]) -> None:
+    """Kill the probe and anything its import spawned; the probe leads its own session."""
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+
+
+def interpreter_flags(options: dict[str, object]) -> list[str]:
+    flags: list[str] = []
+    if options.get("import_tree"):
+        flags.extend(["-X", "importtime"])
+    return flags
+
+
+def available_cpus() -> list[int]:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+@dataclass
+class _MeasurePass:
+    """One way of importing every module, e.g. with a cold or a warm bytecode cache."""
+
+    state: str | None
+    scan_env: dict[str, str] | None
+    warmup: int
+    memory_method: str
+    # Where the probe imports from when it is not the project itself, e.g. a zip archive.
+    import_root: Path | None = None
+
+
+@dataclass
+class _WorkerSlot:
+    cpu: int | None
+    servers: dict[str | None, ForkServer]
+
+
+def _measure_all(
+    module_targets: list[ModuleTarget],
     project_root: Path,
+    jobs: int,
+    pin_cpus: bool,
+    executor: str,
+    python_executable: Path | None,
+    passes: list[_MeasurePass],
+    repeat: int = 1,
+    probe_options: dict[str, object] | None = None,
+    shuffle_seed: int | None = None,
+) -> Iterator[tuple[int, dict[str | None, list[dict[str, object]]]]]:
+    """Yield ``(index, samples per pass)`` for every target as soon as its imports finish.
+
+    With ``shuffle_seed``, samples are taken in rounds instead, one sample of every module per
+    round in a new random order, so slow drift on the machine spreads evenly over all modules.
+    Every target then finishes in the last round.
+    """
+    probe_options = probe_options or {}
+    cpus: list[int | None] = [None] * jobs
+    if pin_cpus and hasattr(os, "sched_setaffinity"):
+        # Never put two workers on the same CPU, otherwise pinning skews timings instead of isolating them.
+        cpus = list(available_cpus()[:jobs])
+        jobs = len(cpus)
+
+    slots: queue.Queue[_WorkerSlot] = queue.Queue()
+    servers: list[ForkServer] = []
+    for cpu in cpus:
+        slot_servers: dict[str | None, ForkServer] = {}
+        # The bytecode cache settings are fixed at interpreter startup, so every pass needs its own server.
+        for measure_pass in passes if executor == EXECUTOR_FORKSERVER else []:
+            server = ForkServer(
+                project_root,
+                python_executable=python_executable,
+                scan_env=measure_pass.scan_env,
+                interpreter_flags=interpreter_flags(probe_options),
+                import_root=measure_pass.import_root,
+            )
+            server.start()
+            servers.append(server)
+            slot_servers[measure_pass.state] = server
+        slots.put(_WorkerSlot(cpu=cpu, servers=slot_servers))
+
+    def measure_sample(target: ModuleTarget, slot: _WorkerSlot, measure_pass: _MeasurePass) -> dict[str, object]:
+        options = {**probe_options, "cpu": slot.cpu}
+        if measure_pass.state == ZIP_PASS:
+            options["zip_import"] = True
+        server = slot.servers.get(measure_pass.state)
+        if server is None:
+            return measure_import(
+                target.name,
+                project_root,
+                python_executable=python_executable,
+                scan_env=measure_pass.scan_env,
+                memory_method=measure_pass.memory_method,
+                probe_options=options,
+                import_root=measure_pass.import_root,
+            )
+        return _take_sample(
+            lambda sample_options: server.measure(target.name, sample_options), options, measure_pass.memory_method
+        )
+
+    def measure_pass_samples(
+        target: ModuleTarget, slot: _WorkerSlot, measure_pass: _MeasurePass
+    ) -> list[dict[str, object]]:
+        samples: list[dict[str, object]] = []
+        for run in range(measure_pass.warmup + repeat):
+            result = measure_sample(target, slot, measure_pass)
+            if result.get("status") != "ok":
+                # A failing import fails the same way every time; more samples add nothing.
+                return [result]
+            if run >= measure_pass.warmup:
+                samples.append(result)
+        return samples
+
+    def measure(target: ModuleTarget) -> dict[str | None, list[dict[str, object]]]:
+        slot = slots.get()
+        try:
+            by_pass: dict[str | None, list[dict[str, object]]] = {}
+            for measure_pass in passes:
+                by_pass[measure_pass.state] = measure_pass_samples(target, slot, measure_pass)
+                if by_pass[measure_pass.state][0].get("status") != "ok":
+                    break
+            return by_pass
+        finally:
+            slots.put(slot)
+
+    def measure_interleaved(rng: random.Random) -> Iterator[tuple[int, dict[str | None, list[dict[str, object]]]]]:
+        samples: list[dict[str | None, list[dict[str, object]]]] = [
+            {measure_pass.state: [] for measure_pass in passes} for _ in module_targets
+        ]
+        # A failing import fails the same way every time, so its (target, pass) is not measured again.
+        failed: set[tuple[int, str | None]] = set()
+
+        def measure_round(index: int, round_index: int) -> None:
+            slot = slots.get()
+            try:
+                for measure_pass in passes:
+                    if (index, measure_pass.state) in failed or round_index >= measure_pass.warmup + repeat:
+                        continue
+                    result = measure_sample(module_targets[index], slot, measure_pass)
+                    if result.get("status") != "ok":
+                        samples[index][measure_pass.state] = [result]
+                        failed.add((index, measure_pass.state))
+                    elif round_index >= measure_pass.warmup:
+                        samples[index][measure_pass.state].append(result)
+                    if (index, passes[0].state) in failed:
+                        return
+            finally:
+                slots.put(slot)
+
+        rounds = max(measure_pass.warmup for measure_pass in passes) + repeat
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            for round_index in range(rounds):
+                order = [index for index in range(len(module_targets)) if (index, passes[0].state) not in failed]
+                rng.shuffle(order)
+                list(pool.map(lambda index: measure_round(index, round_index), order))
+
+        for index, by_pass in enumerate(samples):
+            first = by_pass[passes[0].state]
+            if first[0].get("status") != "ok":
+                yield index, {passes[0].state: first}
+            else:
+                yield index, {state: state_samples for state, state_samples in by_pass.items() if state_samples}
+
+    try:
+        if shuffle_seed is not None:
+            yield from measure_interleaved(random.Random(shuffle_seed))
+            return
+
+        if jobs == 1:
+            for index, target in enumerate(module_targets):
+                yield index, measure(target)
+            return
+
+        # Each worker thread only waits on its own child interpreter.
+        pool = ThreadPoolExecutor(max_workers=jobs)
+        try:
+            futures = {pool.submit(measure, target): index for index, target in enumerate(module_targets)}
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        for server in servers:
+            server.close()
+
+
+def _measure_marginal_runs(
     module_targets: list[ModuleTarget],
-    threshold_ms: float = DEFAULT_THRESHOLD_MS,
-    threshold_mb: float = DEFAULT_THRESHOLD_MB,
-    exclusions: list[str] | None = None,
+    project_root: Path,
+    preload: list[str],
+    pin_cpus: bool,
+    python_executable: Path | None,
+    scan_env: dict[str, str] | None,
+    repeat: int,
+    warmup: int,
+    probe_options: dict[str, object],
+    memory_method: str = MEMORY_TRACEMALLOC,
+) -> tuple[list[list[dict[str, object]]], list[dict[str, object]]]:
+    order = import_order(build_import_graph(parse_modules(module_targets)))
+    cpu = available_cpus()[0] if pin_cpus and hasattr(os, "sched_setaffinity") else None
+    time_options, memory_options = _pass_options(probe_options, memory_method)
+
+    def run_pass(options: dict[str, object]) -> dict[str, object]:
+        return _measure_marginal(
+            order,
+            project_root,
+            preload,
+            python_executable=python_executable,
+            scan_env=scan_env,
+            options={**options, "cpu": cpu},
+        )
+
+    samples: dict[str, list[dict[str, object]]] = {name: [] for name in order}
+    runs: list[dict[str, object]] = []
+    for run_index in range(warmup + repeat):
+        run = run_pass(time_options)
+        memory_run = run_pass(memory_options) if memory_options is not None and run.get("status") == "ok" else None
+        if run_index < warmup:
+            continue
+        if memory_run is not None and memory_run.get("status") == "ok":
+            run["preload_memory"] = {**run["preload_memory"], **memory_run["preload_memory"]}
+        runs.append(run)
+        module_results = run.get("modules") if run.get("status") == "ok" else None
+        memory_results = memory_run.get("modules") if memory_run is not None else None
+        for position, name in enumerate(order):
+            if module_results is None:
+                result = run
+            else:
+                memory_result = memory_results[position] if memory_results is not None else None
+                result = _with_memory(module_results[position], memory_result, memory_method, marginal=True)
+            if any(sample.get("status") != "ok" for sample in samples[name]):
+                continue
+            if result.get("status") != "ok":
+                samples[name] = [result]
+            else:
+                samples[name].append(result)
+
+    return [samples[target.name] for target in module_targets], runs
+
+
+def _pass_options(
+    probe_options: dict[str, object], memory_method: str
+) -> tuple[dict[str, object], dict[str, object] | None]:
+    """Split one measurement into an untraced timing pass and, for tracemalloc, a separate memory pass."""
+    time_options = {**probe_options, "memory": None}
+    if memory_method != MEMORY_TRACEMALLOC:
+        return time_options, None
+    # With import trees, the memory pass also breaks traced memory down by module for attribution.
+    return time_options, {
+        **probe_options,
+        "memory": MEMORY_TRACEMALLOC,
+        "import_tree": False,
+        "memory_by_module": bool(probe_options.get("import_tree")),
+        # Memory is measured with the collector running, as the application will run it.
+        "disable_gc": False,
+    }
+
+
+def _take_sample(
+    run: Callable[[dict[str, object]], dict[str, object]], probe_options: dict[str, object], memory_method: str
+) -> dict[str, object]:
+    time_options, memory_options = _pass_options(probe_options, memory_method)
+    result = run(time_options)
+    if result.get("status") != "ok" or memory_options is None:
+        return _with_memory(result, None, memory_method, marginal=False)
+    return _with_memory(result, run(memory_options), memory_method, marginal=False)
+
+
+def measure_import(
+    module_name: str,
+    project_root: Path,
+    *,
     python_executable: Path | None = None,
     scan_env: dict[str, str] | None = None,
-) -> ScanPayload:
-    modules: list[ModuleResult] = []
+    memory_method: str = MEMORY_TRACEMALLOC,
+    probe_options: dict[str, object] | None = None,
+    import_root: Path | None = None,
+) -> dict[str, object]:
+    """One sample of importing ``module_name`` in a fresh interpreter, as ``coldpy scan`` takes it.
 
-    for target in module_targets:
-        result = _measure_module(
-            target.name,
+    The import is timed untraced; tracemalloc memory comes from a second, traced import. The
+    result carries ``import_time_ms`` and ``memory_mb``, or ``status`` and the error on failure.
+    """
+    return _take_sample(
+        lambda options: _measure_module(
+            module_name,
             project_root,
             python_executable=python_executable,
             scan_env=scan_env,
+            options=options,
+            import_root=import_root,
+        ),
+        probe_options or {},
+        memory_method,
+    )
+
+
+def _with_memory(
+    sample: dict[str, object],
+    memory_sample: dict[str, object] | None,
+    memory_method: str,
+    marginal: bool,
+) -> dict[str, object]:
+    if sample.get("status") != "ok":
+        return sample
+    if memory_sample is not None and memory_sample.get("status") != "ok":
+        return memory_sample
+
+    merged = dict(sample)
+    merged["memory_mb"] = None
+    merged["memory_method"] = None
+    if memory_method == MEMORY_TRACEMALLOC and memory_sample is not None:
+        key = "traced_retained_mb" if marginal else "traced_peak_mb"
+        merged["memory_mb"] = memory_sample.get(key)
+        merged["memory_method"] = "tracemalloc_retained" if marginal else "tracemalloc_peak"
+        merged["memory_retained_mb"] = memory_sample.get("traced_retained_mb")
+        for key in ("memory_by_module", "allocation_sites"):
+            if memory_sample.get(key) is not None:
+                merged[key] = memory_sample[key]
+    elif memory_method == MEMORY_RSS:
+        for key, method in (("rss_delta_mb", "rss_delta"), ("maxrss_delta_mb", "maxrss_delta")):
+            if sample.get(key) is not None:
+                merged["memory_mb"] = sample[key]
+                merged["memory_method"] = method
+                break
+    return merged
+
+
+def profile_module(
+    module_name: str,
+    project_root: Path,
+    output_dir: Path,
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    options: dict[str, object] | None = None,
+    interval_ms: float = DEFAULT_SAMPLE_INTERVAL_MS,
+) -> ModuleProfile | None:
+    """Re-import ``module_name`` once under cProfile and once under the stack sampler.
+
+    The two runs are separate processes, so cProfile's per-call overhead does not skew the samples.
+    Returns ``None`` when neither run could import the module.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    options = options or {}
+    pstats_file = output_dir / f"{module_name}.pstats"
+    cprofile_options = {**options, "profiler": "cprofile", "output": str(pstats_file)}
+    sampling_options = {**options, "profiler": "sampling", "interval_ms": interval_ms}
+    deterministic = _run_probe(
+        ["--profile", module_name, str(project_root), json.dumps(cprofile_options)],
+        project_root,
+        python_executable=python_executable,
+        scan_env=scan_env,
+        options=options,
+    )
+    sampled = _run_probe(
+        ["--profile", module_name, str(project_root), json.dumps(sampling_options)],
+        project_root,
+        python_executable=python_executable,
+        scan_env=scan_env,
+        options=options,
+    )
+    if deterministic.get("status") != "ok" and sampled.get("status") != "ok":
+        return None
+
+    profile = ModuleProfile()
+    if deterministic.get("status") == "ok":
+        profile.pstats = str(pstats_file.resolve())
+        profile.hotspots = [
+            ProfileHotspot(
+                function=str(hotspot["function"]),
+                calls=int(hotspot["calls"]),
+                self_ms=round(float(hotspot["self_ms"]), 3),
+                cumulative_ms=round(float(hotspot["cumulative_ms"]), 3),
+            )
+            for hotspot in deterministic.get("hotspots") or []
+        ]
+    if sampled.get("status") == "ok":
+        stacks = parse_stacks(sampled.get("stacks") or [])
+        collapsed, speedscope = write_sampled_profile(output_dir, module_name, stacks)
+        profile.collapsed = str(collapsed.resolve())
+        profile.speedscope = str(speedscope.resolve())
+        profile.samples = sum(count for _, count, _ in stacks)
+    return profile
+
+
+def measure_baseline(
+    project_root: Path,
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+) -> ScanBaseline:
+    """Startup time and memory of a target interpreter that imports nothing but the probe."""
+    executable = str(python_executable or Path(sys.executable))
+    startup_samples: list[float] = []
+    outputs: list[dict[str, object]] = []
+    for _ in range(OVERHEAD_SAMPLES):
+        start = time.perf_counter()
+        completed = subprocess.run(
+            [executable, "-c", probe_source(), "--noop"],
+            text=True,
+            capture_output=True,
+            check=False,
+            cwd=str(project_root),
+            env=scan_env,
         )
-        if result.get("status") == "ok":
-            import_time_ms = float(result["import_time_ms"])
-            memory_mb = float(result["memory_mb"])
-            notes: list[str] = []
-            if import_time_ms > threshold_ms or memory_mb > threshold_mb:
-                notes.append(HEAVY_IMPORT_NOTE)
-
-            modules.append(
-                ModuleResult(
-                    name=target.name,
-                    file=str(target.file),
-                    import_time_ms=round(import_time_ms, 3),
-                    memory_mb=round(memory_mb, 3),
-                    status="ok",
-                    notes=notes,
+        startup_samples.append((time.perf_counter() - start) * 1000)
+        try:
+            outputs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+        except (IndexError, json.JSONDecodeError):
+            continue
+
+    def median_of(key: str) -> float | None:
+        values = [float(output[key]) for output in outputs if output.get(key) is not None]
+        return round(statistics.median(values), 3) if values else None
+
+    def first_of(key: str) -> str | None:
+        return next((str(output[key]) for output in outputs if output.get(key) is not None), None)
+
+    return ScanBaseline(
+        startup_ms=round(statistics.median(startup_samples), 3),
+        rss_mb=median_of("rss_mb"),
+        maxrss_mb=median_of("maxrss_mb"),
+        python_version=first_of("python_version"),
+        implementation=first_of("implementation"),
+    )
+
+
+def resolve_distributions(
+    project_root: Path,
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+) -> dict[str, object]:
+    """Ask the target interpreter which installed distribution owns each package, from RECORD files."""
+    executable = str(python_executable or Path(sys.executable))
+    completed = subprocess.run(
+        [executable, "-c", probe_source(), "--distributions"],
+        text=True,
+        capture_output=True,
+        check=False,
+        cwd=str(project_root),
+        env=scan_env,
+    )
+    try:
+        return json.loads(completed.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError):
+        return {"status": "error"}
+
+
+def _fork_overhead_ms(project_root: Path, python_executable: Path | None, scan_env: dict[str, str] | None) -> float:
+    with ForkServer(project_root, python_executable=python_executable, scan_env=scan_env) as server:
+        server.fork_overhead_ms()
+        return statistics.median(server.fork_overhead_ms() for _ in range(OVERHEAD_SAMPLES))
+
+
+def _pyc_states(pyc_mode: str | None) -> list[str | None]:
+    if pyc_mode is None:
+        return [None]
+    return [PYC_COLD, PYC_WARM] if pyc_mode == PYC_BOTH else [pyc_mode]
+
+
+def _pyc_env(scan_env: dict[str, str] | None, pycache_prefix: Path, writable: bool) -> dict[str, str]:
+    env = dict(scan_env if scan_env is not None else os.environ)
+    env["PYTHONPYCACHEPREFIX"] = str(pycache_prefix)
+    if writable:
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+    else:
+        env["PYTHONDONTWRITEBYTECODE"] = "1"
+    return env
+
+
+def compile_bytecode(
+    module_targets: list[ModuleTarget],
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+) -> None:
+    """Byte-compile the project files with the target interpreter, honouring PYTHONPYCACHEPREFIX."""
+    if not module_targets:
+        return
+    executable = str(python_executable or Path(sys.executable))
+    subprocess.run(
+        [executable, "-m", "compileall", "-q", *(str(target.file) for target in module_targets)],
+        capture_output=True,
+        check=False,
+        env=scan_env,
+    )
+
+
+def _is_heavy(import_time_ms: float, memory_mb: float, threshold_ms: float, threshold_mb: float) -> bool:
+    return import_time_ms > threshold_ms or memory_mb > threshold_mb
+
+
+def _build_result(
+    target: ModuleTarget,
+    samples: list[dict[str, object]],
+    threshold_ms: float,
+    threshold_mb: float,
+    statistic: str = DEFAULT_STATISTIC,
+) -> ModuleResult:
+    result = samples[0]
+    if result.get("status") == "ok":
+        time_stats = summarize([float(sample["import_time_ms"]) for sample in samples])
+        memory_values = [float(sample["memory_mb"]) for sample in samples if sample.get("memory_mb") is not None]
+        memory_stats = summarize(memory_values) if memory_values else None
+        rss_values = [float(sample["rss_delta_mb"]) for sample in samples if sample.get("rss_delta_mb") is not None]
+        retained_values = [
+            float(sample["memory_retained_mb"]) for sample in samples if sample.get("memory_retained_mb") is not None
+        ]
+        import_time_ms = pick(time_stats, statistic)
+        memory_mb = pick(memory_stats, statistic) if memory_stats is not None else None
+        representative = min(samples, key=lambda sample: abs(float(sample["import_time_ms"]) - time_stats.median))
+        raw_tree = representative.get("import_tree")
+        memory_by_module = representative.get("memory_by_module")
+        # Sites come from the probe's own threshold check on one sample; keep them only if the result agrees.
+        sites = next(
+            (sample["allocation_sites"] for sample in (representative, *samples) if sample.get("allocation_sites")),
+            None,
+        )
+        if memory_mb is None or memory_mb <= threshold_mb:
+            sites = None
+        notes: list[str] = []
+        if _is_heavy(import_time_ms, memory_mb or 0.0, threshold_ms, threshold_mb):
+            notes.append(HEAVY_IMPORT_NOTE)
+
+        return ModuleResult(
+            name=target.name,
+            file=str(target.file),
+            import_time_ms=round(import_time_ms, 3),
+            memory_mb=round(memory_mb, 3) if memory_mb is not None else None,
+            status="ok",
+            notes=notes,
+            time_stats=time_stats,
+            memory_stats=memory_stats,
+            import_tree=build_tree(raw_tree) if raw_tree is not None else None,
+            rss_delta_mb=round(statistics.median(rss_values), 3) if rss_values else None,
+            time_method="perf_counter+importtime" if raw_tree is not None else "perf_counter",
+            memory_method=representative.get("memory_method"),
+            memory_by_module=(
+                {name: round(float(value), 4) for name, value in memory_by_module.items()}
+                if memory_by_module is not None
+                else None
+            ),
+            memory_retained_mb=round(statistics.median(retained_values), 3) if retained_values else None,
+            allocation_sites=(
+                [
+                    AllocationSite(
+                        size_mb=round(float(site["size_mb"]), 3), count=int(site["count"]), frames=list(site["frames"])
+                    )
+                    for site in sites
+                ]
+                if sites is not None
+                else None
+            ),
+        )
+
+    error_type = result.get("error_type", "ImportError")
+    error_message = result.get("error_message", "Unknown import error")
+    return ModuleResult(
+        name=target.name,
+        file=str(target.file),
+        import_time_ms=None,
+        memory_mb=None,
+        status=result["status"] if result.get("status") in FAILURE_STATUSES else "error",
+        error=f"{error_type}: {error_message}",
+        notes=[],
+    )
+
+
+def _reuse_result(
+    target: ModuleTarget,
+    previous: ModuleResult,
+    threshold_ms: float,
+    threshold_mb: float,
+) -> ModuleResult:
+    notes = [note for note in previous.notes if note != HEAVY_IMPORT_NOTE]
+    if previous.status == "ok" and _is_heavy(
+        previous.import_time_ms or 0.0, previous.memory_mb or 0.0, threshold_ms, threshold_mb
+    ):
+        notes.append(HEAVY_IMPORT_NOTE)
+    return replace(previous, file=str(target.file), notes=notes, reused=True)
+
+
+def _scan(
+    project_root: Path,
+    module_targets: list[ModuleTarget],
+    *,
+    threshold_ms: float,
+    threshold_mb: float,
+    exclusions: list[str] | None,
+    python_executable: Path | None,
+    scan_env: dict[str, str] | None,
+    jobs: int,
+    pin_cpus: bool,
+    executor: str,
+    previous_results: dict[str, ModuleResult] | None,
+    repeat: int,
+    warmup: int,
+    statistic: str,
+    import_tree: bool,
+    mode: str,
+    preload: list[str] | None,
+    memory_method: str,
+    pyc_mode: str | None,
+    timeout_s: float | None,
+    max_memory_mb: float | None,
+    max_cpu_s: int | None,
+    alloc_sites: int,
+    alloc_frames: int,
+    profile_over_ms: float | None,
+    profile_dir: Path | None,
+    zip_import: bool,
+    zip_archive: Path | None,
+    stable: bool,
+    disable_gc: bool,
+    order_seed: int | None,
+) -> Generator[ModuleResult, None, ScanPayload]:
+    limits = {"timeout_s": timeout_s, "max_memory_mb": max_memory_mb, "max_cpu_s": max_cpu_s}
+    limits = {key: value for key, value in limits.items() if value is not None}
+    zip_import = zip_import or zip_archive is not None
+    zip_root = zip_import_root(zip_archive) if zip_archive is not None else None
+    preload = preload or []
+    probe_options = {"import_tree": import_tree, **limits}
+    if disable_gc:
+        probe_options["disable_gc"] = True
+    host = None
+    if stable:
+        pin_cpus = True
+        scan_env = dict(scan_env) if scan_env is not None else build_scan_environment(stable=True)
+        scan_env.setdefault("PYTHONHASHSEED", STABLE_HASH_SEED)
+        order_seed = order_seed if order_seed is not None else random.randrange(2**32)
+        host = collect_host_info(available_cpus()[0] if hasattr(os, "sched_setaffinity") else None)
+    if pin_cpus and hasattr(os, "sched_setaffinity"):
+        # _measure_all never puts two pinned workers on one CPU; record the workers actually used.
+        jobs = min(jobs, len(available_cpus()))
+    if alloc_sites and memory_method == MEMORY_TRACEMALLOC and mode == MODE_ISOLATED:
+        probe_options.update(alloc_sites=alloc_sites, alloc_frames=alloc_frames, threshold_mb=threshold_mb)
+
+    fingerprints = module_fingerprints(
+        module_targets,
+        python_executable=python_executable,
+        scan_env=scan_env,
+        measurement_key=(
+            f"mode={mode};preload={','.join(preload)};"
+            f"repeat={repeat};warmup={warmup};statistic={statistic};"
+            f"import_tree={import_tree};memory={memory_method};pyc={pyc_mode};"
+            f"limits={json.dumps(limits, sort_keys=True)};"
+            f"alloc={f'{alloc_sites}x{alloc_frames}@{threshold_mb}' if alloc_sites else 'off'};"
+            f"zip={archive_key(zip_archive) if zip_archive is not None else zip_import};"
+            f"gc={'off' if disable_gc else 'on'}"
+        ),
+    )
+    reused: dict[str, ModuleResult] = {}
+    # A marginal cost depends on every module imported before it, so it is never reused on its own.
+    for target in module_targets if mode == MODE_ISOLATED else []:
+        previous = (previous_results or {}).get(target.name)
+        if previous is not None and previous.fingerprint == fingerprints[target.name]:
+            reused[target.name] = previous
+    pending = [target for target in module_targets if target.name not in reused]
+
+    started = time.perf_counter()
+    modules: dict[str, ModuleResult] = {}
+    for target in module_targets:
+        if target.name in reused:
+            module = _reuse_result(target, reused[target.name], threshold_ms, threshold_mb)
+            module.fingerprint = fingerprints[target.name]
+            modules[target.name] = module
+            yield module
+
+    def finish(target: ModuleTarget, by_pass: dict[str | None, list[dict[str, object]]]) -> ModuleResult:
+        samples = by_pass[passes[0].state]
+        module = _build_result(target, samples, threshold_ms, threshold_mb, statistic=statistic)
+        for state, state_samples in by_pass.items():
+            if state is not None:
+                timing = _build_result(target, state_samples, threshold_ms, threshold_mb, statistic=statistic)
+                setattr(module, PASS_RESULT_FIELDS[state], timing.import_time_ms)
+                if state == ZIP_PASS and timing.status != "ok":
+                    module.notes.append(f"{ZIP_FAILED_NOTE}: {timing.error}")
+        if any(sample.get("already_loaded") for sample in samples):
+            module.notes.append(ALREADY_LOADED_NOTE)
+        module.fingerprint = fingerprints[target.name]
+        modules[target.name] = module
+        return module
+
+    marginal_runs: list[dict[str, object]] = []
+    with tempfile.TemporaryDirectory(prefix="coldpy-pyc-") as pycache_root:
+        passes: list[_MeasurePass] = []
+        for index, state in enumerate(_pyc_states(pyc_mode)):
+            pass_env, pass_warmup = scan_env, warmup
+            if state is not None:
+                pass_env = _pyc_env(scan_env, Path(pycache_root) / state, writable=state == PYC_WARM)
+            if state == PYC_WARM:
+                compile_bytecode(pending, python_executable=python_executable, scan_env=pass_env)
+                # One unrecorded import also compiles stdlib and third-party modules into the prefix.
+                pass_warmup = max(warmup, 1)
+            # Memory does not depend on the bytecode state, so only the first pass measures it.
+            passes.append(_MeasurePass(state, pass_env, pass_warmup, memory_method if index == 0 else MEMORY_NONE))
+        if zip_import and pending:
+            # Packed from every target, not just the pending ones, which may import the rest.
+            zip_root = zip_root or pack_project(project_root, module_targets, Path(pycache_root) / "project.zip")
+            passes.append(_MeasurePass(ZIP_PASS, scan_env, warmup, MEMORY_NONE, import_root=zip_root))
+
+        if mode == MODE_MARGINAL and pending:
+            per_pass: dict[str | None, list[list[dict[str, object]]]] = {}
+            for measure_pass in passes:
+                per_pass[measure_pass.state], runs = _measure_marginal_runs(
+                    pending,
+                    project_root,
+                    preload,
+                    pin_cpus=pin_cpus,
+                    python_executable=python_executable,
+                    scan_env=measure_pass.scan_env,
+                    repeat=repeat,
+                    warmup=measure_pass.warmup,
+                    probe_options=probe_options,
+                    memory_method=measure_pass.memory_method,
                 )
-            )
-        else:
-            error_type = result.get("error_type", "ImportError")
-            error_message = result.get("error_message", "Unknown import error")
-            modules.append(
-                ModuleResult(
-                    name=target.name,
-                    file=str(target.file),
-                    import_time_ms=None,
-                    memory_mb=None,
-                    status="error",
-                    error=f"{error_type}: {error_message}",
-                    notes=[],
+                marginal_runs = marginal_runs or runs
+            for position, target in enumerate(pending):
+                yield finish(target, {state: results[position] for state, results in per_pass.items()})
+        elif pending:
+            for position, by_pass in _measure_all(
+                pending,
+                project_root,
+                jobs=jobs,
+                pin_cpus=pin_cpus,
+                executor=executor,
+                python_executable=python_executable,
+                passes=passes,
+                repeat=repeat,
+                probe_options=probe_options,
+                shuffle_seed=order_seed if stable else None,
+            ):
+                yield finish(pending[position], by_pass)
+
+    stats = ScanStats(
+        wall_time_ms=round((time.perf_counter() - started) * 1000, 3),
+        reused_modules=len(reused),
+    )
+
+    if profile_over_ms is not None:
+        for target in pending:
+            module = modules[target.name]
+            if module.status == "ok" and (module.import_time_ms or 0.0) > profile_over_ms:
+                # A copy, so results already yielded to the caller stay as they were reported.
+                modules[target.name] = replace(
+                    module,
+                    profile=profile_module(
+                        target.name,
+                        project_root,
+                        profile_dir or profiles_path(),
+                        python_executable=python_executable,
+                        scan_env=scan_env,
+                        options=limits,
+                    ),
                 )
-            )
 
-    scanned_modules = sum(1 for module in modules if module.status == "ok")
-    failed_modules = len(modules) - scanned_modules
+    baseline = measure_baseline(project_root, python_executable=python_executable, scan_env=scan_env)
+    if mode == MODE_ISOLATED and executor == EXECUTOR_FORKSERVER and pending:
+        spawn_ms = baseline.startup_ms
+        fork_ms = _fork_overhead_ms(project_root, python_executable, scan_env)
+        workers = max(1, min(jobs, len(pending)))
+        stats.spawn_overhead_ms = round(spawn_ms, 3)
+        stats.fork_overhead_ms = round(fork_ms, 3)
+        stats.estimated_savings_ms = round(max(spawn_ms - fork_ms, 0.0) * len(pending) / workers, 3)
+
+    ordered = [modules[target.name] for target in module_targets]
+    if mode == MODE_MARGINAL:
+        completed_runs = [run for run in marginal_runs if run.get("status") == "ok"]
+        if completed_runs:
+            stats.preload_time_ms = round(statistics.median(float(run["preload_ms"]) for run in completed_runs), 3)
+            preload_memory = [{"status": "ok", **run["preload_memory"]} for run in completed_runs]
+            preload_memory = [_with_memory(memory, memory, memory_method, marginal=True) for memory in preload_memory]
+            preload_values = [float(memory["memory_mb"]) for memory in preload_memory if memory["memory_mb"] is not None]
+            stats.preload_memory_mb = round(statistics.median(preload_values), 3) if preload_values else None
+            stats.preload_errors = list(completed_runs[0].get("preload_errors") or [])
+        stats.total_import_time_ms = round(
+            (stats.preload_time_ms or 0.0) + sum(module.import_time_ms or 0.0 for module in ordered), 3
+        )
+
+    distributions = None
+    if import_tree:
+        index = DistributionIndex.from_probe(
+            resolve_distributions(project_root, python_executable=python_executable, scan_env=scan_env),
+            (target.name for target in module_targets),
+        )
+        distributions = attribute_costs(ordered, index)
+
+    if host is not None:
+        host.load_after = load_average()
+        host.warnings = noise_warnings(host, ordered)
+
+    scanned_modules = sum(1 for module in ordered if module.status == "ok")
+    failed_modules = len(ordered) - scanned_modules
     summary = ScanSummary(
         total_modules=len(module_targets),
         scanned_modules=scanned_modules,
@@ -150,11 +966,225 @@ def scan_modules(
         threshold_ms=threshold_ms,
         threshold_mb=threshold_mb,
         exclusions=exclusions or [],
+        jobs=jobs,
+        pin_cpus=pin_cpus,
+        executor=executor,
+        repeat=repeat,
+        warmup=warmup,
+        statistic=statistic,
+        import_tree=import_tree,
+        mode=mode,
+        preload=preload,
+        memory_method=memory_method,
+        pyc_mode=pyc_mode,
+        timeout_s=timeout_s,
+        max_memory_mb=max_memory_mb,
+        max_cpu_s=max_cpu_s,
+        alloc_sites=alloc_sites,
+        alloc_frames=alloc_frames,
+        profile_over_ms=profile_over_ms,
+        zip_import=zip_import,
+        zip_archive=str(zip_archive.resolve()) if zip_archive is not None else None,
+        stable=stable,
+        disable_gc=disable_gc,
+        order_seed=order_seed if stable else None,
     )
 
     return ScanPayload(
         project_root=str(project_root),
         settings=settings,
         summary=summary,
-        modules=modules,
+        modules=ordered,
+        stats=stats,
+        baseline=baseline,
+        distributions=distributions,
+        host=host,
+    )
+
+
+def iter_scan(
+    project_root: Path,
+    module_targets: list[ModuleTarget],
+    threshold_ms: float = DEFAULT_THRESHOLD_MS,
+    threshold_mb: float = DEFAULT_THRESHOLD_MB,
+    exclusions: list[str] | None = None,
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    jobs: int = 1,
+    pin_cpus: bool = False,
+    executor: str = EXECUTOR_SPAWN,
+    previous_results: dict[str, ModuleResult] | None = None,
+    repeat: int = 1,
+    warmup: int = 0,
+    statistic: str = DEFAULT_STATISTIC,
+    import_tree: bool = False,
+    mode: str = MODE_ISOLATED,
+    preload: list[str] | None = None,
+    memory_method: str = MEMORY_TRACEMALLOC,
+    pyc_mode: str | None = None,
+    timeout_s: float | None = None,
+    max_memory_mb: float | None = None,
+    max_cpu_s: int | None = None,
+    alloc_sites: int = DEFAULT_ALLOC_SITES,
+    alloc_frames: int = 1,
+    profile_over_ms: float | None = None,
+    profile_dir: Path | None = None,
+    zip_import: bool = False,
+    zip_archive: Path | None = None,
+    stable: bool = False,
+    disable_gc: bool = False,
+    order_seed: int | None = None,
+) -> Generator[ModuleResult, None, ScanPayload]:
+    """Scan ``module_targets``, yielding each ``ModuleResult`` as soon as it is final.
+
+    Reused results come first, then measured modules in completion order (all at once at the end
+    in marginal mode, where one interpreter imports everything). The generator's return value is
+    the complete ``ScanPayload`` with modules in discovery order.
+
+    With ``zip_import``, every module is also imported through ``zipimport``, from ``zip_archive``
+    or from a zip of the discovered tree, and its time is kept in ``import_time_zip_ms``.
+
+    ``stable`` pins every worker to its own CPU, scrubs the environment down to what
+    ``build_scan_environment(stable=True)`` keeps, fixes ``PYTHONHASHSEED``, samples modules in
+    rounds of random order (seeded by ``order_seed``) and records the host's state with noise
+    warnings in the payload's ``host``. ``disable_gc`` turns the collector off during timed imports.
+
+    With ``profile_over_ms``, measured modules slower than that are profiled once every module is
+    measured. The returned payload holds copies of their results with ``profile`` set; the results
+    yielded earlier are left untouched and have no ``profile``.
+
+    Arguments are checked when ``iter_scan`` is called, before anything is measured.
+    """
+    if jobs < 1:
+        raise ValueError("jobs must be >= 1")
+    if repeat < 1 or warmup < 0:
+        raise ValueError("repeat must be >= 1 and warmup must be >= 0")
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic: {statistic}. Expected one of: {', '.join(STATISTICS)}")
+    if executor not in EXECUTORS:
+        raise ValueError(f"Unknown executor: {executor}. Expected one of: {', '.join(EXECUTORS)}")
+    if executor == EXECUTOR_FORKSERVER and not fork_server_supported():
+        raise ValueError("The forkserver executor requires os.fork and is not available on this platform.")
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode: {mode}. Expected one of: {', '.join(MODES)}")
+    if memory_method not in MEMORY_METHODS:
+        raise ValueError(f"Unknown memory method: {memory_method}. Expected one of: {', '.join(MEMORY_METHODS)}")
+    if pyc_mode is not None and pyc_mode not in PYC_MODES:
+        raise ValueError(f"Unknown pyc mode: {pyc_mode}. Expected one of: {', '.join(PYC_MODES)}")
+    if any(value is not None and value <= 0 for value in (timeout_s, max_memory_mb, max_cpu_s)):
+        raise ValueError("timeout_s, max_memory_mb and max_cpu_s must be > 0")
+    if alloc_sites < 0 or alloc_frames < 1:
+        raise ValueError("alloc_sites must be >= 0 and alloc_frames must be >= 1")
+    if profile_over_ms is not None and profile_over_ms < 0:
+        raise ValueError("profile_over_ms must be >= 0")
+    if (zip_import or zip_archive is not None) and mode != MODE_ISOLATED:
+        raise ValueError("Zip imports are only measured in isolated mode")
+    if zip_archive is not None:
+        zip_import_root(zip_archive)
+    return _scan(
+        project_root,
+        module_targets,
+        threshold_ms=threshold_ms,
+        threshold_mb=threshold_mb,
+        exclusions=exclusions,
+        python_executable=python_executable,
+        scan_env=scan_env,
+        jobs=jobs,
+        pin_cpus=pin_cpus,
+        executor=executor,
+        previous_results=previous_results,
+        repeat=repeat,
+        warmup=warmup,
+        statistic=statistic,
+        import_tree=import_tree,
+        mode=mode,
+        preload=preload,
+        memory_method=memory_method,
+        pyc_mode=pyc_mode,
+        timeout_s=timeout_s,
+        max_memory_mb=max_memory_mb,
+        max_cpu_s=max_cpu_s,
+        alloc_sites=alloc_sites,
+        alloc_frames=alloc_frames,
+        profile_over_ms=profile_over_ms,
+        profile_dir=profile_dir,
+        zip_import=zip_import,
+        zip_archive=zip_archive,
+        stable=stable,
+        disable_gc=disable_gc,
+        order_seed=order_seed,
+    )
+
+
+def scan_modules(
+    project_root: Path,
+    module_targets: list[ModuleTarget],
+    threshold_ms: float = DEFAULT_THRESHOLD_MS,
+    threshold_mb: float = DEFAULT_THRESHOLD_MB,
+    exclusions: list[str] | None = None,
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    jobs: int = 1,
+    pin_cpus: bool = False,
+    executor: str = EXECUTOR_SPAWN,
+    previous_results: dict[str, ModuleResult] | None = None,
+    repeat: int = 1,
+    warmup: int = 0,
+    statistic: str = DEFAULT_STATISTIC,
+    import_tree: bool = False,
+    mode: str = MODE_ISOLATED,
+    preload: list[str] | None = None,
+    memory_method: str = MEMORY_TRACEMALLOC,
+    pyc_mode: str | None = None,
+    timeout_s: float | None = None,
+    max_memory_mb: float | None = None,
+    max_cpu_s: int | None = None,
+    alloc_sites: int = DEFAULT_ALLOC_SITES,
+    alloc_frames: int = 1,
+    profile_over_ms: float | None = None,
+    profile_dir: Path | None = None,
+    zip_import: bool = False,
+    zip_archive: Path | None = None,
+    stable: bool = False,
+    disable_gc: bool = False,
+    order_seed: int | None = None,
+) -> ScanPayload:
+    """Run ``iter_scan`` to completion and return its payload."""
+    scan = iter_scan(
+        project_root,
+        module_targets,
+        threshold_ms=threshold_ms,
+        threshold_mb=threshold_mb,
+        exclusions=exclusions,
+        python_executable=python_executable,
+        scan_env=scan_env,
+        jobs=jobs,
+        pin_cpus=pin_cpus,
+        executor=executor,
+        previous_results=previous_results,
+        repeat=repeat,
+        warmup=warmup,
+        statistic=statistic,
+        import_tree=import_tree,
+        mode=mode,
+        preload=preload,
+        memory_method=memory_method,
+        pyc_mode=pyc_mode,
+        timeout_s=timeout_s,
+        max_memory_mb=max_memory_mb,
+        max_cpu_s=max_cpu_s,
+        alloc_sites=alloc_sites,
+        alloc_frames=alloc_frames,
+        profile_over_ms=profile_over_ms,
+        profile_dir=profile_dir,
+        zip_import=zip_import,
+        zip_archive=zip_archive,
+        stable=stable,
+        disable_gc=disable_gc,
+        order_seed=order_seed,
     )
+    while True:
+        try:
+            next(scan)
+        except StopIteration as finished:
+            return finished.value
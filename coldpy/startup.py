@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from coldpy.importtree import build_tree
+from coldpy.models import ImportNode
+from coldpy.probe import parse_importtime
+from coldpy.runtime import startup_probe_source
+from coldpy.startup_probe import LAZY_PREFIX, MARKER, READY_MARKER
+from coldpy.stats import percentile
+
+DEFAULT_STARTUP_REPEAT = 10
+DEFAULT_STARTUP_WARMUP = 1
+PHASES = ("total", "init", "site", "app")
+
+
+class StartupError(Exception):
+    pass
+
+
+@dataclass
+class Latency:
+    min: float
+    p50: float
+    p90: float
+    p95: float
+    p99: float
+    max: float
+
+    @classmethod
+    def from_samples(cls, samples: list[float]) -> "Latency":
+        return cls(
+            min=round(min(samples), 3),
+            p50=round(percentile(samples, 50), 3),
+            p90=round(percentile(samples, 90), 3),
+            p95=round(percentile(samples, 95), 3),
+            p99=round(percentile(samples, 99), 3),
+            max=round(max(samples), 3),
+        )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class StartupSample:
+    """One cold start. ``init_ms`` is exec to the entry point minus ``site_ms``."""
+
+    total_ms: float
+    init_ms: float
+    site_ms: float
+    app_ms: float
+    startup_imports: list[dict[str, Any]] = field(default_factory=list)
+    app_imports: list[dict[str, Any]] = field(default_factory=list)
+    lazy: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+@dataclass
+class StartupReport:
+    target: str
+    python: str
+    samples: int
+    total: Latency
+    init: Latency
+    site: Latency
+    app: Latency
+    startup_imports: list[ImportNode] = field(default_factory=list)
+    app_imports: list[ImportNode] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "target": self.target,
+            "python": self.python,
+            "samples": self.samples,
+            **{phase: getattr(self, phase).to_dict() for phase in PHASES},
+            "startup_imports": [node.to_dict() for node in self.startup_imports],
+            "app_imports": [node.to_dict() for node in self.app_imports],
+        }
+
+
+def _cumulative_ms(nodes: list[dict[str, Any]], name: str) -> float:
+    return sum(float(node["cumulative_ms"]) for node in nodes if node["name"] == name)
+
+
+def run_startup_once(
+    project_root: Path,
+    target: str,
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    call: bool = False,
+    timeout_s: float | None = None,
+    lazy: list[str] | None = None,
+) -> StartupSample:
+    """Launch a fresh interpreter that imports ``target`` and time it from exec to ready.
+
+    With ``lazy`` set (even to an empty list) the probe loads those modules through LazyLoader.
+    """
+    executable = str(python_executable or Path(sys.executable))
+    command = [executable, "-X", "importtime", "-c", startup_probe_source(), target]
+    if call:
+        command.append("call")
+    if lazy is not None:
+        command.append(LAZY_PREFIX + ",".join(lazy))
+
+    # time.monotonic is system-wide, so the child's readings are comparable with the parent's.
+    spawned_ns = time.monotonic_ns()
+    try:
+        completed = subprocess.run(
+            command,
+            text=True,
+            capture_output=True,
+            check=False,
+            cwd=str(project_root),
+            env=scan_env,
+            timeout=timeout_s,
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise StartupError(f"{target} was not ready within {timeout_s}s.") from exc
+
+    try:
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+    except (IndexError, json.JSONDecodeError) as exc:
+        detail = completed.stderr.strip().splitlines()[-1:] or ["no output"]
+        raise StartupError(f"Startup probe failed for {target}: {detail[0]}") from exc
+    if result["error"]:
+        raise StartupError(f"Failed to load {target}: {result['error']}")
+
+    stderr = completed.stderr.splitlines()
+    main_line = stderr.index(MARKER) if MARKER in stderr else len(stderr)
+    ready_line = stderr.index(READY_MARKER) if READY_MARKER in stderr else len(stderr)
+    startup_imports = parse_importtime(stderr[:main_line])
+    app_imports = parse_importtime(stderr[main_line + 1 : ready_line])
+
+    site_ms = _cumulative_ms(startup_imports, "site")
+    before_main_ms = (result["started_ns"] - spawned_ns) / 1_000_000
+    return StartupSample(
+        total_ms=(result["ready_ns"] - spawned_ns) / 1_000_000,
+        init_ms=max(before_main_ms - site_ms, 0.0),
+        site_ms=site_ms,
+        app_ms=(result["ready_ns"] - result["started_ns"]) / 1_000_000,
+        startup_imports=startup_imports,
+        app_imports=app_imports,
+        lazy=result.get("lazy", {}),
+    )
+
+
+def measure_startup(
+    project_root: Path,
+    target: str,
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    repeat: int = DEFAULT_STARTUP_REPEAT,
+    warmup: int = DEFAULT_STARTUP_WARMUP,
+    call: bool = False,
+    timeout_s: float | None = None,
+) -> StartupReport:
+    """Cold-start ``target`` (``pkg.mod`` or ``pkg.mod:callable``) ``repeat`` times and summarize each phase."""
+    if repeat < 1 or warmup < 0:
+        raise ValueError("repeat must be >= 1 and warmup must be >= 0")
+    if not target.partition(":")[0]:
+        raise ValueError(f"Invalid entry point: {target!r}. Expected module or module:callable")
+
+    samples: list[StartupSample] = []
+    for run in range(warmup + repeat):
+        sample = run_startup_once(
+            project_root,
+            target,
+            python_executable=python_executable,
+            scan_env=scan_env,
+            call=call,
+            timeout_s=timeout_s,
+        )
+        if run >= warmup:
+            samples.append(sample)
+
+    median_total = statistics.median(sample.total_ms for sample in samples)
+    representative = min(samples, key=lambda sample: abs(sample.total_ms - median_total))
+    return StartupReport(
+        target=target,
+        python=str(python_executable or Path(sys.executable)),
+        samples=len(samples),
+        total=Latency.from_samples([sample.total_ms for sample in samples]),
+        init=Latency.from_samples([sample.init_ms for sample in samples]),
+        site=Latency.from_samples([sample.site_ms for sample in samples]),
+        app=Latency.from_samples([sample.app_ms for sample in samples]),
+        startup_imports=build_tree(representative.startup_imports),
+        app_imports=build_tree(representative.app_imports),
+    )
@@ -0,0 +1,126 @@
+"""Entry-point probe executed inside the target interpreter by ``coldpy startup``.
+
+Everything imported before this code runs belongs to interpreter and ``site`` startup, so it
+must not import anything itself until the target is ready. Like ``probe.py`` it is sent with
+``-c`` and may only use the standard library.
+
+``coldpy whatif`` passes ``lazy=pkg.a,pkg.b`` to load those modules through
+``importlib.util.LazyLoader`` and report the first attribute access that forces each one.
+"""
+
+import sys
+import time
+
+MARKER = "coldpy-startup: main"
+READY_MARKER = "coldpy-startup: ready"
+LAZY_PREFIX = "lazy="
+FORCED_STACK_DEPTH = 8
+
+
+def _caller_stack() -> list[str]:
+    """The frames that forced a lazy load, innermost first, without importlib or this probe."""
+    stack: list[str] = []
+    frame = sys._getframe(2)
+    while frame is not None and len(stack) < FORCED_STACK_DEPTH:
+        filename = frame.f_code.co_filename
+        if filename != "<string>" and not frame.f_globals.get("__name__", "").startswith("importlib"):
+            stack.append(f"{filename}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return stack
+
+
+def install_lazy_finder(names: list[str]) -> dict[str, dict[str, object]]:
+    """Route ``names`` through LazyLoader. The returned dict fills in as modules are deferred and forced."""
+    import importlib.machinery
+    import importlib.util
+
+    lazy_module_type = importlib.util._LazyModule
+    report: dict[str, dict[str, object]] = {}
+
+    class TracingLazyModule(lazy_module_type):
+        def __getattribute__(self, attr):
+            spec = object.__getattribute__(self, "__spec__")
+            report[spec.name].update(status="forced", attribute=attr, stack=_caller_stack())
+            # Hand over to the stock class, which loads the module and swaps in ModuleType.
+            object.__setattr__(self, "__class__", lazy_module_type)
+            return getattr(self, attr)
+
+    class TracingLazyLoader(importlib.util.LazyLoader):
+        def exec_module(self, module):
+            super().exec_module(module)
+            module.__class__ = TracingLazyModule
+
+    class LazyFinder:
+        @staticmethod
+        def find_spec(name, path, target=None):
+            if name not in names:
+                return None
+            for finder in sys.meta_path:
+                find_spec = getattr(finder, "find_spec", None)
+                if finder is LazyFinder or find_spec is None:
+                    continue
+                spec = find_spec(name, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+
+            loader = spec.loader
+            if (
+                loader is None
+                or not hasattr(loader, "exec_module")
+                or spec.origin in ("built-in", "frozen")
+                or isinstance(loader, importlib.machinery.ExtensionFileLoader)
+            ):
+                # Extension and builtin modules do their work in create_module, so deferring buys nothing.
+                report[name] = {"status": "unsupported"}
+                return spec
+            report[name] = {"status": "deferred"}
+            spec.loader = TracingLazyLoader(loader)
+            return spec
+
+    sys.meta_path.insert(0, LazyFinder)
+    return report
+
+
+def main(argv: list[str]) -> None:
+    lazy_report = None
+    for option in argv[1:]:
+        if option.startswith(LAZY_PREFIX):
+            # Installed before the clock starts; whatif runs its baseline with an empty list so both pay for it.
+            lazy_report = install_lazy_finder([name for name in option[len(LAZY_PREFIX) :].split(",") if name])
+
+    started_ns = time.monotonic_ns()
+    # Splits the -X importtime output on stderr into startup imports and application imports.
+    sys.stderr.write(MARKER + "\n")
+    sys.stderr.flush()
+
+    module_name, _, attribute = argv[0].partition(":")
+    call = "call" in argv[1:]
+    error = None
+    try:
+        __import__(module_name)
+        handler = sys.modules[module_name]
+        for part in attribute.split(".") if attribute else []:
+            handler = getattr(handler, part)
+        if call:
+            handler()
+    except BaseException as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    ready_ns = time.monotonic_ns()
+    if lazy_report is not None:
+        # Loads forced after this point (the probe's own json import) happen outside the measured window.
+        lazy_report = {name: dict(entry) for name, entry in lazy_report.items()}
+    sys.stderr.write(READY_MARKER + "\n")
+    sys.stderr.flush()
+
+    import json
+
+    output = {"started_ns": started_ns, "ready_ns": ready_ns, "error": error}
+    if lazy_report is not None:
+        output["lazy"] = lazy_report
+    sys.stdout.write(json.dumps(output) + "\n")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import itertools
+import math
+import statistics
+from statistics import NormalDist
+
+from coldpy.models import SampleStats
+
+STATISTICS = ("min", "median", "mean", "p95")
+DEFAULT_STATISTIC = "median"
+MIN_SAMPLES_FOR_OUTLIERS = 4
+# Up to this many ways of splitting the pooled samples, p-values come from the exact distribution.
+EXACT_MAX_SPLITS = 5000
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        raise ValueError("percentile() requires at least one value")
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[lower]
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def reject_outliers(values: list[float]) -> tuple[list[float], int]:
+    """Drop samples outside Tukey's fences (1.5 * IQR beyond the quartiles)."""
+    if len(values) < MIN_SAMPLES_FOR_OUTLIERS:
+        return list(values), 0
+
+    q1 = percentile(values, 25)
+    q3 = percentile(values, 75)
+    spread = 1.5 * (q3 - q1)
+    kept = [value for value in values if q1 - spread <= value <= q3 + spread]
+    return kept, len(values) - len(kept)
+
+
+def summarize(samples: list[float]) -> SampleStats:
+    kept, outliers = reject_outliers(samples)
+    return SampleStats(
+        samples=[round(sample, 3) for sample in samples],
+        min=round(min(kept), 3),
+        median=round(statistics.median(kept), 3),
+        mean=round(statistics.fmean(kept), 3),
+        p95=round(percentile(kept, 95), 3),
+        stdev=round(statistics.stdev(kept), 3) if len(kept) > 1 else 0.0,
+        outliers=outliers,
+    )
+
+
+def pick(stats: SampleStats, statistic: str) -> float:
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic: {statistic}. Expected one of: {', '.join(STATISTICS)}")
+    return float(getattr(stats, statistic))
+
+
+def _ranks(values: list[float]) -> tuple[list[float], list[int]]:
+    """Average ranks (1-based) of ``values`` and the sizes of every group of ties."""
+    order = sorted(range(len(values)), key=lambda index: values[index])
+    ranks = [0.0] * len(values)
+    ties: list[int] = []
+    start = 0
+    while start < len(order):
+        end = start
+        while end + 1 < len(order) and values[order[end + 1]] == values[order[start]]:
+            end += 1
+        for position in range(start, end + 1):
+            ranks[order[position]] = (start + end) / 2 + 1
+        ties.append(end - start + 1)
+        start = end + 1
+    return ranks, ties
+
+
+def min_p_value(n1: int, n2: int) -> float:
+    """The smallest two-sided p-value ``mann_whitney_u`` can return for these sample sizes."""
+    return min(2 / math.comb(n1 + n2, n1), 1.0)
+
+
+def _exact_p_value(ranks: list[float], n1: int) -> float:
+    """Share of all splits of the pooled ranks whose rank sum is at least as far from its mean."""
+    center = n1 * (len(ranks) + 1) / 2
+    observed = abs(sum(ranks[:n1]) - center)
+    sums = [sum(split) for split in itertools.combinations(ranks, n1)]
+    return sum(1 for total in sums if abs(total - center) >= observed - 1e-9) / len(sums)
+
+
+def mann_whitney_u(first: list[float], second: list[float]) -> float | None:
+    """Two-sided p-value of the Mann-Whitney U test.
+
+    Small samples use the exact distribution of the ranks (ties included); larger ones the
+    normal approximation with tie and continuity correction. Returns None when either side
+    has fewer than two samples, since no test is possible.
+    """
+    n1, n2 = len(first), len(second)
+    if n1 < 2 or n2 < 2:
+        return None
+
+    ranks, ties = _ranks(first + second)
+    n = n1 + n2
+    if math.comb(n, n1) <= EXACT_MAX_SPLITS:
+        return _exact_p_value(ranks, n1)
+    u1 = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+    tie_correction = sum(size**3 - size for size in ties) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_correction))
+    if sigma == 0:
+        return 1.0
+    z = max(abs(u1 - n1 * n2 / 2) - 0.5, 0.0) / sigma
+    return min(2 * (1 - NormalDist().cdf(z)), 1.0)
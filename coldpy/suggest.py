@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import ast
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+from coldpy.discovery import ModuleTarget
+from coldpy.graph import is_package, is_type_checking_test, resolve_relative
+
+
+@dataclass(frozen=True)
+class _Binding:
+    name: str
+    module: str
+    imported: str | None
+    lineno: int
+
+
+@dataclass
+class DeferrableImport:
+    """A module-level import whose bound name is only ever used inside ``functions``."""
+
+    module: str
+    file: str
+    lineno: int
+    imported: str
+    name: str
+    functions: list[str] = field(default_factory=list)
+    cost_ms: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def _module_level_statements(body: list[ast.stmt]) -> Iterator[ast.stmt]:
+    """Statements that run at import time, descending into if/try/with but not TYPE_CHECKING blocks."""
+    for node in body:
+        yield node
+        if isinstance(node, ast.If):
+            if not is_type_checking_test(node.test):
+                yield from _module_level_statements(node.body)
+            yield from _module_level_statements(node.orelse)
+        elif isinstance(node, ast.Try) or (hasattr(ast, "TryStar") and isinstance(node, ast.TryStar)):
+            for block in (node.body, node.orelse, node.finalbody):
+                yield from _module_level_statements(block)
+            for handler in node.handlers:
+                yield from _module_level_statements(handler.body)
+        elif isinstance(node, (ast.With, ast.AsyncWith)):
+            yield from _module_level_statements(node.body)
+
+
+def _bindings(tree: ast.Module, module_name: str, package: bool) -> list[_Binding]:
+    bindings: list[_Binding] = []
+    for node in _module_level_statements(tree.body):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                # ``import a.b`` binds ``a``; the statement still pays for ``a.b``.
+                bound = alias.asname or alias.name.partition(".")[0]
+                bindings.append(_Binding(name=bound, module=alias.name, imported=None, lineno=node.lineno))
+        elif isinstance(node, ast.ImportFrom):
+            if node.module == "__future__":
+                continue
+            base = resolve_relative(module_name, package, node.level, node.module) if node.level else node.module
+            if base is None:
+                continue
+            for alias in node.names:
+                if alias.name == "*":
+                    continue
+                bindings.append(
+                    _Binding(name=alias.asname or alias.name, module=base, imported=alias.name, lineno=node.lineno)
+                )
+    return bindings
+
+
+def _exported_names(tree: ast.Module) -> set[str]:
+    exported: set[str] = set()
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(
+            isinstance(target, ast.Name) and target.id == "__all__" for target in node.targets
+        ):
+            if isinstance(node.value, (ast.List, ast.Tuple)):
+                exported.update(
+                    element.value
+                    for element in node.value.elts
+                    if isinstance(element, ast.Constant) and isinstance(element.value, str)
+                )
+    return exported
+
+
+def _has_future_annotations(tree: ast.Module) -> bool:
+    return any(
+        isinstance(node, ast.ImportFrom)
+        and node.module == "__future__"
+        and any(alias.name == "annotations" for alias in node.names)
+        for node in tree.body
+    )
+
+
+class _UsageCollector(ast.NodeVisitor):
+    """Sorts every name load into import-time uses and uses inside function bodies.
+
+    Decorators, default values, class bodies and (without ``from __future__ import annotations``)
+    signature annotations all run at import time, so they count as module scope.
+    """
+
+    def __init__(self, deferred_annotations: bool) -> None:
+        self.deferred_annotations = deferred_annotations
+        self.module_scope: set[str] = set()
+        self.functions: dict[str, set[str]] = {}
+        self._qualname: list[str] = []
+        self._function_depth = 0
+
+    def _signature(self, args: ast.arguments, returns: ast.expr | None) -> None:
+        for default in [*args.defaults, *args.kw_defaults]:
+            if default is not None:
+                self.visit(default)
+        if self.deferred_annotations:
+            return
+        for arg in [*args.posonlyargs, *args.args, *args.kwonlyargs, args.vararg, args.kwarg]:
+            if arg is not None and arg.annotation is not None:
+                self.visit(arg.annotation)
+        if returns is not None:
+            self.visit(returns)
+
+    def _visit_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef | ast.Lambda) -> None:
+        if isinstance(node, ast.Lambda):
+            self._signature(node.args, None)
+            body: list[ast.AST] = [node.body]
+            name = "<lambda>"
+        else:
+            for decorator in node.decorator_list:
+                self.visit(decorator)
+            self._signature(node.args, node.returns)
+            body = list(node.body)
+            name = node.name
+        self._qualname.append(name)
+        self._function_depth += 1
+        for child in body:
+            self.visit(child)
+        self._function_depth -= 1
+        self._qualname.pop()
+
+    visit_FunctionDef = _visit_function
+    visit_AsyncFunctionDef = _visit_function
+    visit_Lambda = _visit_function
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        for expression in [*node.decorator_list, *node.bases, *(keyword.value for keyword in node.keywords)]:
+            self.visit(expression)
+        self._qualname.append(node.name)
+        for child in node.body:
+            self.visit(child)
+        self._qualname.pop()
+
+    def visit_Name(self, node: ast.Name) -> None:
+        if isinstance(node.ctx, ast.Store):
+            return
+        if self._function_depth:
+            self.functions.setdefault(node.id, set()).add(".".join(self._qualname))
+        else:
+            self.module_scope.add(node.id)
+
+
+def find_deferrable_imports(target: ModuleTarget) -> list[DeferrableImport]:
+    """Module-level imports of ``target`` that are only needed once one of its functions runs."""
+    try:
+        tree = ast.parse(Path(target.file).read_bytes(), filename=str(target.file))
+    except (OSError, SyntaxError, ValueError):
+        return []
+
+    collector = _UsageCollector(_has_future_annotations(tree))
+    collector.visit(tree)
+    exported = _exported_names(tree)
+
+    findings: list[DeferrableImport] = []
+    for binding in _bindings(tree, target.name, is_package(target)):
+        functions = collector.functions.get(binding.name)
+        if not functions or binding.name in collector.module_scope or binding.name in exported:
+            continue
+        findings.append(
+            DeferrableImport(
+                module=target.name,
+                file=str(target.file),
+                lineno=binding.lineno,
+                imported=binding.module if binding.imported is None else f"{binding.module}.{binding.imported}",
+                name=binding.name,
+                functions=sorted(functions),
+            )
+        )
+    return findings
+
+
+def _cost(finding: DeferrableImport, costs: dict[str, float]) -> float | None:
+    # ``from pkg import thing`` costs ``pkg.thing`` when that is a module, otherwise ``pkg`` itself.
+    for candidate in (finding.imported, finding.imported.rpartition(".")[0]):
+        if candidate in costs:
+            return costs[candidate]
+    return None
+
+
+def suggest_deferrals(
+    module_targets: list[ModuleTarget],
+    costs: dict[str, float] | None = None,
+    min_cost_ms: float = 0.0,
+) -> list[DeferrableImport]:
+    """Rank deferrable imports across ``module_targets`` by measured cumulative import cost.
+
+    Without ``costs`` every finding is kept, unranked; with them, findings cheaper than
+    ``min_cost_ms`` or with no measurement at all are dropped.
+    """
+    findings = [finding for target in module_targets for finding in find_deferrable_imports(target)]
+    if costs is None:
+        return findings
+    for finding in findings:
+        finding.cost_ms = _cost(finding, costs)
+    findings = [finding for finding in findings if finding.cost_ms is not None and finding.cost_ms >= min_cost_ms]
+    findings.sort(key=lambda finding: finding.cost_ms or 0.0, reverse=True)
+    return findings
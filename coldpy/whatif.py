@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from coldpy.importtree import build_tree, find_node
+from coldpy.startup import DEFAULT_STARTUP_REPEAT, DEFAULT_STARTUP_WARMUP, Latency, StartupSample, run_startup_once
+from coldpy.stats import mann_whitney_u
+
+
+@dataclass
+class LazyOutcome:
+    """What happened to one ``--lazy`` module during startup.
+
+    ``deferred`` modules were never touched before the entry point was ready, ``forced`` ones were
+    loaded anyway by the first attribute access at ``stack[0]``.
+    """
+
+    name: str
+    status: str
+    baseline_ms: float | None = None
+    attribute: str | None = None
+    stack: list[str] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class WhatIfReport:
+    target: str
+    python: str
+    samples: int
+    lazy: list[str]
+    baseline: Latency
+    projected: Latency
+    savings_ms: float
+    savings_pct: float | None
+    p_value: float | None
+    modules: list[LazyOutcome] = field(default_factory=list)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "target": self.target,
+            "python": self.python,
+            "samples": self.samples,
+            "lazy": self.lazy,
+            "baseline": self.baseline.to_dict(),
+            "projected": self.projected.to_dict(),
+            "savings_ms": self.savings_ms,
+            "savings_pct": self.savings_pct,
+            "p_value": self.p_value,
+            "modules": [module.to_dict() for module in self.modules],
+        }
+
+
+def _outcomes(lazy: list[str], baseline: StartupSample, projected: StartupSample) -> list[LazyOutcome]:
+    baseline_tree = build_tree(baseline.app_imports)
+    outcomes: list[LazyOutcome] = []
+    for name in lazy:
+        node = find_node(baseline_tree, name)
+        entry = projected.lazy.get(name, {"status": "not imported"})
+        outcomes.append(
+            LazyOutcome(
+                name=name,
+                status=str(entry["status"]),
+                baseline_ms=node.cumulative_ms if node is not None else None,
+                attribute=entry.get("attribute"),
+                stack=list(entry.get("stack", [])),
+            )
+        )
+    return outcomes
+
+
+def simulate_lazy(
+    project_root: Path,
+    target: str,
+    lazy: list[str],
+    python_executable: Path | None = None,
+    scan_env: dict[str, str] | None = None,
+    repeat: int = DEFAULT_STARTUP_REPEAT,
+    warmup: int = DEFAULT_STARTUP_WARMUP,
+    call: bool = False,
+    timeout_s: float | None = None,
+) -> WhatIfReport:
+    """Cold-start ``target`` as it is and with ``lazy`` behind LazyLoader, and compare the two.
+
+    The two variants alternate so drift on the machine hits both equally, and both run with the
+    same lazy-import hook installed so only the deferred modules differ between them.
+    """
+    if repeat < 1 or warmup < 0:
+        raise ValueError("repeat must be >= 1 and warmup must be >= 0")
+    if not target.partition(":")[0]:
+        raise ValueError(f"Invalid entry point: {target!r}. Expected module or module:callable")
+    if not lazy:
+        raise ValueError("Name at least one module to load lazily")
+
+    baseline_samples: list[StartupSample] = []
+    projected_samples: list[StartupSample] = []
+    for run in range(warmup + repeat):
+        for variant, samples in (([], baseline_samples), (lazy, projected_samples)):
+            sample = run_startup_once(
+                project_root,
+                target,
+                python_executable=python_executable,
+                scan_env=scan_env,
+                call=call,
+                timeout_s=timeout_s,
+                lazy=variant,
+            )
+            if run >= warmup:
+                samples.append(sample)
+
+    baseline_totals = [sample.total_ms for sample in baseline_samples]
+    projected_totals = [sample.total_ms for sample in projected_samples]
+    baseline = Latency.from_samples(baseline_totals)
+    projected = Latency.from_samples(projected_totals)
+    savings_ms = baseline.p50 - projected.p50
+    p_value = mann_whitney_u(baseline_totals, projected_totals)
+    return WhatIfReport(
+        target=target,
+        python=str(python_executable or Path(sys.executable)),
+        samples=len(baseline_samples),
+        lazy=list(lazy),
+        baseline=baseline,
+        projected=projected,
+        savings_ms=round(savings_ms, 3),
+        savings_pct=round(savings_ms / baseline.p50 * 100, 2) if baseline.p50 > 0 else None,
+        p_value=round(p_value, 4) if p_value is not None else None,
+        modules=_outcomes(lazy, baseline_samples[-1], projected_samples[-1]),
+    )
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import zipfile
+from pathlib import Path
+
+from coldpy.discovery import ModuleTarget
+
+# AWS Lambda puts ``python/`` of every layer on sys.path.
+LAMBDA_LAYER_DIR = "python"
+
+
+def pack_project(project_root: Path, module_targets: list[ModuleTarget], destination: Path) -> Path:
+    """Zip the discovered modules with their relative paths, like a zipapp or deployment artifact.
+
+    Non-Python files inside package directories come along, so package data read at import time
+    is still found. Only sources are packed: ``zipimport`` never writes bytecode, so every import
+    from the archive compiles from source unless the artifact ships legacy ``.pyc`` files.
+    """
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    root = project_root.resolve()
+    files: set[Path] = set()
+    for target in module_targets:
+        source = Path(target.file).resolve()
+        files.add(source)
+        if source.parent == root:
+            continue
+        files.update(
+            path for path in source.parent.iterdir() if path.is_file() and path.suffix not in (".py", ".pyc", ".pyo")
+        )
+    with zipfile.ZipFile(destination, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for path in sorted(files):
+            try:
+                archive.write(path, path.relative_to(root).as_posix())
+            except ValueError:
+                continue
+    return destination
+
+
+def zip_import_root(archive: Path) -> Path:
+    """The ``sys.path`` entry for ``archive``: the archive itself, or its ``python/`` directory
+    when it is laid out as a Lambda layer (nothing importable at the top level)."""
+    try:
+        with zipfile.ZipFile(archive) as handle:
+            names = handle.namelist()
+    except (OSError, zipfile.BadZipFile) as exc:
+        raise ValueError(f"Invalid zip archive: {archive}: {exc}") from exc
+    top_level = {name.split("/", 1)[0] for name in names}
+    importable = any(name.endswith((".py", ".pyc")) for name in top_level) or any(
+        f"{entry}/__init__.py" in names for entry in top_level
+    )
+    if not importable and any(name.startswith(f"{LAMBDA_LAYER_DIR}/") for name in names):
+        return archive / LAMBDA_LAYER_DIR
+    return archive
+
+
+def archive_key(archive: Path) -> str:
+    stat = archive.stat()
+    return f"{archive.resolve()}:{stat.st_size}:{stat.st_mtime_ns}"
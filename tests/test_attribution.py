@@ -0,0 +1,51 @@
+from coldpy.attribution import DistributionIndex, attribute_costs
+from coldpy.models import ImportNode, ModuleResult
+
+
+INDEX = DistributionIndex(
+    owners={"requests": "requests", "urllib3": "urllib3", "google.protobuf": "protobuf"},
+    stdlib={"json", "importlib"},
+    project={"app"},
+)
+
+
+def _node(name: str, self_ms: float, cumulative_ms: float, *children: ImportNode) -> ImportNode:
+    return ImportNode(name=name, self_ms=self_ms, cumulative_ms=cumulative_ms, children=list(children))
+
+
+def _module(name: str, tree: list[ImportNode], memory: dict[str, float] | None = None) -> ModuleResult:
+    return ModuleResult(
+        name=name, file=f"{name}.py", import_time_ms=1.0, memory_mb=None, status="ok", import_tree=tree,
+        memory_by_module=memory,
+    )
+
+
+def test_distribution_index_resolves_owners() -> None:
+    assert INDEX.owner("app.api") == ("project", "project")
+    assert INDEX.owner("json.decoder") == ("stdlib", "stdlib")
+    assert INDEX.owner("google.protobuf.message") == ("protobuf", "third-party")
+    assert INDEX.owner("importlib._bootstrap_external") == ("import system", "import system")
+    assert INDEX.owner("vendored") == ("other", "other")
+
+
+def test_attribute_costs_rolls_trees_up_by_distribution() -> None:
+    requests_tree = _node(
+        "requests",
+        4.0,
+        10.0,
+        _node("requests.api", 1.0, 1.0),
+        _node("urllib3", 3.0, 5.0, _node("json", 2.0, 2.0)),
+    )
+    modules = [
+        _module("app.api", [_node("app.api", 1.0, 11.0, requests_tree)], {"requests": 2.0, "json": 0.5}),
+        _module("app.cli", [_node("app.cli", 0.5, 0.5)], {"json": 0.25}),
+    ]
+
+    costs = {cost.name: cost for cost in attribute_costs(modules, INDEX)}
+
+    assert (costs["requests"].modules, costs["requests"].self_ms, costs["requests"].cumulative_ms) == (2, 5.0, 10.0)
+    assert (costs["urllib3"].self_ms, costs["urllib3"].cumulative_ms) == (3.0, 5.0)
+    assert costs["project"].cumulative_ms == 11.5
+    assert costs["requests"].memory_mb == 2.0
+    assert costs["stdlib"].memory_mb == 0.375
+    assert list(costs)[0] == "project"
@@ -0,0 +1,81 @@
+from pathlib import Path
+
+import pytest
+
+from coldpy.budgets import TOTAL_NAME, evaluate_budgets, parse_budgets
+from coldpy.config import ConfigError, load_tool_config
+from coldpy.models import ModuleResult, ScanPayload, ScanSettings, ScanStats, ScanSummary
+
+
+def _payload(modules: list[ModuleResult], total_ms: float | None = None) -> ScanPayload:
+    return ScanPayload(
+        project_root="/project",
+        settings=ScanSettings(threshold_ms=100, threshold_mb=50, exclusions=[]),
+        summary=ScanSummary(total_modules=len(modules), scanned_modules=len(modules), failed_modules=0),
+        modules=modules,
+        stats=ScanStats(wall_time_ms=1.0, reused_modules=0, total_import_time_ms=total_ms),
+    )
+
+
+def _module(name: str, time_ms: float, memory_mb: float | None = None, status: str = "ok") -> ModuleResult:
+    return ModuleResult(name=name, file=f"/project/{name}.py", import_time_ms=time_ms, memory_mb=memory_mb, status=status)
+
+
+def test_load_tool_config_reads_coldpy_table(tmp_path: Path) -> None:
+    assert load_tool_config(tmp_path) == ({}, None)
+    (tmp_path / "pyproject.toml").write_text(
+        '[tool.coldpy]\ntotal-budget-ms = 500\n\n[tool.coldpy.budgets]\n"app.*" = { max-ms = 50 }\n',
+        encoding="utf-8",
+    )
+    table, source = load_tool_config(tmp_path)
+    assert source == tmp_path / "pyproject.toml"
+    assert table["budgets"] == {"app.*": {"max-ms": 50}}
+
+    (tmp_path / "pyproject.toml").write_text("[tool.coldpy\n", encoding="utf-8")
+    with pytest.raises(ConfigError):
+        load_tool_config(tmp_path)
+
+
+def test_exact_budgets_win_over_globs() -> None:
+    config = parse_budgets(
+        {"budgets": {"app.*": {"max-ms": 50}, "app.api": {"max-ms": 200, "max-mb": 10}, "*": {"max-mb": 100}}}
+    )
+    assert config.budget_for("app.api").pattern == "app.api"
+    assert config.budget_for("app.models").pattern == "app.*"
+    assert config.budget_for("other").pattern == "*"
+
+
+def test_evaluate_budgets_reports_modules_and_total() -> None:
+    config = parse_budgets({"total-budget-ms": 100, "budgets": {"app.*": {"max-ms": 50, "max-mb": 5}}})
+    payload = _payload(
+        [
+            _module("app.api", 80.0, memory_mb=2.0),
+            _module("app.models", 10.0, memory_mb=9.0),
+            _module("app.broken", 500.0, status="error"),
+            _module("other", 500.0),
+        ],
+        total_ms=120.0,
+    )
+
+    violations = evaluate_budgets(payload, config)
+    assert [(violation.module, violation.metric) for violation in violations] == [
+        ("app.api", "time_ms"),
+        ("app.models", "memory_mb"),
+        (TOTAL_NAME, "time_ms"),
+    ]
+    # Without a total (isolated mode) only module budgets apply.
+    assert len(evaluate_budgets(_payload(payload.modules), config)) == 2
+
+
+@pytest.mark.parametrize(
+    "table",
+    [
+        {"budgets": {"app": 50}},
+        {"budgets": {"app": {"max-seconds": 1}}},
+        {"budgets": {"app": {"max-ms": -1}}},
+        {"total-budget-ms": "fast"},
+    ],
+)
+def test_parse_budgets_rejects_invalid_entries(table: dict) -> None:
+    with pytest.raises(ConfigError):
+        parse_budgets(table)
@@ -1,8 +1,11 @@
+import json
+import shutil
 from pathlib import Path
 
 import pytest
 
-from coldpy.cache import CacheError, read_cache, write_cache
+from coldpy.cache import CacheError, load_payload, module_fingerprints, reusable_results
+from coldpy.reporter import write_json_report
 from coldpy.discovery import discover_modules
 from coldpy.scanner import scan_modules
 
@@ -10,18 +13,61 @@ from coldpy.scanner import scan_modules
 FIXTURE = Path(__file__).parent / "fixtures" / "sample_project"
 
 
-def test_write_and_read_cache_round_trip(tmp_path: Path) -> None:
+def test_load_payload_reads_a_json_report(tmp_path: Path) -> None:
     payload = scan_modules(FIXTURE, discover_modules(FIXTURE))
-    written = write_cache(payload, base_dir=tmp_path)
-    assert written.exists()
+    report = tmp_path / "report.json"
+    write_json_report(payload, report)
 
-    loaded = read_cache(base_dir=tmp_path)
-    assert loaded.schema_version == "1.0"
+    loaded = load_payload(report)
+    assert loaded.schema_version == "2.0"
     assert loaded.summary.total_modules == payload.summary.total_modules
 
 
-def test_read_cache_missing_raises(tmp_path: Path) -> None:
-    with pytest.raises(CacheError) as exc:
-        read_cache(base_dir=tmp_path)
+def test_load_payload_rejects_invalid_json(tmp_path: Path) -> None:
+    report = tmp_path / "report.json"
+    report.write_text("{", encoding="utf-8")
+    with pytest.raises(CacheError, match="not valid JSON"):
+        load_payload(report)
 
-    assert "Run `coldpy scan <path>` first" in str(exc.value)
+
+def test_load_payload_rejects_a_newer_schema(tmp_path: Path) -> None:
+    report = tmp_path / "report.json"
+    report.write_text(json.dumps({"schema_version": "99.0", "settings": {"future": True}}), encoding="utf-8")
+    with pytest.raises(CacheError, match="upgrade ColdPy"):
+        load_payload(report)
+
+
+def _copy_fixture(tmp_path: Path) -> Path:
+    project = tmp_path / "project"
+    shutil.copytree(FIXTURE, project)
+    return project
+
+
+def test_module_fingerprints_follow_in_project_imports(tmp_path: Path) -> None:
+    project = _copy_fixture(tmp_path)
+    (project / "pkg" / "uses_fast.py").write_text("from . import fast\n", encoding="utf-8")
+    targets = discover_modules(project)
+    before = module_fingerprints(targets)
+
+    (project / "pkg" / "fast.py").write_text("VALUE = 2\n", encoding="utf-8")
+    after = module_fingerprints(targets)
+
+    assert before["pkg.fast"] != after["pkg.fast"]
+    assert before["pkg.uses_fast"] != after["pkg.uses_fast"]
+    assert before["pkg.slowish"] == after["pkg.slowish"]
+
+
+def test_module_fingerprints_change_with_environment() -> None:
+    targets = discover_modules(FIXTURE)
+    base = module_fingerprints(targets, scan_env={"A": "1"})
+    changed = module_fingerprints(targets, scan_env={"A": "2"})
+    volatile = module_fingerprints(targets, scan_env={"A": "1", "PWD": "/elsewhere"})
+
+    assert base["pkg.fast"] != changed["pkg.fast"]
+    assert base == volatile
+
+
+def test_reusable_results_ignores_other_projects(tmp_path: Path) -> None:
+    payload = scan_modules(FIXTURE, discover_modules(FIXTURE))
+    assert set(reusable_results(payload, FIXTURE)) == {module.name for module in payload.modules}
+    assert reusable_results(payload, tmp_path) == {}
@@ -1,3 +1,6 @@
+import json
+import shutil
+import sys
 from pathlib import Path
 
 from typer.testing import CliRunner
@@ -22,10 +25,27 @@ def test_scan_command_writes_json_and_cache(tmp_path: Path) -> None:
         assert "ColdPy Scan Report" in result.stdout
         assert json_output.exists()
         data = json_output.read_text(encoding="utf-8")
-        assert "\"schema_version\": \"1.0\"" in data
+        assert "\"schema_version\": \"2.0\"" in data
         assert "\"exclusions\"" in data
 
 
+def test_scan_command_compares_several_interpreters(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        result = runner.invoke(
+            app,
+            ["scan", str(FIXTURE), "--python", sys.executable, "--python", sys.executable, "--json", "matrix.json"],
+            catch_exceptions=False,
+        )
+
+        assert result.exit_code == 0
+        assert "ColdPy Interpreter Matrix" in result.stdout
+        data = json.loads(Path("matrix.json").read_text(encoding="utf-8"))
+        assert len(data["interpreters"]) == 2
+        for entry in data["interpreters"].values():
+            assert entry["python"] == sys.executable
+            assert entry["scan"]["summary"]["scanned_modules"] >= 2
+
+
 def test_scan_command_supports_exclude_patterns(tmp_path: Path) -> None:
     with runner.isolated_filesystem(temp_dir=tmp_path):
         result = runner.invoke(
@@ -34,7 +54,7 @@ def test_scan_command_supports_exclude_patterns(tmp_path: Path) -> None:
             catch_exceptions=False,
         )
         assert result.exit_code == 0
-        assert "Excluded modules/files:" in result.stdout
+        assert "Excluded files/directories:" in result.stdout
 
 
 def test_top_requires_cache(tmp_path: Path) -> None:
@@ -52,3 +72,207 @@ def test_top_reads_cache_and_sorts(tmp_path: Path) -> None:
         top_result = runner.invoke(app, ["top", "2", "--sort", "memory", "--threshold-ms", "0", "--threshold-mb", "0"], catch_exceptions=False)
         assert top_result.exit_code == 0
         assert "ColdPy Top Imports" in top_result.stdout
+
+
+def test_top_ranks_by_requested_statistic(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        scan_result = runner.invoke(app, ["scan", str(FIXTURE), "--repeat", "2"], catch_exceptions=False)
+        assert scan_result.exit_code == 0
+
+        top_result = runner.invoke(
+            app,
+            ["top", "3", "--statistic", "p95", "--threshold-ms", "0", "--threshold-mb", "0"],
+            catch_exceptions=False,
+        )
+        assert top_result.exit_code == 0
+        assert "Stdev (ms)" in top_result.stdout
+
+
+def test_top_ranks_by_self_time_from_import_trees(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        no_tree = runner.invoke(app, ["scan", str(FIXTURE)], catch_exceptions=False)
+        assert no_tree.exit_code == 0
+        missing = runner.invoke(app, ["top", "--sort", "self"], catch_exceptions=False)
+        assert missing.exit_code == 1
+        assert "--import-tree" in missing.stdout
+
+        scan_result = runner.invoke(app, ["scan", str(FIXTURE), "--import-tree"], catch_exceptions=False)
+        assert scan_result.exit_code == 0
+        top_result = runner.invoke(app, ["top", "5", "--sort", "self", "--threshold-ms", "0"], catch_exceptions=False)
+        assert top_result.exit_code == 0
+        assert "Self (ms)" in top_result.stdout
+        assert "pkg.slowish" in top_result.stdout
+
+
+def test_scan_streams_jsonl_and_resumes(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        jsonl_output = Path("results.jsonl")
+        first = runner.invoke(app, ["scan", str(FIXTURE), "--no-cache", "--jsonl", str(jsonl_output)], catch_exceptions=False)
+        assert first.exit_code == 0
+        lines = jsonl_output.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 5
+
+        # Simulate a scan interrupted after two modules, with the last line cut short.
+        jsonl_output.write_text("\n".join(lines[:2]) + "\n" + lines[2][:20], encoding="utf-8")
+        resumed = runner.invoke(
+            app,
+            ["scan", str(FIXTURE), "--no-cache", "--jsonl", str(jsonl_output), "--resume"],
+            catch_exceptions=False,
+        )
+        assert resumed.exit_code == 0
+        assert "Reused unchanged modules from cache: 2" in resumed.stdout
+        names = [json.loads(line)["name"] for line in jsonl_output.read_text(encoding="utf-8").splitlines()]
+        assert sorted(names) == sorted(json.loads(line)["name"] for line in lines)
+
+
+def test_scan_resume_drops_stale_jsonl_lines(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    shutil.copytree(FIXTURE, project)
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        jsonl_output = Path("results.jsonl")
+        first = runner.invoke(app, ["scan", str(project), "--no-cache", "--jsonl", str(jsonl_output)], catch_exceptions=False)
+        assert first.exit_code == 0
+
+        (project / "pkg" / "fast.py").write_text("VALUE = 2\n", encoding="utf-8")
+        resumed = runner.invoke(
+            app,
+            ["scan", str(project), "--no-cache", "--jsonl", str(jsonl_output), "--resume"],
+            catch_exceptions=False,
+        )
+        assert resumed.exit_code == 0
+        names = [json.loads(line)["name"] for line in jsonl_output.read_text(encoding="utf-8").splitlines()]
+        assert sorted(names) == sorted(set(names))
+        assert len(names) == 5
+
+
+def test_scan_resume_requires_jsonl(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        result = runner.invoke(app, ["scan", str(FIXTURE), "--resume"])
+        assert result.exit_code != 0
+
+
+def test_history_and_export_read_recorded_runs(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        for _ in range(2):
+            assert runner.invoke(app, ["scan", str(FIXTURE)], catch_exceptions=False).exit_code == 0
+
+        runs = runner.invoke(app, ["history"], catch_exceptions=False)
+        assert runs.exit_code == 0
+        assert "ColdPy Scan History" in runs.stdout
+
+        trend = runner.invoke(app, ["history", "pkg.fast", "--metric", "time_median"], catch_exceptions=False)
+        assert trend.exit_code == 0
+        assert "pkg.fast: time_median" in trend.stdout
+
+        exported = runner.invoke(app, ["export", "--run", "1"], catch_exceptions=False)
+        assert exported.exit_code == 0
+        assert json.loads(exported.stdout)["summary"]["total_modules"] == 5
+
+
+def test_diff_exits_with_regression_code(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        assert runner.invoke(app, ["scan", str(FIXTURE), "--json", "base.json"], catch_exceptions=False).exit_code == 0
+        report = json.loads(Path("base.json").read_text(encoding="utf-8"))
+        for module in report["modules"]:
+            if module["name"] == "pkg.fast":
+                module["import_time_ms"] += 100.0
+                module["time_stats"] = None
+        Path("head.json").write_text(json.dumps(report), encoding="utf-8")
+
+        clean = runner.invoke(app, ["diff", "base.json", "base.json"], catch_exceptions=False)
+        assert clean.exit_code == 0
+        assert "No significant regressions." in clean.stdout
+
+        regressed = runner.invoke(app, ["diff", "base.json", "head.json", "--json", "diff.json"], catch_exceptions=False)
+        assert regressed.exit_code == 3
+        assert json.loads(Path("diff.json").read_text(encoding="utf-8"))["regressions"] == ["pkg.fast"]
+
+
+def test_diff_fails_on_a_large_jump_between_three_sample_scans(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        scan = runner.invoke(app, ["scan", str(FIXTURE), "--repeat", "3", "--json", "base.json"], catch_exceptions=False)
+        assert scan.exit_code == 0
+        report = json.loads(Path("base.json").read_text(encoding="utf-8"))
+        for module in report["modules"]:
+            if module["name"] == "pkg.fast":
+                module["import_time_ms"] += 100.0
+                module["time_stats"]["samples"] = [sample + 100.0 for sample in module["time_stats"]["samples"]]
+        Path("head.json").write_text(json.dumps(report), encoding="utf-8")
+
+        result = runner.invoke(app, ["diff", "base.json", "head.json"], catch_exceptions=False)
+        assert result.exit_code == 3
+
+
+def test_startup_command_reports_phases(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        result = runner.invoke(
+            app,
+            ["startup", str(FIXTURE), "-m", "pkg.fast:VALUE", "--repeat", "2", "--json", "startup.json"],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+        assert "ColdPy Startup" in result.stdout
+        assert set(json.loads(Path("startup.json").read_text(encoding="utf-8"))["total"]) == {
+            "min", "p50", "p90", "p95", "p99", "max"
+        }
+
+
+def test_whatif_command_reports_lazy_modules(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        result = runner.invoke(
+            app,
+            ["whatif", "pkg.slowish", str(FIXTURE), "--lazy", "pkg.slowish", "--repeat", "1", "--json", "whatif.json"],
+            catch_exceptions=False,
+        )
+        assert result.exit_code == 0
+        assert "ColdPy What-If" in result.stdout
+        assert json.loads(Path("whatif.json").read_text(encoding="utf-8"))["modules"][0]["status"] == "deferred"
+
+
+def test_suggest_command_ranks_measured_imports(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "slow.py").write_text("import time\n\ntime.sleep(0.02)\n", encoding="utf-8")
+    (project / "cli.py").write_text("import slow\n\n\ndef main():\n    return slow\n", encoding="utf-8")
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        runner.invoke(app, ["scan", str(project)], catch_exceptions=False)
+        result = runner.invoke(app, ["suggest", str(project), "--json", "suggest.json"], catch_exceptions=False)
+
+        assert result.exit_code == 0
+        assert "ColdPy Deferrable Imports" in result.stdout
+        findings = json.loads(Path("suggest.json").read_text(encoding="utf-8"))
+        assert [(finding["module"], finding["imported"], finding["functions"]) for finding in findings] == [
+            ("cli", "slow", ["main"])
+        ]
+
+
+def test_top_by_dist_needs_import_trees(tmp_path: Path) -> None:
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        runner.invoke(app, ["scan", str(FIXTURE)], catch_exceptions=False)
+        missing = runner.invoke(app, ["top", "--by", "dist"], catch_exceptions=False)
+        assert missing.exit_code == 1
+
+        runner.invoke(app, ["scan", str(FIXTURE), "--import-tree"], catch_exceptions=False)
+        result = runner.invoke(app, ["top", "--by", "dist"], catch_exceptions=False)
+        assert result.exit_code == 0
+        assert "ColdPy Top Distributions" in result.stdout
+        assert "project" in result.stdout
+
+
+def test_scan_enforces_pyproject_budgets(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    shutil.copytree(FIXTURE, project)
+    pyproject = project / "pyproject.toml"
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        pyproject.write_text('[tool.coldpy.budgets]\n"pkg.*" = { max-ms = 10000 }\n', encoding="utf-8")
+        within = runner.invoke(app, ["scan", str(project), "--no-cache"], catch_exceptions=False)
+        assert within.exit_code == 0
+        assert "All import budgets met." in within.stdout
+
+        pyproject.write_text('[tool.coldpy.budgets]\n"pkg.slowish" = { max-ms = 1 }\n', encoding="utf-8")
+        over = runner.invoke(app, ["scan", str(project), "--no-cache"], catch_exceptions=False)
+        assert over.exit_code == 4
+        assert "ColdPy Budget Violations" in over.stdout
+
+        ignored = runner.invoke(app, ["scan", str(project), "--no-cache", "--no-budgets"], catch_exceptions=False)
+        assert ignored.exit_code == 0
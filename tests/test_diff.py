@@ -0,0 +1,80 @@
+from coldpy.diff import DiffLimits, diff_payloads
+from coldpy.models import ModuleResult, ScanPayload, ScanSettings, ScanSummary
+from coldpy.stats import summarize
+
+
+def _module(name: str, times: list[float], status: str = "ok") -> ModuleResult:
+    stats = summarize(times) if status == "ok" else None
+    return ModuleResult(
+        name=name,
+        file=f"/project/{name}.py",
+        import_time_ms=stats.median if stats is not None else None,
+        memory_mb=1.0 if status == "ok" else None,
+        status=status,
+        time_stats=stats,
+    )
+
+
+def _payload(*modules: ModuleResult) -> ScanPayload:
+    return ScanPayload(
+        project_root="/project",
+        settings=ScanSettings(threshold_ms=100, threshold_mb=50, exclusions=[]),
+        summary=ScanSummary(total_modules=len(modules), scanned_modules=len(modules), failed_modules=0),
+        modules=list(modules),
+    )
+
+
+def test_diff_flags_significant_regressions_only() -> None:
+    base = _payload(
+        _module("slow", [10.0, 10.5, 9.8, 10.2, 10.1]),
+        _module("noisy", [10.0, 30.0, 12.0, 28.0, 11.0]),
+        _module("tiny", [0.1, 0.1, 0.1, 0.1, 0.1]),
+    )
+    head = _payload(
+        _module("slow", [30.0, 31.0, 29.5, 30.2, 30.8]),
+        _module("noisy", [29.0, 11.0, 31.0, 10.5, 27.0]),
+        _module("tiny", [0.3, 0.3, 0.3, 0.3, 0.3]),
+    )
+
+    result = diff_payloads(base, head)
+    by_name = {module.name: module for module in result.changed}
+
+    assert [module.name for module in result.regressions] == ["slow"]
+    assert by_name["slow"].time.p_value < 0.05
+    assert by_name["noisy"].time.regression is False
+    # +200% but only 0.2 ms: under the absolute limit.
+    assert by_name["tiny"].time.regression is False
+    assert result.failed
+
+
+def test_diff_reports_added_removed_and_newly_failing_modules() -> None:
+    base = _payload(_module("kept", [1.0]), _module("gone", [1.0]), _module("breaks", [1.0]))
+    head = _payload(_module("kept", [1.0]), _module("new", [1.0]), _module("breaks", [1.0], status="error"))
+
+    result = diff_payloads(base, head, DiffLimits(max_increase_ms=0.0))
+
+    assert result.added == ["new"]
+    assert result.removed == ["gone"]
+    assert result.newly_failing == ["breaks"]
+    assert result.regressions == []
+    assert result.failed
+
+
+def test_diff_without_repeats_uses_limits_alone() -> None:
+    base = _payload(_module("single", [10.0]))
+    head = _payload(_module("single", [20.0]))
+
+    result = diff_payloads(base, head)
+
+    assert result.changed[0].time.p_value is None
+    assert result.changed[0].time.regression
+
+
+def test_diff_with_too_few_repeats_for_the_test_uses_limits_alone() -> None:
+    base = _payload(_module("jumped", [10.0, 10.1, 10.2]), _module("steady", [10.0, 10.1, 10.2]))
+    head = _payload(_module("jumped", [100.0, 101.0, 102.0]), _module("steady", [10.1, 10.2, 10.3]))
+
+    result = diff_payloads(base, head)
+
+    assert [module.name for module in result.regressions] == ["jumped"]
+    assert result.changed[0].time.p_value == 0.1
@@ -36,3 +36,61 @@ def test_discovery_invalid_path_raises() -> None:
         assert "Invalid scan path" in str(exc)
     else:
         raise AssertionError("Expected ValueError for invalid path")
+
+
+def _write(root: Path, relative: str, text: str = "") -> None:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_discovery_prunes_excluded_directories(tmp_path: Path) -> None:
+    for relative in ("app/core.py", "node_modules/pkg/gen.py", ".venv/lib/site.py", "build/lib/app/core.py"):
+        _write(tmp_path, relative)
+
+    modules, excluded = discover_modules(tmp_path, return_excluded_count=True)
+
+    assert [module.name for module in modules] == ["app.core"]
+    assert excluded == 3
+
+
+def test_discovery_honors_gitignore(tmp_path: Path) -> None:
+    _write(tmp_path, ".gitignore", "# generated code\n/generated/\n*_pb2.py\ndocs/**/conf.py\n")
+    _write(tmp_path, "app/.gitignore", "local_*.py\n!local_keep.py\n")
+    for relative in (
+        "app/api.py",
+        "app/api_pb2.py",
+        "app/local_settings.py",
+        "app/local_keep.py",
+        "generated/models.py",
+        "docs/source/conf.py",
+        "docs/source/ext.py",
+    ):
+        _write(tmp_path, relative)
+
+    names = [module.name for module in discover_modules(tmp_path)]
+    assert names == ["app.api", "app.local_keep", "docs.source.ext"]
+
+    unfiltered = [module.name for module in discover_modules(tmp_path, respect_gitignore=False)]
+    assert "generated.models" in unfiltered
+    assert "app.api_pb2" in unfiltered
+
+
+def test_discovery_is_ordered(tmp_path: Path) -> None:
+    for relative in ("b/x.py", "a/z/__init__.py", "a/y.py", "a.py", "c/d/e.py"):
+        _write(tmp_path, relative)
+
+    names = [module.name for module in discover_modules(tmp_path)]
+
+    assert names == ["a.y", "a.z", "a", "b.x", "c.d.e"]
+
+
+def test_discovery_applies_gitignore_files_above_the_scan_path(tmp_path: Path) -> None:
+    (tmp_path / ".git").mkdir()
+    (tmp_path / ".gitignore").write_text("/src/generated/\n*_pb2.py\n", encoding="utf-8")
+    for relative in ("src/app/api.py", "src/app/api_pb2.py", "src/generated/models.py"):
+        _write(tmp_path, relative)
+
+    names = [module.name for module in discover_modules(tmp_path / "src")]
+
+    assert names == ["app.api"]
@@ -0,0 +1,119 @@
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from coldpy import graph as graph_module
+from coldpy.cli import app
+from coldpy.discovery import discover_modules
+from coldpy.graph import build_import_graph, import_order, parse_modules, strongly_connected_components
+
+
+runner = CliRunner()
+
+
+def _write_project(root: Path) -> Path:
+    package = root / "app"
+    package.mkdir(parents=True)
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "a.py").write_text("from . import b\nimport json\n", encoding="utf-8")
+    (package / "b.py").write_text("from app import a\n", encoding="utf-8")
+    (package / "c.py").write_text(
+        "from typing import TYPE_CHECKING\n"
+        "if TYPE_CHECKING:\n"
+        "    from app.a import thing\n"
+        "def run():\n"
+        "    from .b import other\n"
+        "    return other\n",
+        encoding="utf-8",
+    )
+    return root
+
+
+def test_build_import_graph_marks_deferred_imports_and_cycles(tmp_path: Path) -> None:
+    project = _write_project(tmp_path)
+    graph = build_import_graph(parse_modules(discover_modules(project)))
+    edges = {(edge.source, edge.target): edge for edge in graph.edges}
+
+    assert edges[("app.a", "app.b")].runtime
+    assert edges[("app.b", "app.a")].runtime
+    assert edges[("app.c", "app.a")].type_checking
+    assert edges[("app.c", "app.b")].in_function
+    assert graph.external["app.a"] == ["json"]
+    assert graph.cycles() == [["app.a", "app.b"]]
+
+
+def test_parse_modules_reuses_cache_by_content_hash(tmp_path: Path) -> None:
+    project = _write_project(tmp_path)
+    targets = discover_modules(project)
+    first = parse_modules(targets)
+    cached = {parsed.file: parsed for parsed in first}
+
+    (project / "app" / "a.py").write_text("import os\n", encoding="utf-8")
+    second = {parsed.name: parsed for parsed in parse_modules(targets, cached=cached)}
+
+    assert second["app.b"] is cached[str(project / "app" / "b.py")]
+    assert [ref.module for ref in second["app.a"].imports] == ["os"]
+
+
+def test_parse_modules_in_parallel_matches_serial(tmp_path: Path, monkeypatch) -> None:
+    project = _write_project(tmp_path)
+    targets = discover_modules(project)
+    monkeypatch.setattr(graph_module, "PARALLEL_PARSE_THRESHOLD", 1)
+
+    assert [parsed.to_dict() for parsed in parse_modules(targets, jobs=2)] == [
+        parsed.to_dict() for parsed in parse_modules(targets)
+    ]
+
+
+def test_strongly_connected_components_groups_cycles() -> None:
+    components = strongly_connected_components({"a": {"b"}, "b": {"c"}, "c": {"a"}, "d": {"a"}})
+    assert ["a", "b", "c"] in components
+    assert ["d"] in components
+
+
+def test_to_dot_colors_only_edges_within_one_cycle(tmp_path: Path) -> None:
+    package = tmp_path / "app"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    # Two separate cycles (a <-> b, c <-> d) joined by an edge b -> c that is in neither.
+    (package / "a.py").write_text("from app import b\n", encoding="utf-8")
+    (package / "b.py").write_text("from app import a\nfrom app import c\n", encoding="utf-8")
+    (package / "c.py").write_text("from app import d\n", encoding="utf-8")
+    (package / "d.py").write_text("from app import c\n", encoding="utf-8")
+    dot = build_import_graph(parse_modules(discover_modules(tmp_path))).to_dot()
+
+    assert '"app.a" -> "app.b" [color=red];' in dot
+    assert '"app.c" -> "app.d" [color=red];' in dot
+    assert '"app.b" -> "app.c";' in dot
+
+
+def test_graph_command_exports_json_and_dot(tmp_path: Path) -> None:
+    project = _write_project(tmp_path / "project")
+    with runner.isolated_filesystem(temp_dir=tmp_path):
+        json_result = runner.invoke(
+            app, ["graph", str(project), "--format", "json", "-o", "graph.json"], catch_exceptions=False
+        )
+        assert json_result.exit_code == 0
+        assert "Circular import groups: 1" in json_result.stdout
+        data = json.loads(Path("graph.json").read_text(encoding="utf-8"))
+        assert data["cycles"] == [["app.a", "app.b"]]
+        assert Path(".coldpy/ast_cache.json").exists()
+
+        dot_result = runner.invoke(app, ["graph", str(project)], catch_exceptions=False)
+        assert dot_result.exit_code == 0
+        assert dot_result.stdout.startswith("digraph coldpy {")
+        assert '"app.c" -> "app.b" [style=dashed];' in dot_result.stdout
+
+
+def test_import_order_puts_dependencies_first(tmp_path: Path) -> None:
+    package = tmp_path / "svc"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "api.py").write_text("from svc import models\n", encoding="utf-8")
+    (package / "models.py").write_text("from svc import db\n", encoding="utf-8")
+    (package / "db.py").write_text("", encoding="utf-8")
+
+    order = import_order(build_import_graph(parse_modules(discover_modules(tmp_path))))
+
+    assert order.index("svc") < order.index("svc.db") < order.index("svc.models") < order.index("svc.api")
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pytest
+
+from coldpy.discovery import discover_modules
+from coldpy.history import HistoryError, HistoryStore, history_path
+from coldpy.models import ImportNode, ModuleResult, SampleStats, ScanPayload, ScanSettings, ScanSummary
+from coldpy.scanner import scan_modules
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_project"
+
+
+def _payload(times: dict[str, float]) -> ScanPayload:
+    modules = [
+        ModuleResult(
+            name=name,
+            file=f"/project/{name}.py",
+            import_time_ms=value,
+            memory_mb=value / 10,
+            status="ok",
+            fingerprint=f"fp-{name}",
+            time_stats=SampleStats([value, value * 2], value, value * 1.5, value * 1.5, value * 2, 1.0, 0),
+            import_tree=[ImportNode(name, value / 2, value, [ImportNode("json", value / 4, value / 4, [])])],
+        )
+        for name, value in times.items()
+    ]
+    return ScanPayload(
+        project_root="/project",
+        settings=ScanSettings(threshold_ms=100, threshold_mb=50, exclusions=[]),
+        summary=ScanSummary(total_modules=len(modules), scanned_modules=len(modules), failed_modules=0),
+        modules=modules,
+    )
+
+
+def test_history_round_trips_a_scan_payload(tmp_path: Path) -> None:
+    payload = scan_modules(FIXTURE, discover_modules(FIXTURE))
+    with HistoryStore.open(base_dir=tmp_path) as store:
+        run_id = store.record_run(payload, git_commit="abc123", python="/usr/bin/python3")
+        loaded = store.load_payload(run_id)
+
+    assert history_path(tmp_path).exists()
+    assert loaded.to_dict() == payload.to_dict()
+
+
+def test_history_ranks_modules_by_metric_and_statistic(tmp_path: Path) -> None:
+    with HistoryStore.open(base_dir=tmp_path) as store:
+        run_id = store.record_run(_payload({"a": 5.0, "b": 50.0, "c": 20.0}))
+
+        by_time = store.top_modules(run_id, sort_by="time", limit=2)
+        by_p95 = store.top_modules(run_id, sort_by="time", statistic="p95", threshold_ms=30.0, threshold_mb=100.0)
+
+    assert [module.name for module in by_time] == ["b", "c"]
+    assert [(module.name, module.import_time_ms) for module in by_p95] == [("b", 100.0), ("c", 40.0)]
+
+
+def test_history_tracks_module_trend_and_import_costs(tmp_path: Path) -> None:
+    with HistoryStore.open(base_dir=tmp_path) as store:
+        store.record_run(_payload({"a": 10.0, "b": 30.0}), git_commit="1111111")
+        latest = store.record_run(_payload({"a": 12.0, "b": 30.0}), git_commit="2222222")
+
+        trend = store.module_history("a")
+        costs = store.top_import_costs(latest)
+
+        assert store.resolve_run("1111") == latest - 1
+        assert store.resolve_run("latest") == latest
+
+    assert [(point.run.git_commit, point.value) for point in trend] == [("2222222", 12.0), ("1111111", 10.0)]
+    json_cost = next(cost for cost in costs if cost.name == "json")
+    assert json_cost.imported_by == 2
+    assert json_cost.self_ms == pytest.approx((3.0 + 7.5) / 2)
+
+
+def test_history_requires_a_recorded_scan(tmp_path: Path) -> None:
+    with pytest.raises(HistoryError, match="Run `coldpy scan <path>` first"):
+        HistoryStore.open(base_dir=tmp_path, create=False)
+
+
+def test_history_latest_run_per_interpreter(tmp_path: Path) -> None:
+    with HistoryStore.open(base_dir=tmp_path) as store:
+        older = store.record_run(_payload({"a": 1.0}), python="/usr/bin/python3.10")
+        newer = store.record_run(_payload({"a": 2.0}), python="/usr/bin/python3.12")
+        assert store.latest_run_id(Path("/project")) == newer
+        assert store.latest_run_id(Path("/project"), python="/usr/bin/python3.10") == older
+        with pytest.raises(HistoryError):
+            store.latest_run_id(Path("/project"), python="/usr/bin/python3.13")
@@ -0,0 +1,34 @@
+from coldpy.hostinfo import noise_warnings
+from coldpy.models import HostInfo, ModuleResult
+from coldpy.stats import summarize
+
+
+def _host(**overrides) -> HostInfo:
+    values = {"platform": "Linux", "cpu_count": 4, "load_before": [0.1, 0.1, 0.1], "governor": "performance"}
+    values.update(overrides)
+    return HostInfo(**values)
+
+
+def _module(samples: list[float]) -> ModuleResult:
+    stats = summarize(samples)
+    return ModuleResult(
+        name="pkg.mod", file="pkg/mod.py", import_time_ms=stats.median, memory_mb=0.1, status="ok", time_stats=stats
+    )
+
+
+def test_noise_warnings_quiet_host() -> None:
+    assert noise_warnings(_host(boost=False), [_module([10.0, 10.1, 9.9])]) == []
+
+
+def test_noise_warnings_flag_load_governor_boost_and_spread() -> None:
+    host = _host(load_before=[6.0, 4.0, 2.0], governor="powersave", boost=True)
+    warnings = noise_warnings(host, [_module([10.0, 20.0, 5.0])])
+    assert len(warnings) == 4
+    assert "6.00 on 4 CPUs" in warnings[0]
+    assert "'powersave'" in warnings[1]
+    assert "turbo" in warnings[2]
+    assert "vary" in warnings[3]
+
+
+def test_noise_warnings_ignore_spread_of_too_few_samples() -> None:
+    assert noise_warnings(_host(), [_module([10.0, 20.0])]) == []
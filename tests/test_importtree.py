@@ -0,0 +1,45 @@
+from coldpy.importtree import aggregate_import_costs, build_tree, find_node
+from coldpy.models import ModuleResult
+from coldpy.probe import parse_importtime
+
+
+IMPORTTIME_OUTPUT = [
+    "import time: self [us] | cumulative | imported package\n",
+    "import time:       100 |        100 |     numpy.core\n",
+    "import time:       400 |        500 |   numpy\n",
+    "import time:        50 |         50 |   json\n",
+    "import time:       200 |        750 | pkg.api\n",
+]
+
+
+def _module(name: str, raw_tree: list[dict[str, object]]) -> ModuleResult:
+    return ModuleResult(
+        name=name,
+        file=f"/{name}.py",
+        import_time_ms=1.0,
+        memory_mb=0.1,
+        status="ok",
+        import_tree=build_tree(raw_tree),
+    )
+
+
+def test_parse_importtime_builds_nested_tree() -> None:
+    tree = build_tree(parse_importtime(IMPORTTIME_OUTPUT))
+
+    assert [node.name for node in tree] == ["pkg.api"]
+    api = tree[0]
+    assert api.self_ms == 0.2
+    assert api.cumulative_ms == 0.75
+    assert [child.name for child in api.children] == ["numpy", "json"]
+    numpy = find_node(tree, "numpy")
+    assert numpy is not None
+    assert [child.name for child in numpy.children] == ["numpy.core"]
+
+
+def test_aggregate_import_costs_counts_importers() -> None:
+    raw = parse_importtime(IMPORTTIME_OUTPUT)
+    costs = {cost.name: cost for cost in aggregate_import_costs([_module("a", raw), _module("b", raw)])}
+
+    assert costs["numpy"].self_ms == 0.4
+    assert costs["numpy"].cumulative_ms == 0.5
+    assert costs["numpy"].imported_by == 2
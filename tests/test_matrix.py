@@ -0,0 +1,104 @@
+import sys
+import threading
+import time
+from pathlib import Path
+
+from coldpy import matrix as matrix_module
+from coldpy.discovery import discover_modules
+from coldpy.matrix import comparable_totals, matrix_concurrency, matrix_rows, scan_matrix
+from coldpy.models import InterpreterScan, MatrixPayload, ModuleResult, ScanPayload, ScanSettings, ScanSummary
+from coldpy.runtime import build_scan_environment
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_project"
+
+
+def _scan(times: dict[str, float | None]) -> ScanPayload:
+    modules = [
+        ModuleResult(
+            name=name,
+            file=f"/project/{name}.py",
+            import_time_ms=value,
+            memory_mb=None,
+            status="ok" if value is not None else "error",
+        )
+        for name, value in times.items()
+    ]
+    return ScanPayload(
+        project_root="/project",
+        settings=ScanSettings(threshold_ms=100, threshold_mb=50, exclusions=[]),
+        summary=ScanSummary(total_modules=len(modules), scanned_modules=len(modules), failed_modules=0),
+        modules=modules,
+    )
+
+
+def test_scan_matrix_scans_every_interpreter() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name in {"pkg.fast", "pkg.broken"}]
+    python = Path(sys.executable)
+    finished: list[tuple[Path, str]] = []
+    matrix = scan_matrix(
+        FIXTURE,
+        targets,
+        [(python, build_scan_environment()), (python, build_scan_environment())],
+        on_module=lambda python, module: finished.append((python, module.name)),
+    )
+
+    version = "{}.{}.{}".format(*sys.version_info[:3])
+    assert list(matrix.interpreters) == [version, f"{version} ({python})"]
+    assert len(finished) == 4
+    for entry in matrix.interpreters.values():
+        assert entry.python == str(python)
+        assert {module.name: module.status for module in entry.scan.modules} == {"pkg.fast": "ok", "pkg.broken": "error"}
+    assert MatrixPayload.from_dict(matrix.to_dict()).to_dict() == matrix.to_dict()
+
+
+def test_matrix_rows_and_totals_compare_common_modules() -> None:
+    matrix = MatrixPayload(
+        project_root="/project",
+        interpreters={
+            "3.10.14": InterpreterScan("/usr/bin/python3.10", _scan({"a": 10.0, "b": 4.0, "c": 1.0})),
+            "3.12.4": InterpreterScan("/usr/bin/python3.12", _scan({"a": 6.0, "b": None, "c": 2.0})),
+        },
+    )
+
+    rows = matrix_rows(matrix)
+    assert [row.name for row in rows] == ["a", "b", "c"]
+    assert rows[1].times_ms == [4.0, None]
+    assert comparable_totals(matrix) == {"3.10.14": 11.0, "3.12.4": 8.0}
+
+
+def test_matrix_concurrency_stays_within_the_cpus() -> None:
+    assert matrix_concurrency(2, 4, 8) == (2, 4)
+    assert matrix_concurrency(3, 4, 8) == (3, 2)
+    assert matrix_concurrency(3, 1, 2) == (2, 1)
+    assert matrix_concurrency(3, 4, 8, pinned=True) == (1, 4)
+
+
+def test_scan_matrix_runs_pinned_scans_one_at_a_time(monkeypatch) -> None:
+    lock = threading.Lock()
+    running: list[int] = [0]
+    peak: list[int] = [0]
+    jobs: list[int] = []
+
+    def fake_iter_scan(project_root, module_targets, **options):
+        def scan():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                jobs.append(options["jobs"])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return _scan({"a": 1.0})
+            yield
+
+        return scan()
+
+    monkeypatch.setattr(matrix_module, "iter_scan", fake_iter_scan)
+    monkeypatch.setattr(matrix_module, "available_cpus", lambda: list(range(8)))
+    interpreters = [(Path("/py/a"), {}), (Path("/py/b"), {}), (Path("/py/c"), {})]
+
+    scan_matrix(FIXTURE, [], interpreters, jobs=4, pin_cpus=True)
+
+    assert peak[0] == 1
+    assert jobs == [4, 4, 4]
@@ -0,0 +1,28 @@
+from coldpy.profiling import collapsed_stacks, parse_stacks, speedscope_document
+
+
+STACKS = parse_stacks(
+    [
+        [[["<module>", "/app/slow.py", 1], ["build", "/app/slow.py", 3]], 3, 3.5],
+        [[["<module>", "/app/slow.py", 1]], 1, 1.0],
+    ]
+)
+
+
+def test_collapsed_stacks_fold_frames_outermost_first() -> None:
+    assert collapsed_stacks(STACKS).splitlines() == [
+        "<module> (/app/slow.py:1) 1",
+        "<module> (/app/slow.py:1);build (/app/slow.py:3) 3",
+    ]
+    assert collapsed_stacks([]) == ""
+
+
+def test_speedscope_document_shares_frames_and_weights_samples() -> None:
+    document = speedscope_document("slow", STACKS)
+
+    assert [frame["name"] for frame in document["shared"]["frames"]] == ["<module>", "build"]
+    profile = document["profiles"][0]
+    assert profile["type"] == "sampled"
+    assert profile["samples"] == [[0, 1], [0]]
+    assert profile["weights"] == [3.5, 1.0]
+    assert profile["endValue"] == 4.5
@@ -0,0 +1,90 @@
+import pytest
+
+pytest_plugins = ["pytester"]
+
+PLUGIN = ["-p", "coldpy.pytest_plugin"]
+
+
+@pytest.fixture
+def project(pytester: pytest.Pytester) -> pytest.Pytester:
+    pytester.makepyfile(
+        slow="import time\n\ntime.sleep(0.05)\n",
+        fast="VALUE = 1\n",
+        broken="raise RuntimeError('boom')\n",
+    )
+    return pytester
+
+
+def test_import_budget_marker_fails_slow_imports(project: pytest.Pytester) -> None:
+    project.makepyfile(
+        test_marked_imports="""
+        import pytest
+
+        @pytest.mark.import_budget("fast", ms=5000, mb=100)
+        def test_fast():
+            pass
+
+        @pytest.mark.import_budget("slow", ms=10)
+        def test_slow():
+            pass
+
+        @pytest.mark.import_budget("broken")
+        def test_broken():
+            pass
+        """
+    )
+    result = project.runpytest(*PLUGIN, "--coldpy-repeat", "1")
+
+    result.assert_outcomes(passed=1, failed=2)
+    result.stdout.fnmatch_lines(["*import slow took * ms, budget 10 ms*", "*import broken failed (error)*boom*"])
+
+
+def test_import_cost_fixture_caches_per_session(project: pytest.Pytester) -> None:
+    project.makepyfile(
+        test_import_cost_fixture="""
+        def test_first(import_cost):
+            cost = import_cost("slow")
+            assert cost.status == "ok"
+            assert cost.time_ms >= 40
+            assert cost.memory_mb is not None
+
+        def test_second(import_cost):
+            assert import_cost("slow") is import_cost("slow")
+        """
+    )
+    result = project.runpytest(*PLUGIN, "--coldpy-repeat", "1")
+
+    result.assert_outcomes(passed=2)
+
+
+def test_import_budget_marker_needs_a_module(project: pytest.Pytester) -> None:
+    project.makepyfile(
+        test_marker_usage="""
+        import pytest
+
+        @pytest.mark.import_budget(ms=10)
+        def test_nothing():
+            pass
+        """
+    )
+    result = project.runpytest(*PLUGIN)
+
+    assert result.ret != 0
+    result.stderr.fnmatch_lines(["*needs at least one module name*"])
+
+
+def test_import_cost_loads_the_project_env(project: pytest.Pytester) -> None:
+    (project.path / ".env").write_text("COLDPY_PLUGIN_TOKEN=present\n", encoding="utf-8")
+    project.makepyfile(
+        needs_env="import os\n\nassert os.environ['COLDPY_PLUGIN_TOKEN'] == 'present'\n",
+        test_project_env="""
+        import pytest
+
+        @pytest.mark.import_budget("needs_env", ms=5000)
+        def test_env():
+            pass
+        """,
+    )
+    result = project.runpytest(*PLUGIN, "--coldpy-repeat", "1")
+
+    result.assert_outcomes(passed=1)
@@ -42,3 +42,13 @@ def test_resolve_python_keeps_symlink_path_for_venv_style_python(tmp_path: Path)
 
     resolved = resolve_python_executable(FIXTURE, requested_python=link_python)
     assert resolved == link_python.absolute()
+
+
+def test_build_scan_environment_stable_scrubs_inherited_env(monkeypatch) -> None:
+    monkeypatch.setenv("COLDPY_NOISE", "1")
+    monkeypatch.setenv("LC_ALL", "C")
+    env = build_scan_environment({"COLDPY_X": "1"}, stable=True)
+    assert "COLDPY_NOISE" not in env
+    assert env["LC_ALL"] == "C"
+    assert env["COLDPY_X"] == "1"
+    assert env["PYTHONHASHSEED"] == "0"
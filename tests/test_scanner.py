@@ -1,8 +1,16 @@
+import os
+import shutil
+import zipfile
 from pathlib import Path
 
+import pytest
+
 from coldpy.discovery import discover_modules
+from coldpy.forkserver import fork_server_supported
+from coldpy.importtree import find_node
+from coldpy.models import ScanPayload
 from coldpy.runtime import build_scan_environment
-from coldpy.scanner import scan_modules
+from coldpy.scanner import ZIP_FAILED_NOTE, available_cpus, iter_scan, measure_import, scan_modules
 
 
 FIXTURE = Path(__file__).parent / "fixtures" / "sample_project"
@@ -31,7 +39,7 @@ def test_scan_payload_schema_shape() -> None:
     payload = scan_modules(FIXTURE, targets)
     raw = payload.to_dict()
 
-    assert raw["schema_version"] == "1.0"
+    assert raw["schema_version"] == "2.0"
     assert "generated_at" in raw
     assert "project_root" in raw
     assert set(raw["summary"].keys()) == {"total_modules", "scanned_modules", "failed_modules"}
@@ -47,3 +55,359 @@ def test_scan_modules_can_use_custom_env_for_imports() -> None:
     )
     assert payload.summary.scanned_modules == 1
     assert payload.modules[0].status == "ok"
+
+
+def test_scan_modules_parallel_keeps_discovery_order() -> None:
+    targets = discover_modules(FIXTURE)
+    payload = scan_modules(FIXTURE, targets, jobs=4, pin_cpus=True)
+
+    assert [module.name for module in payload.modules] == [target.name for target in targets]
+    # Pinning never runs more workers than CPUs, and settings record what actually ran.
+    expected_jobs = min(4, len(available_cpus())) if hasattr(os, "sched_setaffinity") else 4
+    assert payload.settings.jobs == expected_jobs
+    assert payload.settings.pin_cpus is True
+    assert {module.name: module.status for module in payload.modules}["pkg.fast"] == "ok"
+
+
+@pytest.mark.skipif(not fork_server_supported(), reason="fork server requires os.fork")
+def test_scan_modules_fork_server_matches_spawn_results() -> None:
+    targets = discover_modules(FIXTURE)
+    payload = scan_modules(
+        FIXTURE,
+        targets,
+        executor="forkserver",
+        scan_env=build_scan_environment({"COLDPY_TEST_TOKEN": "abc"}),
+    )
+
+    by_name = {module.name: module for module in payload.modules}
+    assert by_name["pkg.fast"].status == "ok"
+    assert by_name["pkg.env_required"].status == "ok"
+    assert by_name["pkg.broken"].status == "error"
+    assert "RuntimeError" in (by_name["pkg.broken"].error or "")
+    assert payload.settings.executor == "forkserver"
+    assert payload.stats is not None
+    assert payload.stats.spawn_overhead_ms is not None
+    assert payload.stats.estimated_savings_ms is not None
+
+
+def test_scan_modules_rejects_unknown_executor() -> None:
+    with pytest.raises(ValueError):
+        scan_modules(FIXTURE, discover_modules(FIXTURE), executor="threads")
+
+
+def test_scan_modules_reuses_unchanged_results(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    shutil.copytree(FIXTURE, project)
+    first = scan_modules(project, discover_modules(project))
+    previous = {module.name: module for module in first.modules}
+
+    (project / "pkg" / "fast.py").write_text("VALUE = 2\n", encoding="utf-8")
+    second = scan_modules(project, discover_modules(project), previous_results=previous)
+
+    by_name = {module.name: module for module in second.modules}
+    assert by_name["pkg.fast"].reused is False
+    assert by_name["pkg.slowish"].reused is True
+    assert by_name["pkg.slowish"].import_time_ms == previous["pkg.slowish"].import_time_ms
+    assert second.stats is not None
+    assert second.stats.reused_modules == len(second.modules) - 1
+
+
+def test_scan_modules_never_reuses_results_across_modes() -> None:
+    targets = discover_modules(FIXTURE)
+    marginal = scan_modules(FIXTURE, targets, mode="marginal")
+    previous = {module.name: module for module in marginal.modules}
+
+    isolated = scan_modules(FIXTURE, targets, previous_results=previous)
+    assert isolated.stats is not None
+    assert isolated.stats.reused_modules == 0
+    assert not any(module.reused for module in isolated.modules)
+
+
+def test_scan_modules_repeats_and_summarizes_samples() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name in {"pkg.fast", "pkg.broken"}]
+    payload = scan_modules(FIXTURE, targets, repeat=3, warmup=1, statistic="min")
+
+    by_name = {module.name: module for module in payload.modules}
+    fast = by_name["pkg.fast"]
+    assert fast.time_stats is not None
+    assert len(fast.time_stats.samples) == 3
+    assert fast.import_time_ms == fast.time_stats.min
+    assert by_name["pkg.broken"].time_stats is None
+    assert payload.settings.repeat == 3
+    assert payload.settings.statistic == "min"
+
+
+def test_scan_modules_records_nested_import_tree() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name == "pkg.slowish"]
+    payload = scan_modules(FIXTURE, targets, import_tree=True)
+
+    tree = payload.modules[0].import_tree
+    assert tree is not None
+    root = find_node(tree, "pkg.slowish")
+    assert root is not None
+    assert root.cumulative_ms >= root.self_ms
+    assert find_node(tree, "pkg") is not None
+
+
+def test_scan_modules_attributes_costs_to_distributions(tmp_path: Path) -> None:
+    (tmp_path / "service.py").write_text("import fractions\nimport time\n\ntime.sleep(0.02)\n", encoding="utf-8")
+    payload = scan_modules(tmp_path, discover_modules(tmp_path), import_tree=True)
+
+    costs = {cost.name: cost for cost in payload.distributions}
+    assert costs["project"].kind == "project"
+    assert costs["project"].self_ms >= 15
+    assert costs["project"].cumulative_ms >= costs["project"].self_ms
+    assert costs["stdlib"].modules >= 1
+    assert costs["stdlib"].memory_mb is not None
+    assert payload.modules[0].memory_by_module
+    assert ScanPayload.from_dict(payload.to_dict()).distributions == payload.distributions
+
+
+def test_scan_modules_marginal_mode_imports_in_dependency_order() -> None:
+    targets = discover_modules(FIXTURE)
+    payload = scan_modules(
+        FIXTURE,
+        targets,
+        mode="marginal",
+        preload=["json"],
+        scan_env=build_scan_environment({"COLDPY_TEST_TOKEN": "abc"}),
+    )
+
+    by_name = {module.name: module for module in payload.modules}
+    assert [module.name for module in payload.modules] == [target.name for target in targets]
+    assert by_name["pkg.fast"].status == "ok"
+    assert by_name["pkg.broken"].status == "error"
+    # pkg is imported first, so the submodules are not charged for the package __init__.
+    assert by_name["pkg.slowish"].import_time_ms is not None
+    assert payload.settings.mode == "marginal"
+    assert payload.settings.preload == ["json"]
+    assert payload.stats is not None
+    assert payload.stats.preload_time_ms is not None
+    assert payload.stats.total_import_time_ms == pytest.approx(
+        payload.stats.preload_time_ms + sum(module.import_time_ms or 0.0 for module in payload.modules),
+        abs=0.01,
+    )
+
+
+def test_scan_modules_records_measurement_methods_and_baseline() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name == "pkg.fast"]
+    payload = scan_modules(FIXTURE, targets)
+    module = payload.modules[0]
+
+    assert module.time_method == "perf_counter"
+    assert module.memory_method == "tracemalloc_peak"
+    assert payload.baseline is not None
+    assert payload.baseline.startup_ms > 0
+    assert payload.to_dict()["baseline"]["startup_ms"] == payload.baseline.startup_ms
+
+
+def test_scan_modules_reports_allocation_sites_for_heavy_imports(tmp_path: Path) -> None:
+    (tmp_path / "table.py").write_text(
+        "def build():\n    return [str(i) * 4 for i in range(40000)]\n\n\nTABLE = build()\n", encoding="utf-8"
+    )
+    (tmp_path / "light.py").write_text("VALUE = 1\n", encoding="utf-8")
+    payload = scan_modules(tmp_path, discover_modules(tmp_path), threshold_mb=1, alloc_sites=3, alloc_frames=2)
+    by_name = {module.name: module for module in payload.modules}
+
+    heavy = by_name["table"]
+    assert heavy.memory_retained_mb is not None and heavy.memory_retained_mb > 1
+    assert heavy.memory_mb is not None and heavy.memory_mb >= heavy.memory_retained_mb
+    assert heavy.allocation_sites is not None and len(heavy.allocation_sites) <= 3
+    top = heavy.allocation_sites[0]
+    assert top.size_mb > 1
+    assert top.frames[0].endswith("table.py:2")
+    assert top.frames[1].endswith("table.py:5")
+    assert by_name["light"].allocation_sites is None
+    assert payload.settings.alloc_frames == 2
+    restored = {module.name: module for module in ScanPayload.from_dict(payload.to_dict()).modules}
+    assert restored["table"].allocation_sites == heavy.allocation_sites
+
+
+def test_scan_modules_profiles_slow_imports(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "slow.py").write_text(
+        "import time\n\n\ndef spin():\n    end = time.perf_counter() + 0.05\n"
+        "    while time.perf_counter() < end:\n        pass\n\n\nspin()\n",
+        encoding="utf-8",
+    )
+    (project / "fast.py").write_text("VALUE = 1\n", encoding="utf-8")
+    profiles = tmp_path / "profiles"
+    scan = iter_scan(project, discover_modules(project), profile_over_ms=30, profile_dir=profiles)
+    yielded = []
+    while True:
+        try:
+            yielded.append(next(scan))
+        except StopIteration as finished:
+            payload = finished.value
+            break
+    by_name = {module.name: module for module in payload.modules}
+
+    assert all(module.profile is None for module in yielded)
+    assert by_name["fast"].profile is None
+    profile = by_name["slow"].profile
+    assert profile is not None
+    assert profile.pstats is not None and Path(profile.pstats).exists()
+    assert profile.speedscope is not None and Path(profile.speedscope).exists()
+    assert any(hotspot.function.startswith("spin (") for hotspot in profile.hotspots)
+    assert profile.samples > 0
+    assert any("spin (" in line for line in (profiles / "slow.collapsed").read_text(encoding="utf-8").splitlines())
+    assert payload.settings.profile_over_ms == 30
+    restored = {module.name: module for module in ScanPayload.from_dict(payload.to_dict()).modules}
+    assert restored["slow"].profile == profile
+
+
+def test_scan_modules_can_skip_memory_measurement() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name == "pkg.fast"]
+    payload = scan_modules(FIXTURE, targets, memory_method="none")
+    module = payload.modules[0]
+
+    assert module.status == "ok"
+    assert module.import_time_ms is not None
+    assert module.memory_mb is None
+    assert module.memory_stats is None
+    assert module.memory_method is None
+
+
+def test_scan_modules_rejects_unknown_memory_method() -> None:
+    with pytest.raises(ValueError, match="Unknown memory method"):
+        scan_modules(FIXTURE, discover_modules(FIXTURE), memory_method="psutil")
+
+
+def test_scan_modules_compares_cold_and_warm_bytecode() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name == "pkg.fast"]
+    payload = scan_modules(FIXTURE, targets, pyc_mode="both")
+    module = payload.modules[0]
+
+    assert module.status == "ok"
+    assert module.import_time_cold_ms == module.import_time_ms
+    assert module.import_time_warm_ms is not None
+    assert payload.settings.pyc_mode == "both"
+
+
+def test_scan_modules_compares_zip_imports_with_loose_files(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    (project / "app").mkdir(parents=True)
+    (project / "app" / "__init__.py").write_text("", encoding="utf-8")
+    (project / "app" / "core.py").write_text("from pathlib import Path\n\nDATA = 1\n", encoding="utf-8")
+    (project / "app" / "data.txt").write_text("payload", encoding="utf-8")
+    (project / "app" / "loose_only.py").write_text("VALUE = 1\n", encoding="utf-8")
+    # Shipped as a Lambda layer without loose_only.py.
+    layer = tmp_path / "layer.zip"
+    with zipfile.ZipFile(layer, "w") as archive:
+        archive.writestr("python/app/__init__.py", "")
+        archive.writestr("python/app/core.py", "DATA = 1\n")
+
+    packed = scan_modules(project, discover_modules(project), zip_import=True, executor="spawn")
+    by_name = {module.name: module for module in packed.modules}
+    assert by_name["app.core"].import_time_zip_ms is not None
+    assert by_name["app.loose_only"].import_time_zip_ms is not None
+    assert packed.settings.zip_import is True
+
+    from_layer = scan_modules(project, discover_modules(project), zip_archive=layer)
+    by_name = {module.name: module for module in from_layer.modules}
+    assert by_name["app.core"].import_time_zip_ms is not None
+    assert by_name["app.loose_only"].import_time_ms is not None
+    assert by_name["app.loose_only"].import_time_zip_ms is None
+    assert any(note.startswith(ZIP_FAILED_NOTE) for note in by_name["app.loose_only"].notes)
+    assert from_layer.settings.zip_archive == str(layer.resolve())
+
+
+def test_scan_modules_stable_mode_records_host_and_order_seed() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name in {"pkg.fast", "pkg.broken"}]
+    payload = scan_modules(FIXTURE, targets, stable=True, disable_gc=True, repeat=2, jobs=2, order_seed=7)
+
+    by_name = {module.name: module for module in payload.modules}
+    assert [module.name for module in payload.modules] == [target.name for target in targets]
+    assert len(by_name["pkg.fast"].time_stats.samples) == 2
+    assert by_name["pkg.broken"].status == "error"
+    assert payload.host is not None
+    assert payload.host.cpu_count >= 1
+    assert payload.settings.stable is True
+    assert payload.settings.disable_gc is True
+    assert payload.settings.order_seed == 7
+    assert ScanPayload.from_dict(payload.to_dict()).host == payload.host
+
+
+def test_scan_modules_rejects_zip_imports_in_marginal_mode() -> None:
+    with pytest.raises(ValueError, match="isolated mode"):
+        scan_modules(FIXTURE, discover_modules(FIXTURE), mode="marginal", zip_import=True)
+
+
+def test_scan_modules_rejects_unknown_pyc_mode() -> None:
+    with pytest.raises(ValueError, match="Unknown pyc mode"):
+        scan_modules(FIXTURE, discover_modules(FIXTURE), pyc_mode="lukewarm")
+
+
+@pytest.mark.parametrize("executor", ["spawn", "forkserver"])
+def test_scan_modules_times_out_hanging_imports(tmp_path: Path, executor: str) -> None:
+    if executor == "forkserver" and not fork_server_supported():
+        pytest.skip("fork server requires os.fork")
+    (tmp_path / "hangs.py").write_text("import time\ntime.sleep(60)\n", encoding="utf-8")
+    (tmp_path / "quick.py").write_text("VALUE = 1\n", encoding="utf-8")
+
+    payload = scan_modules(tmp_path, discover_modules(tmp_path), executor=executor, timeout_s=0.5)
+    by_name = {module.name: module for module in payload.modules}
+
+    assert by_name["hangs"].status == "timeout"
+    assert "0.5s" in by_name["hangs"].error
+    assert by_name["quick"].status == "ok"
+    assert payload.summary.failed_modules == 1
+
+
+@pytest.mark.parametrize("executor", ["spawn", "forkserver"])
+def test_scan_modules_applies_resource_limits(tmp_path: Path, executor: str) -> None:
+    if executor == "forkserver" and not fork_server_supported():
+        pytest.skip("fork server requires os.fork")
+    (tmp_path / "greedy.py").write_text("DATA = bytearray(1024 * 1024 * 1024)\n", encoding="utf-8")
+    (tmp_path / "spins.py").write_text("while True:\n    pass\n", encoding="utf-8")
+
+    payload = scan_modules(
+        tmp_path,
+        discover_modules(tmp_path),
+        executor=executor,
+        max_memory_mb=512,
+        max_cpu_s=1,
+        timeout_s=30,
+    )
+    by_name = {module.name: module for module in payload.modules}
+
+    assert by_name["greedy"].status == "limit"
+    assert by_name["spins"].status == "limit"
+
+
+def test_iter_scan_yields_results_before_returning_payload() -> None:
+    targets = discover_modules(FIXTURE)
+    scan = iter_scan(FIXTURE, targets, jobs=2)
+    streamed = []
+    while True:
+        try:
+            streamed.append(next(scan))
+        except StopIteration as finished:
+            payload = finished.value
+            break
+
+    assert sorted(module.name for module in streamed) == sorted(target.name for target in targets)
+    assert [module.name for module in payload.modules] == [target.name for target in targets]
+
+
+def test_iter_scan_rejects_bad_arguments_when_called() -> None:
+    with pytest.raises(ValueError, match="jobs must be >= 1"):
+        iter_scan(FIXTURE, discover_modules(FIXTURE), jobs=0)
+
+
+def test_scan_modules_accepts_positional_thresholds() -> None:
+    targets = [target for target in discover_modules(FIXTURE) if target.name == "pkg.fast"]
+    payload = scan_modules(FIXTURE, targets, 100.0, 50.0)
+    assert payload.settings.threshold_ms == 100.0
+    assert payload.settings.threshold_mb == 50.0
+
+
+def test_measure_import_times_and_traces_one_module() -> None:
+    sample = measure_import("pkg.fast", FIXTURE, scan_env=build_scan_environment())
+    assert sample["status"] == "ok"
+    assert float(sample["import_time_ms"]) >= 0
+    assert sample["memory_method"] == "tracemalloc_peak"
+
+    missing = measure_import("pkg.does_not_exist", FIXTURE, scan_env=build_scan_environment())
+    assert missing["status"] == "error"
@@ -0,0 +1,38 @@
+from pathlib import Path
+
+import pytest
+
+from coldpy.startup import StartupError, measure_startup
+
+
+FIXTURE = Path(__file__).parent / "fixtures" / "sample_project"
+
+
+def test_measure_startup_breaks_down_cold_start() -> None:
+    report = measure_startup(FIXTURE, "pkg.slowish", repeat=3, warmup=0)
+
+    assert report.samples == 3
+    assert report.total.p50 >= report.app.p50 > 0
+    assert report.site.p50 > 0
+    assert report.total.min <= report.total.p50 <= report.total.p99 <= report.total.max
+    assert [node.name for node in report.app_imports] == ["pkg.slowish"]
+    assert any(node.name == "site" for node in report.startup_imports)
+
+
+def test_measure_startup_resolves_and_calls_entry_point(tmp_path: Path) -> None:
+    (tmp_path / "handler.py").write_text(
+        "import pathlib\n\ndef create_app():\n    pathlib.Path('called').write_text('yes')\n",
+        encoding="utf-8",
+    )
+
+    report = measure_startup(tmp_path, "handler:create_app", repeat=1, warmup=0, call=True)
+
+    assert (tmp_path / "called").read_text() == "yes"
+    assert report.to_dict()["target"] == "handler:create_app"
+
+
+def test_measure_startup_reports_failing_entry_points() -> None:
+    with pytest.raises(StartupError, match="RuntimeError"):
+        measure_startup(FIXTURE, "pkg.broken", repeat=1, warmup=0)
+    with pytest.raises(StartupError, match="AttributeError"):
+        measure_startup(FIXTURE, "pkg.fast:missing", repeat=1, warmup=0)
@@ -0,0 +1,50 @@
+import pytest
+
+from coldpy.stats import mann_whitney_u, min_p_value, percentile, pick, reject_outliers, summarize
+
+
+def test_percentile_interpolates_between_samples() -> None:
+    assert percentile([1.0, 2.0, 3.0, 4.0], 50) == 2.5
+    assert percentile([5.0], 95) == 5.0
+
+
+def test_reject_outliers_drops_values_outside_tukey_fences() -> None:
+    kept, rejected = reject_outliers([10.0, 11.0, 10.5, 10.2, 95.0])
+    assert rejected == 1
+    assert 95.0 not in kept
+
+
+def test_reject_outliers_needs_enough_samples() -> None:
+    kept, rejected = reject_outliers([1.0, 100.0])
+    assert rejected == 0
+    assert kept == [1.0, 100.0]
+
+
+def test_summarize_reports_statistics_over_kept_samples() -> None:
+    stats = summarize([10.0, 11.0, 10.5, 10.2, 95.0])
+    assert stats.samples == [10.0, 11.0, 10.5, 10.2, 95.0]
+    assert stats.outliers == 1
+    assert stats.min == 10.0
+    assert stats.median == pytest.approx(10.35)
+    assert stats.p95 <= 11.0
+    assert pick(stats, "min") == 10.0
+
+
+def test_pick_rejects_unknown_statistic() -> None:
+    with pytest.raises(ValueError):
+        pick(summarize([1.0]), "max")
+
+
+def test_mann_whitney_u_detects_shifted_samples() -> None:
+    assert mann_whitney_u([1, 2, 3, 4, 5], [6, 7, 8, 9, 10]) == pytest.approx(2 / 252)
+    assert mann_whitney_u([1.0, 2.0, 3.0], [1.0, 2.0, 3.0]) == 1.0
+    assert mann_whitney_u([1.0], [2.0, 3.0]) is None
+
+
+def test_mann_whitney_u_is_exact_for_small_samples() -> None:
+    assert mann_whitney_u([10, 10.1, 10.2], [100, 101, 102]) == pytest.approx(0.1)
+    assert mann_whitney_u([1.0, 2.0], [3.0, 4.0]) == pytest.approx(2 / 6)
+    assert min_p_value(3, 3) == pytest.approx(0.1)
+    assert min_p_value(4, 4) < 0.05
+    # Past the exact range the normal approximation is used.
+    assert mann_whitney_u(list(range(10)), list(range(10, 20))) < 0.001
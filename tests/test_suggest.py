@@ -0,0 +1,65 @@
+from pathlib import Path
+
+from coldpy.discovery import ModuleTarget
+from coldpy.suggest import find_deferrable_imports, suggest_deferrals
+
+
+SOURCE = """\
+import json
+import os.path
+from decimal import Decimal
+from fractions import Fraction as F
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import csv
+
+__all__ = ["F"]
+SEPARATOR = os.path.sep
+
+
+def dump(value):
+    return json.dumps(value)
+
+
+class Money:
+    zero = Decimal(0)
+
+    def half(self, csv_row: "csv.Row"):
+        return Decimal(1) / 2
+"""
+
+
+def _target(tmp_path: Path, source: str = SOURCE) -> ModuleTarget:
+    (tmp_path / "money.py").write_text(source, encoding="utf-8")
+    return ModuleTarget(name="money", file=tmp_path / "money.py")
+
+
+def test_find_deferrable_imports_keeps_function_only_names(tmp_path: Path) -> None:
+    findings = find_deferrable_imports(_target(tmp_path))
+
+    assert [(finding.imported, finding.lineno, finding.functions) for finding in findings] == [
+        ("json", 1, ["dump"])
+    ]
+
+
+def test_find_deferrable_imports_treats_decorators_and_annotations_as_import_time(tmp_path: Path) -> None:
+    source = (
+        "import functools\nimport decimal\nimport json\n\n"
+        "@functools.lru_cache\ndef load(value: decimal.Decimal):\n    return json.loads(value, parse_float=decimal.Decimal)\n"
+    )
+
+    findings = find_deferrable_imports(_target(tmp_path, source))
+    assert [finding.imported for finding in findings] == ["json"]
+
+    findings = find_deferrable_imports(_target(tmp_path, "from __future__ import annotations\n" + source))
+    assert [finding.imported for finding in findings] == ["decimal", "json"]
+
+
+def test_suggest_deferrals_ranks_by_cost(tmp_path: Path) -> None:
+    source = "import json\nfrom app import heavy\nimport cheap\n\ndef run():\n    return json, heavy, cheap\n"
+    target = _target(tmp_path, source)
+
+    findings = suggest_deferrals([target], {"json": 2.0, "app.heavy": 40.0, "app": 0.5, "cheap": 0.1}, min_cost_ms=1.0)
+
+    assert [(finding.imported, finding.cost_ms) for finding in findings] == [("app.heavy", 40.0), ("json", 2.0)]
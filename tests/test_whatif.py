@@ -0,0 +1,49 @@
+from pathlib import Path
+
+import pytest
+
+from coldpy.whatif import simulate_lazy
+
+
+def _write_project(root: Path) -> None:
+    package = root / "app"
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "heavy.py").write_text("import time\n\ntime.sleep(0.05)\n\ndef run():\n    return 1\n", encoding="utf-8")
+    (package / "used.py").write_text("VALUE = 2\n", encoding="utf-8")
+    (package / "main.py").write_text(
+        "import app.heavy\nimport app.used\n\nVALUE = app.used.VALUE\n\ndef cli():\n    return app.heavy.run()\n",
+        encoding="utf-8",
+    )
+
+
+def test_simulate_lazy_projects_savings_of_deferred_modules(tmp_path: Path) -> None:
+    _write_project(tmp_path)
+
+    report = simulate_lazy(tmp_path, "app.main", ["app.heavy", "app.used", "missing"], repeat=3, warmup=0)
+
+    outcomes = {module.name: module for module in report.modules}
+    assert outcomes["app.heavy"].status == "deferred"
+    assert outcomes["app.heavy"].baseline_ms >= 40
+    assert outcomes["app.used"].status == "forced"
+    assert outcomes["app.used"].attribute == "VALUE"
+    assert outcomes["app.used"].stack[0].endswith("main.py:4 in <module>")
+    assert outcomes["missing"].status == "not imported"
+    assert report.savings_ms > 20
+    assert report.to_dict()["lazy"] == ["app.heavy", "app.used", "missing"]
+
+
+def test_simulate_lazy_reports_loads_forced_by_the_callable(tmp_path: Path) -> None:
+    _write_project(tmp_path)
+
+    report = simulate_lazy(tmp_path, "app.main:cli", ["app.heavy"], repeat=1, warmup=0, call=True)
+
+    heavy = report.modules[0]
+    assert heavy.status == "forced"
+    assert heavy.attribute == "run"
+    assert heavy.stack[0].endswith("main.py:7 in cli")
+
+
+def test_simulate_lazy_requires_lazy_modules() -> None:
+    with pytest.raises(ValueError, match="at least one"):
+        simulate_lazy(Path("."), "app.main", [])
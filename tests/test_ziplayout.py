@@ -0,0 +1,34 @@
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from coldpy.discovery import discover_modules
+from coldpy.ziplayout import pack_project, zip_import_root
+
+
+def test_pack_project_keeps_relative_paths_and_package_data(tmp_path: Path) -> None:
+    project = tmp_path / "project"
+    (project / "pkg").mkdir(parents=True)
+    (project / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    (project / "pkg" / "schema.json").write_text("{}", encoding="utf-8")
+    (project / "tool.py").write_text("", encoding="utf-8")
+    (project / "notes.txt").write_text("not package data", encoding="utf-8")
+
+    archive = pack_project(project, discover_modules(project), tmp_path / "out" / "project.zip")
+
+    with zipfile.ZipFile(archive) as handle:
+        assert sorted(handle.namelist()) == ["pkg/__init__.py", "pkg/schema.json", "tool.py"]
+    assert zip_import_root(archive) == archive
+
+
+def test_zip_import_root_detects_lambda_layers(tmp_path: Path) -> None:
+    layer = tmp_path / "layer.zip"
+    with zipfile.ZipFile(layer, "w") as handle:
+        handle.writestr("python/pkg/__init__.py", "")
+    assert zip_import_root(layer) == layer / "python"
+
+    broken = tmp_path / "broken.zip"
+    broken.write_text("not a zip", encoding="utf-8")
+    with pytest.raises(ValueError, match="Invalid zip archive"):
+        zip_import_root(broken)